@@ -1,202 +1,195 @@
 """The PSA Car Controller integration."""
+from importlib import import_module
 import logging
-from typing import Any, Dict
+from typing import FrozenSet, List
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers import aiohttp_client
-import voluptuous as vol
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import slugify
 
-from .api import PSACCApiClient
 from .const import (
     DOMAIN,
     CONF_API_URL,
+    CONF_ASLEEP_INTERVAL,
+    CONF_CHARGING_INTERVAL,
+    CONF_DRIVING_INTERVAL,
+    CONF_RECORD_RESPONSES,
     CONF_UPDATE_INTERVAL,
     CONF_VIN,
+    DEFAULT_ASLEEP_INTERVAL,
+    DEFAULT_CHARGING_INTERVAL,
+    DEFAULT_DRIVING_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
-    SERVICE_SET_CHARGE_THRESHOLD,
-    SERVICE_SET_CHARGE_SCHEDULE,
-    SERVICE_START_CLIMATE,
-    SERVICE_STOP_CLIMATE,
-    SERVICE_HORN,
-    SERVICE_LIGHTS,
-    SERVICE_WAKEUP,
-    ATTR_THRESHOLD,
-    ATTR_START_TIME,
-    ATTR_END_TIME,
-    ATTR_TEMPERATURE,
-    ATTR_COUNT,
-    ATTR_VIN,
+    RECORDINGS_DIR,
 )
-from .coordinator import PSACCDataUpdateCoordinator
+from .commands import PSACCCommandQueue
+from .coordinator import PollingSchedule
+from .models import CAPABILITY_CHARGING, CAPABILITY_CLIMATE, CAPABILITY_POSITION
+from .recording import ResponseRecorder
+from .store import async_get_snapshot_store, async_get_trip_store
+from .registry import (
+    async_get_api_client,
+    async_get_coordinator,
+    async_register_vehicle,
+    async_release_api_client,
+    async_unregister_vehicle,
+    async_withdraw_metrics,
+)
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+BASE_PLATFORMS = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
-    Platform.DEVICE_TRACKER,
-    Platform.SWITCH,
     Platform.BUTTON,
-    Platform.NUMBER,
-    Platform.SELECT,
 ]
 
-# Service schemas
-SERVICE_SET_CHARGE_THRESHOLD_SCHEMA = vol.Schema(
-    {
-        vol.Required(ATTR_VIN): str,
-        vol.Required(ATTR_THRESHOLD): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
-    }
-)
+# Plateformes chargées seulement si le véhicule a l'une de ces fonctions
+OPTIONAL_PLATFORMS = {
+    Platform.DEVICE_TRACKER: {CAPABILITY_POSITION},
+    Platform.SWITCH: {CAPABILITY_CHARGING, CAPABILITY_CLIMATE},
+    Platform.NUMBER: {CAPABILITY_CHARGING, CAPABILITY_CLIMATE},
+    Platform.SELECT: {CAPABILITY_CHARGING},
+}
 
-SERVICE_SET_CHARGE_SCHEDULE_SCHEMA = vol.Schema(
-    {
-        vol.Required(ATTR_VIN): str,
-        vol.Required(ATTR_START_TIME): str,
-        vol.Required(ATTR_END_TIME): str,
-    }
-)
 
-SERVICE_CLIMATE_SCHEMA = vol.Schema(
-    {
-        vol.Required(ATTR_VIN): str,
-        vol.Optional(ATTR_TEMPERATURE, default=21): vol.All(
-            vol.Coerce(float), vol.Range(min=16, max=28)
-        ),
-    }
-)
+def platforms_for(capabilities: FrozenSet[str]) -> List[Platform]:
+    """Return the platforms to set up for a vehicle with capabilities."""
+    return BASE_PLATFORMS + [
+        platform
+        for platform, required in OPTIONAL_PLATFORMS.items()
+        if not required.isdisjoint(capabilities)
+    ]
 
-SERVICE_HORN_LIGHTS_SCHEMA = vol.Schema(
-    {
-        vol.Required(ATTR_VIN): str,
-        vol.Optional(ATTR_COUNT, default=1): vol.All(
-            vol.Coerce(int), vol.Range(min=1, max=5)
-        ),
-    }
-)
 
-SERVICE_WAKEUP_SCHEMA = vol.Schema(
-    {
-        vol.Required(ATTR_VIN): str,
-    }
-)
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services shared by every vehicle."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up PSA Car Controller from a config entry."""
     api_url = entry.data[CONF_API_URL]
     vin = entry.data[CONF_VIN]
-    update_interval = entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-
-    session = aiohttp_client.async_get_clientsession(hass)
-    api = PSACCApiClient(api_url, session)
-
-    coordinator = PSACCDataUpdateCoordinator(hass, api, vin, update_interval)
+    schedule = PollingSchedule(
+        parked=entry.options.get(
+            CONF_UPDATE_INTERVAL,
+            entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        ),
+        charging=entry.options.get(CONF_CHARGING_INTERVAL, DEFAULT_CHARGING_INTERVAL),
+        driving=entry.options.get(CONF_DRIVING_INTERVAL, DEFAULT_DRIVING_INTERVAL),
+        asleep=entry.options.get(CONF_ASLEEP_INTERVAL, DEFAULT_ASLEEP_INTERVAL),
+    )
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    api = async_get_api_client(hass, api_url, entry.entry_id)
+    if entry.options.get(CONF_RECORD_RESPONSES) and api.recorder is None:
+        path = hass.config.path(RECORDINGS_DIR, f"{slugify(api_url)}.jsonl")
+        _LOGGER.info("Recording anonymized PSACC responses to %s", path)
+        api.recorder = ResponseRecorder(path)
+
+    coordinator = async_get_coordinator(hass, api_url, entry.entry_id)
+    coordinator.add_vehicle(vin, schedule)
+
+    # Un rafraîchissement lancé par une autre entrée a pu couvrir ce VIN ;
+    # sinon on démarre du dernier snapshot connu sans attendre le serveur
+    restored = False
+    if vin not in (coordinator.data or {}):
+        restored = await coordinator.async_restore_vehicle(vin)
+    if vin not in (coordinator.data or {}):
+        # Uniquement ce VIN : les autres entrées interrogent le leur
+        await coordinator.async_refresh_vehicle(vin)
+    if vin not in (coordinator.data or {}):
+        coordinator.remove_vehicle(vin)
+        await async_release_api_client(hass, api_url, entry.entry_id)
+        raise ConfigEntryNotReady(f"Unable to fetch data for vehicle {vin}")
+
+    commands = PSACCCommandQueue(hass, api)
+    capabilities = coordinator.get_vehicle_data(vin).capabilities
+    platforms = platforms_for(capabilities)
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "api": api,
+        "commands": commands,
         "vin": vin,
+        "platforms": platforms,
     }
-
-    # Register services
-    async def handle_set_charge_threshold(call: ServiceCall) -> None:
-        """Handle set charge threshold service."""
-        vin = call.data[ATTR_VIN]
-        threshold = call.data[ATTR_THRESHOLD]
-        await api.set_charge_threshold(vin, threshold)
-        await coordinator.async_request_refresh()
-
-    async def handle_set_charge_schedule(call: ServiceCall) -> None:
-        """Handle set charge schedule service."""
-        vin = call.data[ATTR_VIN]
-        start_time = call.data[ATTR_START_TIME]
-        end_time = call.data[ATTR_END_TIME]
-        await api.set_charge_schedule(vin, start_time, end_time)
-        await coordinator.async_request_refresh()
-
-    async def handle_start_climate(call: ServiceCall) -> None:
-        """Handle start climate service."""
-        vin = call.data[ATTR_VIN]
-        temperature = call.data.get(ATTR_TEMPERATURE, 21)
-        await api.start_climate(vin, temperature)
-        await coordinator.async_request_refresh()
-
-    async def handle_stop_climate(call: ServiceCall) -> None:
-        """Handle stop climate service."""
-        vin = call.data[ATTR_VIN]
-        await api.stop_climate(vin)
-        await coordinator.async_request_refresh()
-
-    async def handle_horn(call: ServiceCall) -> None:
-        """Handle horn service."""
-        vin = call.data[ATTR_VIN]
-        count = call.data.get(ATTR_COUNT, 1)
-        await api.horn(vin, count)
-
-    async def handle_lights(call: ServiceCall) -> None:
-        """Handle lights service."""
-        vin = call.data[ATTR_VIN]
-        count = call.data.get(ATTR_COUNT, 1)
-        await api.flash_lights(vin, count)
-
-    async def handle_wakeup(call: ServiceCall) -> None:
-        """Handle wakeup service."""
-        vin = call.data[ATTR_VIN]
-        await api.wakeup(vin)
-        await coordinator.async_request_refresh()
-
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SET_CHARGE_THRESHOLD,
-        handle_set_charge_threshold,
-        schema=SERVICE_SET_CHARGE_THRESHOLD_SCHEMA,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SET_CHARGE_SCHEDULE,
-        handle_set_charge_schedule,
-        schema=SERVICE_SET_CHARGE_SCHEDULE_SCHEMA,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_START_CLIMATE,
-        handle_start_climate,
-        schema=SERVICE_CLIMATE_SCHEMA,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_STOP_CLIMATE,
-        handle_stop_climate,
-        schema=SERVICE_WAKEUP_SCHEMA,
-    )
-    hass.services.async_register(
-        DOMAIN, SERVICE_HORN, handle_horn, schema=SERVICE_HORN_LIGHTS_SCHEMA
-    )
-    hass.services.async_register(
-        DOMAIN, SERVICE_LIGHTS, handle_lights, schema=SERVICE_HORN_LIGHTS_SCHEMA
-    )
-    hass.services.async_register(
-        DOMAIN, SERVICE_WAKEUP, handle_wakeup, schema=SERVICE_WAKEUP_SCHEMA
-    )
+    async_register_vehicle(hass, vin, hass.data[DOMAIN][entry.entry_id])
 
     # Setup platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    @callback
+    def _async_check_capabilities() -> None:
+        """Reload the entry once the vehicle reports a new feature."""
+        nonlocal capabilities
+        added = coordinator.get_vehicle_data(vin).capabilities - capabilities
+        if added:
+            _LOGGER.info(
+                "Vehicle %s now reports %s, reloading", vin, ", ".join(sorted(added))
+            )
+            capabilities |= added
+            hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_capabilities))
+
+    if restored:
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh_vehicle(vin),
+            f"{DOMAIN} first refresh {vin}",
+        )
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    # Avant toute attente : une autre entrée qui passe la main aux capteurs
+    # du serveur ne doit pas choisir celle-ci
+    async_withdraw_metrics(hass, entry.data[CONF_API_URL], entry.entry_id)
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, hass.data[DOMAIN][entry.entry_id]["platforms"]
+    )
+    if not unload_ok:
+        async_withdraw_metrics(
+            hass, entry.data[CONF_API_URL], entry.entry_id, leaving=False
+        )
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        async_unregister_vehicle(hass, entry_data["vin"])
+        entry_data["commands"].async_cancel()
+        entry_data["coordinator"].remove_vehicle(entry_data["vin"])
+        if entry.options.get(CONF_RECORD_RESPONSES):
+            entry_data["api"].recorder = None
+        await async_release_api_client(hass, entry.data[CONF_API_URL], entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the cached snapshot, trips and GPS track of a removed vehicle."""
+    vin = entry.data[CONF_VIN]
+    for store in (async_get_snapshot_store(hass), async_get_trip_store(hass)):
+        await store.async_load()
+        store.async_remove(vin)
+    # Module numpy : importé hors de la boucle, comme par le coordinateur
+    tracks = await hass.async_add_executor_job(import_module, f"{__name__}.tracks")
+    await tracks.async_get_track_store(hass).async_remove(vin)
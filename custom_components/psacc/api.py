@@ -1,13 +1,34 @@
 """PSA Car Controller API Client."""
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Any, Dict, Optional
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime
 
 import aiohttp
-from aiohttp import ClientError, ClientTimeout
+from aiohttp import ClientError, ClientResponseError, ClientTimeout, hdrs
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est fourni par Home Assistant
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 from .const import (
+    DEBUG_LOG_MAX_LENGTH,
+    MAX_RESPONSE_SIZE,
+    POOL_DNS_CACHE_TTL,
+    POOL_KEEPALIVE_TIMEOUT,
+    POOL_LIMIT,
+    POOL_LIMIT_PER_HOST,
+    REQUEST_TIMEOUT,
     API_VEHICLES,
     API_STATUS,
     API_CHARGE_NOW,
@@ -23,66 +44,503 @@ from .const import (
     API_CHARGE_THRESHOLD,
 )
 
+from .metrics import (
+    ApiMetrics,
+    ERROR_CIRCUIT_OPEN,
+    ERROR_CLIENT,
+    ERROR_CONNECTION,
+    ERROR_SERVER,
+    ERROR_TIMEOUT,
+)
+from .recording import ResponseRecorder
+from .retry import CircuitBreaker, RetryPolicy
+
 _LOGGER = logging.getLogger(__name__)
 
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+
 class PSACCApiError(Exception):
     """Base exception for PSACC API errors."""
 
 class PSACCApiConnectionError(PSACCApiError):
     """Connection error exception."""
 
+class PSACCApiTimeoutError(PSACCApiConnectionError):
+    """Timeout error exception."""
+
+class PSACCApiServerError(PSACCApiConnectionError):
+    """Server side (5xx) error exception."""
+
+class PSACCApiCircuitOpenError(PSACCApiConnectionError):
+    """Request rejected because the server is known to be down."""
+
 class PSACCApiAuthError(PSACCApiError):
     """Authentication error exception."""
 
+class _Truncated:
+    """Render a response body for debug logs only when a handler formats it."""
+
+    __slots__ = ("_body",)
+
+    def __init__(self, body: bytes) -> None:
+        """Initialize with the raw body."""
+        self._body = body
+
+    def __str__(self) -> str:
+        """Return the start of the body, decoded."""
+        text = self._body[:DEBUG_LOG_MAX_LENGTH].decode("utf-8", errors="replace")
+        if len(self._body) > DEBUG_LOG_MAX_LENGTH:
+            text += f"... ({len(self._body)} bytes)"
+        return text
+
+
+class _CachedResponse:
+    """Validators and decoded body of the last successful GET on an endpoint."""
+
+    __slots__ = ("etag", "last_modified", "wire_digest", "digest", "size", "data")
+
+    def __init__(
+        self,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        wire_digest: bytes,
+        digest: bytes,
+        size: int,
+        data: Any,
+    ) -> None:
+        """Initialize the cache entry."""
+        self.etag = etag
+        self.last_modified = last_modified
+        # Empreinte du corps tel que reçu (compressé) et une fois décompressé
+        self.wire_digest = wire_digest
+        self.digest = digest
+        self.size = size
+        self.data = data
+
+
+class _Exchange:
+    """What the server answered to one request, kept for the recorder."""
+
+    __slots__ = ("status", "content_type", "response")
+
+    def __init__(self) -> None:
+        """Initialize an exchange without answer."""
+        self.status: Optional[int] = None
+        self.content_type: Optional[str] = None
+        # JSON décodé, ou texte du corps pour une erreur ou un autre type
+        self.response: Any = None
+
+
+def _digest(body: bytes) -> bytes:
+    """Return a short content digest."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def _decompress(body: bytes, encoding: str) -> bytes:
+    """Decode a Content-Encoding, refusing output above the size cap."""
+    if encoding == "br":
+        if brotli is None:
+            raise PSACCApiError("Received brotli content without brotli support")
+        decoded = brotli.decompress(body)
+        if len(decoded) > MAX_RESPONSE_SIZE:
+            raise PSACCApiError(f"Response exceeds {MAX_RESPONSE_SIZE} bytes")
+        return decoded
+
+    if encoding == "gzip":
+        wbits_options = (16 + zlib.MAX_WBITS,)
+    elif encoding == "deflate":
+        # "deflate" est parfois envoyé sans l'en-tête zlib
+        wbits_options = (zlib.MAX_WBITS, -zlib.MAX_WBITS)
+    else:
+        raise PSACCApiError(f"Unsupported content encoding: {encoding}")
+
+    for wbits in wbits_options:
+        decompressor = zlib.decompressobj(wbits)
+        try:
+            decoded = decompressor.decompress(body, MAX_RESPONSE_SIZE + 1)
+        except zlib.error:
+            continue
+        if len(decoded) > MAX_RESPONSE_SIZE or decompressor.unconsumed_tail:
+            raise PSACCApiError(f"Response exceeds {MAX_RESPONSE_SIZE} bytes")
+        return decoded
+    raise PSACCApiError(f"Invalid {encoding} content")
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create a client session with a connection pool tuned for one PSACC server."""
+    connector = aiohttp.TCPConnector(
+        limit=POOL_LIMIT,
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        keepalive_timeout=POOL_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=POOL_DNS_CACHE_TTL,
+        use_dns_cache=True,
+    )
+    # La décompression est faite par le client, pour pouvoir mesurer le gain
+    # et éviter de décompresser une réponse identique à la précédente
+    return aiohttp.ClientSession(connector=connector, auto_decompress=False)
+
+
 class PSACCApiClient:
     """API client for PSA Car Controller."""
 
-    def __init__(self, api_url: str, session: aiohttp.ClientSession):
+    def __init__(
+        self,
+        api_url: str,
+        session: aiohttp.ClientSession,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
         """Initialize the API client."""
         self._api_url = api_url.rstrip("/")
         self._session = session
-        self._timeout = ClientTimeout(total=30)
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._breaker = circuit_breaker or CircuitBreaker()
+        self._timeout = ClientTimeout(total=REQUEST_TIMEOUT)
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._cache: Dict[str, _CachedResponse] = {}
+        self.metrics = ApiMetrics()
+        # Enregistrement des échanges pour rejeu hors ligne (désactivé par défaut)
+        self.recorder: Optional[ResponseRecorder] = None
+
+    @property
+    def api_url(self) -> str:
+        """Return the base URL of the PSACC server."""
+        return self._api_url
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session used by this client."""
+        return self._session
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the circuit breaker guarding this server."""
+        return self._breaker
 
     async def _request(
-        self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Make a request to the API."""
+        """Make a request to the API.
+
+        Concurrent identical GET requests share a single upstream call. When a
+        GET returns the same content as last time, the previously decoded
+        object is returned as is, so callers can detect "unchanged" with an
+        identity check. Returned objects must therefore not be mutated.
+
+        ``name`` groups the request in the client metrics; it defaults to the
+        endpoint itself.
+        """
+        name = name or endpoint
+        if method != "GET":
+            # Les commandes ne sont pas idempotentes : une seule tentative
+            return await self._send_guarded(method, endpoint, data, name, final=True)
+
+        key = (method, endpoint)
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.get_running_loop().create_task(
+                self._send_with_retry(method, endpoint, data, name)
+            )
+            self._inflight[key] = pending
+            pending.add_done_callback(
+                lambda task, key=key: self._request_done(key, task)
+            )
+        else:
+            _LOGGER.debug("Joining in-flight request %s %s", method, endpoint)
+
+        # Un appelant annulé ne doit pas annuler la requête partagée
+        return await asyncio.shield(pending)
+
+    def _request_done(self, key: Tuple[str, str], task: asyncio.Future) -> None:
+        """Forget a finished shared request."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Évite "exception was never retrieved" si tous les appelants sont partis
+            task.exception()
+
+    async def _send_with_retry(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        name: str,
+    ) -> Dict[str, Any]:
+        """Send an idempotent request, retrying transient failures."""
+        policy = self._retry_policy
+        attempt = 1
+        while True:
+            try:
+                return await self._send_guarded(
+                    method,
+                    endpoint,
+                    data,
+                    name,
+                    final=attempt >= policy.max_attempts,
+                )
+            except PSACCApiCircuitOpenError:
+                raise
+            except PSACCApiConnectionError as err:
+                if attempt >= policy.max_attempts:
+                    _LOGGER.error(
+                        "Request %s %s failed after %s attempts: %s",
+                        method, endpoint, attempt, err,
+                    )
+                    raise
+                delay = policy.delay(attempt)
+                _LOGGER.debug(
+                    "Attempt %s for %s %s failed (%s), retrying in %.1fs",
+                    attempt, method, endpoint, err, delay,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _send_guarded(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        name: str,
+        final: bool,
+    ) -> Dict[str, Any]:
+        """Send a request through the circuit breaker and record its metrics.
+
+        The breaker counts one failure per logical request: only when the
+        last attempt (final) cannot reach the server. A 5xx answer comes
+        from a reachable server, often about one vehicle only, and is not
+        counted either way.
+        """
+        metrics = self.metrics.endpoint(name)
+        if not self._breaker.allow():
+            metrics.record_error(ERROR_CIRCUIT_OPEN)
+            raise PSACCApiCircuitOpenError(
+                f"PSACC server unavailable, retrying in "
+                f"{self._breaker.retry_after:.0f}s"
+            )
+
+        start = time.monotonic()
+        exchange = _Exchange() if self.recorder is not None else None
+        try:
+            result = await self._send(method, endpoint, data, name, exchange)
+        except PSACCApiConnectionError as err:
+            metrics.record_latency((time.monotonic() - start) * 1000)
+            if isinstance(err, PSACCApiTimeoutError):
+                metrics.record_error(ERROR_TIMEOUT)
+            elif isinstance(err, PSACCApiServerError):
+                metrics.record_error(ERROR_SERVER)
+            else:
+                metrics.record_error(ERROR_CONNECTION)
+            if final and not isinstance(err, PSACCApiServerError):
+                self._breaker.record_failure()
+            else:
+                self._breaker.release()
+            await self._async_record(method, endpoint, data, exchange, start, err)
+            raise
+        except PSACCApiError as err:
+            # Erreur fatale (4xx, HTML...) : le serveur répond
+            metrics.record_latency((time.monotonic() - start) * 1000)
+            metrics.record_error(ERROR_CLIENT)
+            self._breaker.record_success()
+            await self._async_record(method, endpoint, data, exchange, start, err)
+            raise
+        except asyncio.CancelledError:
+            self._breaker.release()
+            raise
+
+        metrics.record_latency((time.monotonic() - start) * 1000)
+        self._breaker.record_success()
+        if exchange is not None:
+            exchange.response = result
+            await self._async_record(method, endpoint, data, exchange, start)
+        return result
+
+    async def _async_record(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        exchange: Optional[_Exchange],
+        start: float,
+        err: Optional[PSACCApiError] = None,
+    ) -> None:
+        """Record an exchange, answered or not, when recording is enabled.
+
+        Without answer, error tells the replay what happened: "timeout" or
+        "connection". An answer the client rejected keeps its real status,
+        content type and body.
+        """
+        if exchange is None or self.recorder is None:
+            return
+        error = None
+        if isinstance(err, PSACCApiTimeoutError):
+            error = "timeout"
+        elif err is not None and exchange.status is None:
+            error = (
+                "connection" if isinstance(err, PSACCApiConnectionError) else str(err)
+            )
+        await self.recorder.async_record(
+            method,
+            endpoint,
+            data,
+            exchange.status or 0,
+            exchange.content_type or "",
+            exchange.response,
+            (time.monotonic() - start) * 1000,
+            error,
+        )
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        name: str,
+        exchange: Optional[_Exchange] = None,
+    ) -> Dict[str, Any]:
+        """Send a single request to the API.
+
+        exchange, if given, receives the status, content type and, for an
+        error or a non JSON answer, the body of the response.
+        """
         url = f"{self._api_url}{endpoint}"
+        headers = {}
+        manual_decompress = not self._session.auto_decompress
+        if manual_decompress:
+            headers[hdrs.ACCEPT_ENCODING] = ACCEPT_ENCODING
+        cached = self._cache.get(endpoint) if method == "GET" else None
+        if cached is not None:
+            if cached.etag:
+                headers[hdrs.IF_NONE_MATCH] = cached.etag
+            if cached.last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = cached.last_modified
         
         try:
             _LOGGER.debug("Request %s %s with data: %s", method, url, data)
             
             async with self._session.request(
-                method, url, json=data, timeout=self._timeout
+                method, url, json=data, headers=headers, timeout=self._timeout
             ) as response:
-                response.raise_for_status()
-                
                 # Vérifier le type de contenu
                 content_type = response.headers.get('content-type', '')
+                if exchange is not None:
+                    exchange.status = response.status
+                    exchange.content_type = content_type
+
+                if response.status == 304 and cached is not None:
+                    _LOGGER.debug("Response not modified for %s", endpoint)
+                    return cached.data
+
+                if response.status >= 400 and exchange is not None:
+                    exchange.response = await self._read_text(response, endpoint)
+                response.raise_for_status()
                 
                 if 'application/json' in content_type:
-                    result = await response.json()
-                    _LOGGER.debug("Response: %s", result)
+                    body = await self._read_body(response, endpoint)
+                    wire_size = len(body)
+                    wire_digest = _digest(body)
+                    if cached is not None and cached.wire_digest == wire_digest:
+                        # Contenu identique : ni décompression ni décodage JSON
+                        self.metrics.endpoint(name).record_bytes(
+                            wire_size, cached.size
+                        )
+                        _LOGGER.debug("Response unchanged for %s", endpoint)
+                        return cached.data
+
+                    encoding = response.headers.get(hdrs.CONTENT_ENCODING, "")
+                    encoding = encoding.strip().lower()
+                    if manual_decompress and encoding not in ("", "identity"):
+                        body = _decompress(body, encoding)
+                        digest = _digest(body)
+                    else:
+                        digest = wire_digest
+                    self.metrics.endpoint(name).record_bytes(wire_size, len(body))
+
+                    if cached is not None and cached.digest == digest:
+                        # Compression non déterministe (ex. mtime gzip)
+                        cached.wire_digest = wire_digest
+                        _LOGGER.debug("Response unchanged for %s", endpoint)
+                        return cached.data
+
+                    result = _json_loads(body)
+                    _LOGGER.debug("Response: %s", _Truncated(body))
+                    if method == "GET":
+                        self._cache[endpoint] = _CachedResponse(
+                            response.headers.get(hdrs.ETAG),
+                            response.headers.get(hdrs.LAST_MODIFIED),
+                            wire_digest,
+                            digest,
+                            len(body),
+                            result,
+                        )
                     return result
                 elif 'text/html' in content_type:
+                    if exchange is not None:
+                        exchange.response = await self._read_text(response, endpoint)
                     # L'API retourne du HTML, probablement le dashboard
                     _LOGGER.error("API returned HTML instead of JSON. Check if endpoint %s is correct", endpoint)
                     raise PSACCApiError(f"API returned HTML instead of JSON for {endpoint}")
                 else:
-                    text = await response.text()
-                    _LOGGER.error("Unexpected content type %s: %s", content_type, text[:200])
+                    body = await self._read_body(response, endpoint)
+                    if exchange is not None:
+                        exchange.response = body.decode("utf-8", errors="replace")
+                    _LOGGER.error(
+                        "Unexpected content type %s: %s",
+                        content_type,
+                        body[:200].decode("utf-8", errors="replace"),
+                    )
                     raise PSACCApiError(f"Unexpected content type: {content_type}")
                 
+        except PSACCApiError:
+            raise
         except asyncio.TimeoutError as err:
-            _LOGGER.error("Timeout connecting to PSACC API: %s", err)
-            raise PSACCApiConnectionError("Timeout connecting to API") from err
+            _LOGGER.debug("Timeout connecting to PSACC API: %s", err)
+            raise PSACCApiTimeoutError("Timeout connecting to API") from err
+        except ClientResponseError as err:
+            if err.status >= 500:
+                _LOGGER.debug("PSACC API server error: %s", err)
+                raise PSACCApiServerError(f"Server error: {err}") from err
+            _LOGGER.error("PSACC API rejected request %s: %s", endpoint, err)
+            raise PSACCApiError(f"Request rejected: {err}") from err
         except ClientError as err:
-            _LOGGER.error("Error connecting to PSACC API: %s", err)
+            _LOGGER.debug("Error connecting to PSACC API: %s", err)
             raise PSACCApiConnectionError(f"Error connecting to API: {err}") from err
         except Exception as err:
             _LOGGER.error("Unexpected error: %s", err)
             raise PSACCApiError(f"Unexpected error: {err}") from err
 
+    @staticmethod
+    async def _read_body(response: aiohttp.ClientResponse, endpoint: str) -> bytes:
+        """Read a response body once, refusing bodies above the size cap."""
+        if (response.content_length or 0) > MAX_RESPONSE_SIZE:
+            raise PSACCApiError(
+                f"Response from {endpoint} too large: {response.content_length} bytes"
+            )
+
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(65536):
+            size += len(chunk)
+            if size > MAX_RESPONSE_SIZE:
+                raise PSACCApiError(
+                    f"Response from {endpoint} exceeds {MAX_RESPONSE_SIZE} bytes"
+                )
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @classmethod
+    async def _read_text(
+        cls, response: aiohttp.ClientResponse, endpoint: str
+    ) -> str:
+        """Read a response body as text, for the recorder."""
+        body = await cls._read_body(response, endpoint)
+        return body.decode(response.charset or "utf-8", errors="replace")
+
     async def get_vehicles(self) -> list:
         """Get list of vehicles."""
         # Le PSA Car Controller ne retourne pas de liste de véhicules
@@ -94,13 +552,13 @@ class PSACCApiClient:
     async def get_vehicle_status(self, vin: str) -> Dict[str, Any]:
         """Get vehicle status."""
         endpoint = API_STATUS.format(vin=vin)
-        return await self._request("GET", endpoint)
+        return await self._request("GET", endpoint, name="get_vehicle_status")
 
     async def start_charge(self, vin: str) -> bool:
         """Start charging."""
         try:
             endpoint = API_CHARGE_NOW.format(vin=vin, charge="1")
-            await self._request("POST", endpoint)
+            await self._request("POST", endpoint, name="start_charge")
             return True
         except Exception as err:
             _LOGGER.error("Failed to start charge: %s", err)
@@ -110,7 +568,7 @@ class PSACCApiClient:
         """Stop charging."""
         try:
             endpoint = API_CHARGE_NOW.format(vin=vin, charge="0")
-            await self._request("POST", endpoint)
+            await self._request("POST", endpoint, name="stop_charge")
             return True
         except Exception as err:
             _LOGGER.error("Failed to stop charge: %s", err)
@@ -123,7 +581,9 @@ class PSACCApiClient:
                 "vin": vin,
                 "percentage": threshold
             }
-            await self._request("POST", API_CHARGE_THRESHOLD, data)
+            await self._request(
+                "POST", API_CHARGE_THRESHOLD, data, name="set_charge_threshold"
+            )
             return True
         except Exception as err:
             _LOGGER.error("Failed to set charge threshold: %s", err)
@@ -139,17 +599,44 @@ class PSACCApiClient:
                 "start": start_time,
                 "end": end_time
             }
-            await self._request("POST", API_CHARGE_HOUR, data)
+            await self._request(
+                "POST", API_CHARGE_HOUR, data, name="set_charge_schedule"
+            )
             return True
         except Exception as err:
             _LOGGER.error("Failed to set charge schedule: %s", err)
             return False
 
+    async def configure_charging(
+        self,
+        vin: str,
+        threshold: Optional[int] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+    ) -> bool:
+        """Set charge threshold and/or schedule in a single request."""
+        try:
+            # Même endpoint pour le seuil et l'horaire : un seul corps fusionné
+            data: Dict[str, Any] = {"vin": vin}
+            if threshold is not None:
+                data["percentage"] = threshold
+            if start_time is not None:
+                data["start"] = start_time
+            if end_time is not None:
+                data["end"] = end_time
+            await self._request(
+                "POST", API_CHARGE_THRESHOLD, data, name="configure_charging"
+            )
+            return True
+        except Exception as err:
+            _LOGGER.error("Failed to configure charging: %s", err)
+            return False
+
     async def start_climate(self, vin: str, temperature: float = 21.0) -> bool:
         """Start climate control."""
         try:
             endpoint = API_CLIMATE_START.format(vin=vin, temperature=temperature)
-            await self._request("POST", endpoint)
+            await self._request("POST", endpoint, name="start_climate")
             return True
         except Exception as err:
             _LOGGER.error("Failed to start climate: %s", err)
@@ -159,7 +646,7 @@ class PSACCApiClient:
         """Stop climate control."""
         try:
             endpoint = API_CLIMATE_STOP.format(vin=vin)
-            await self._request("POST", endpoint)
+            await self._request("POST", endpoint, name="stop_climate")
             return True
         except Exception as err:
             _LOGGER.error("Failed to stop climate: %s", err)
@@ -169,7 +656,7 @@ class PSACCApiClient:
         """Wake up vehicle."""
         try:
             endpoint = API_WAKEUP.format(vin=vin)
-            await self._request("POST", endpoint)
+            await self._request("POST", endpoint, name="wakeup")
             return True
         except Exception as err:
             _LOGGER.error("Failed to wake up vehicle: %s", err)
@@ -179,7 +666,7 @@ class PSACCApiClient:
         """Sound the horn."""
         try:
             endpoint = API_HORN.format(vin=vin, count=count)
-            await self._request("POST", endpoint)
+            await self._request("POST", endpoint, name="horn")
             return True
         except Exception as err:
             _LOGGER.error("Failed to sound horn: %s", err)
@@ -189,7 +676,7 @@ class PSACCApiClient:
         """Flash the lights."""
         try:
             endpoint = API_LIGHTS.format(vin=vin, count=count)
-            await self._request("POST", endpoint)
+            await self._request("POST", endpoint, name="flash_lights")
             return True
         except Exception as err:
             _LOGGER.error("Failed to flash lights: %s", err)
@@ -199,7 +686,7 @@ class PSACCApiClient:
         """Lock doors."""
         try:
             endpoint = API_LOCK.format(vin=vin)
-            await self._request("POST", endpoint)
+            await self._request("POST", endpoint, name="lock_doors")
             return True
         except Exception as err:
             _LOGGER.error("Failed to lock doors: %s", err)
@@ -209,7 +696,7 @@ class PSACCApiClient:
         """Unlock doors."""
         try:
             endpoint = API_UNLOCK.format(vin=vin)
-            await self._request("POST", endpoint)
+            await self._request("POST", endpoint, name="unlock_doors")
             return True
         except Exception as err:
             _LOGGER.error("Failed to unlock doors: %s", err)
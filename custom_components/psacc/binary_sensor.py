@@ -8,11 +8,9 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
-    MANUFACTURER,
     ICON_CHARGING,
     ICON_PLUGGED,
     ICON_DOOR,
@@ -20,6 +18,7 @@ from .const import (
     ICON_CLIMATE,
 )
 from .coordinator import PSACCDataUpdateCoordinator
+from .entity import PSACCEntity
 
 
 async def async_setup_entry(
@@ -30,25 +29,23 @@ async def async_setup_entry(
     """Set up PSACC binary sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     
-    entities = []
-    for vin, vehicle_data in coordinator.data.items():
-        entities.extend([
-            PSACCChargingBinarySensor(coordinator, vin),
-            PSACCPluggedBinarySensor(coordinator, vin),
-            PSACCDoorsLockedBinarySensor(coordinator, vin),
-            PSACCDoorDriverBinarySensor(coordinator, vin),
-            PSACCDoorPassengerBinarySensor(coordinator, vin),
-            PSACCDoorRearLeftBinarySensor(coordinator, vin),
-            PSACCDoorRearRightBinarySensor(coordinator, vin),
-            PSACCHoodBinarySensor(coordinator, vin),
-            PSACCTrunkBinarySensor(coordinator, vin),
-            PSACCClimateBinarySensor(coordinator, vin),
-        ])
-    
-    async_add_entities(entities)
-
-
-class PSACCBaseBinarySensor(CoordinatorEntity, BinarySensorEntity):
+    vin = hass.data[DOMAIN][entry.entry_id]["vin"]
+
+    async_add_entities([
+        PSACCChargingBinarySensor(coordinator, vin),
+        PSACCPluggedBinarySensor(coordinator, vin),
+        PSACCDoorsLockedBinarySensor(coordinator, vin),
+        PSACCDoorDriverBinarySensor(coordinator, vin),
+        PSACCDoorPassengerBinarySensor(coordinator, vin),
+        PSACCDoorRearLeftBinarySensor(coordinator, vin),
+        PSACCDoorRearRightBinarySensor(coordinator, vin),
+        PSACCHoodBinarySensor(coordinator, vin),
+        PSACCTrunkBinarySensor(coordinator, vin),
+        PSACCClimateBinarySensor(coordinator, vin),
+    ])
+
+
+class PSACCBaseBinarySensor(PSACCEntity, BinarySensorEntity):
     """Base class for PSACC binary sensors."""
 
     def __init__(
@@ -57,26 +54,7 @@ class PSACCBaseBinarySensor(CoordinatorEntity, BinarySensorEntity):
         vin: str,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._vin = vin
-        self._attr_has_entity_name = True
-
-    @property
-    def vehicle_data(self):
-        """Return vehicle data."""
-        return self.coordinator.get_vehicle_data(self._vin)
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        vehicle = self.vehicle_data
-        return {
-            "identifiers": {(DOMAIN, self._vin)},
-            "name": f"{vehicle.get('brand', 'PSA')} {vehicle.get('model', 'Car')}",
-            "manufacturer": MANUFACTURER,
-            "model": vehicle.get("model", "Connected Car"),
-            "sw_version": vehicle.get("firmware_version"),
-        }
+        super().__init__(coordinator, vin)
 
 
 class PSACCChargingBinarySensor(PSACCBaseBinarySensor):
@@ -85,6 +63,7 @@ class PSACCChargingBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Charging"
     _attr_device_class = BinarySensorDeviceClass.BATTERY_CHARGING
     _attr_icon = ICON_CHARGING
+    _watched_fields = ("charging_status",)
 
     @property
     def unique_id(self):
@@ -94,8 +73,7 @@ class PSACCChargingBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if charging."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        return charging.get("status") == "InProgress"
+        return self.vehicle.is_charging
 
 
 class PSACCPluggedBinarySensor(PSACCBaseBinarySensor):
@@ -104,6 +82,7 @@ class PSACCPluggedBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Plugged"
     _attr_device_class = BinarySensorDeviceClass.PLUG
     _attr_icon = ICON_PLUGGED
+    _watched_fields = ("plugged",)
 
     @property
     def unique_id(self):
@@ -113,8 +92,7 @@ class PSACCPluggedBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if plugged."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        return charging.get("plugged", False)
+        return bool(self.vehicle.plugged)
 
 
 class PSACCDoorsLockedBinarySensor(PSACCBaseBinarySensor):
@@ -123,6 +101,7 @@ class PSACCDoorsLockedBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Doors locked"
     _attr_device_class = BinarySensorDeviceClass.LOCK
     _attr_icon = ICON_DOOR_LOCK
+    _watched_fields = ("climate_status",)
 
     @property
     def unique_id(self):
@@ -132,8 +111,7 @@ class PSACCDoorsLockedBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if doors are locked."""
-        precond = self.vehicle_data.get("preconditionning", {})
-        return precond.get("airConditioning", {}).get("status") == "Enabled"
+        return self.vehicle.climate_status == "Enabled"
 
 
 class PSACCDoorDriverBinarySensor(PSACCBaseBinarySensor):
@@ -142,6 +120,7 @@ class PSACCDoorDriverBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Driver door"
     _attr_device_class = BinarySensorDeviceClass.DOOR
     _attr_icon = ICON_DOOR
+    _watched_fields = ("door_driver",)
 
     @property
     def unique_id(self):
@@ -151,8 +130,7 @@ class PSACCDoorDriverBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if door is open."""
-        doors = self.vehicle_data.get("doors", {})
-        return doors.get("driver") == "Open"
+        return self.vehicle.door_driver
 
 
 class PSACCDoorPassengerBinarySensor(PSACCBaseBinarySensor):
@@ -161,6 +139,7 @@ class PSACCDoorPassengerBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Passenger door"
     _attr_device_class = BinarySensorDeviceClass.DOOR
     _attr_icon = ICON_DOOR
+    _watched_fields = ("door_passenger",)
 
     @property
     def unique_id(self):
@@ -170,8 +149,7 @@ class PSACCDoorPassengerBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if door is open."""
-        doors = self.vehicle_data.get("doors", {})
-        return doors.get("passenger") == "Open"
+        return self.vehicle.door_passenger
 
 
 class PSACCDoorRearLeftBinarySensor(PSACCBaseBinarySensor):
@@ -180,6 +158,7 @@ class PSACCDoorRearLeftBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Rear left door"
     _attr_device_class = BinarySensorDeviceClass.DOOR
     _attr_icon = ICON_DOOR
+    _watched_fields = ("door_rear_left",)
 
     @property
     def unique_id(self):
@@ -189,8 +168,7 @@ class PSACCDoorRearLeftBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if door is open."""
-        doors = self.vehicle_data.get("doors", {})
-        return doors.get("rear_left") == "Open"
+        return self.vehicle.door_rear_left
 
 
 class PSACCDoorRearRightBinarySensor(PSACCBaseBinarySensor):
@@ -199,6 +177,7 @@ class PSACCDoorRearRightBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Rear right door"
     _attr_device_class = BinarySensorDeviceClass.DOOR
     _attr_icon = ICON_DOOR
+    _watched_fields = ("door_rear_right",)
 
     @property
     def unique_id(self):
@@ -208,8 +187,7 @@ class PSACCDoorRearRightBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if door is open."""
-        doors = self.vehicle_data.get("doors", {})
-        return doors.get("rear_right") == "Open"
+        return self.vehicle.door_rear_right
 
 
 class PSACCHoodBinarySensor(PSACCBaseBinarySensor):
@@ -218,6 +196,7 @@ class PSACCHoodBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Hood"
     _attr_device_class = BinarySensorDeviceClass.OPENING
     _attr_icon = ICON_DOOR
+    _watched_fields = ("hood",)
 
     @property
     def unique_id(self):
@@ -227,8 +206,7 @@ class PSACCHoodBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if hood is open."""
-        doors = self.vehicle_data.get("doors", {})
-        return doors.get("hood") == "Open"
+        return self.vehicle.hood
 
 
 class PSACCTrunkBinarySensor(PSACCBaseBinarySensor):
@@ -237,6 +215,7 @@ class PSACCTrunkBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Trunk"
     _attr_device_class = BinarySensorDeviceClass.OPENING
     _attr_icon = ICON_DOOR
+    _watched_fields = ("trunk",)
 
     @property
     def unique_id(self):
@@ -246,8 +225,7 @@ class PSACCTrunkBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if trunk is open."""
-        doors = self.vehicle_data.get("doors", {})
-        return doors.get("trunk") == "Open"
+        return self.vehicle.trunk
 
 
 class PSACCClimateBinarySensor(PSACCBaseBinarySensor):
@@ -256,6 +234,7 @@ class PSACCClimateBinarySensor(PSACCBaseBinarySensor):
     _attr_name = "Climate"
     _attr_device_class = BinarySensorDeviceClass.RUNNING
     _attr_icon = ICON_CLIMATE
+    _watched_fields = ("climate_status",)
 
     @property
     def unique_id(self):
@@ -265,6 +244,4 @@ class PSACCClimateBinarySensor(PSACCBaseBinarySensor):
     @property
     def is_on(self):
         """Return true if climate is active."""
-        precond = self.vehicle_data.get("preconditionning", {})
-        status = precond.get("airConditioning", {}).get("status")
-        return status in ["Enabled", "InProgress"]
+        return self.vehicle.climate_active
@@ -1,22 +1,25 @@
 """Button platform for PSA Car Controller."""
 from __future__ import annotations
 
+from typing import Awaitable
+
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+import homeassistant.util.dt as dt_util
 
-from .api import PSACCApiClient
+from .commands import PSACCCommandQueue
 from .const import (
     DOMAIN,
-    MANUFACTURER,
     ICON_DOOR_LOCK,
     ICON_DOOR_UNLOCK,
     ICON_HORN,
     ICON_LIGHTS,
 )
-from .coordinator import PSACCDataUpdateCoordinator
+from .coordinator import PSACCDataUpdateCoordinator, reported_after
+from .entity import PSACCEntity
 
 
 async def async_setup_entry(
@@ -26,53 +29,42 @@ async def async_setup_entry(
 ) -> None:
     """Set up PSACC button platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    api = hass.data[DOMAIN][entry.entry_id]["api"]
-    
-    entities = []
-    for vin, vehicle_data in coordinator.data.items():
-        entities.extend([
-            PSACCLockDoorsButton(coordinator, api, vin),
-            PSACCUnlockDoorsButton(coordinator, api, vin),
-            PSACCHornButton(coordinator, api, vin),
-            PSACCLightsButton(coordinator, api, vin),
-            PSACCWakeupButton(coordinator, api, vin),
-            PSACCRefreshButton(coordinator, api, vin),
-        ])
+    commands = hass.data[DOMAIN][entry.entry_id]["commands"]
     
-    async_add_entities(entities)
+    vin = hass.data[DOMAIN][entry.entry_id]["vin"]
 
+    async_add_entities([
+        PSACCLockDoorsButton(coordinator, commands, vin),
+        PSACCUnlockDoorsButton(coordinator, commands, vin),
+        PSACCHornButton(coordinator, commands, vin),
+        PSACCLightsButton(coordinator, commands, vin),
+        PSACCWakeupButton(coordinator, commands, vin),
+        PSACCRefreshButton(coordinator, commands, vin),
+    ])
 
-class PSACCBaseButton(CoordinatorEntity, ButtonEntity):
+
+class PSACCBaseButton(PSACCEntity, ButtonEntity):
     """Base class for PSACC buttons."""
 
+    _watched_fields = ()
+
     def __init__(
         self,
         coordinator: PSACCDataUpdateCoordinator,
-        api: PSACCApiClient,
+        commands: PSACCCommandQueue,
         vin: str,
     ) -> None:
         """Initialize the button."""
-        super().__init__(coordinator)
-        self._api = api
-        self._vin = vin
-        self._attr_has_entity_name = True
+        super().__init__(coordinator, vin)
+        self._commands = commands
 
-    @property
-    def vehicle_data(self):
-        """Return vehicle data."""
-        return self.coordinator.get_vehicle_data(self._vin)
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        vehicle = self.vehicle_data
-        return {
-            "identifiers": {(DOMAIN, self._vin)},
-            "name": f"{vehicle.get('brand', 'PSA')} {vehicle.get('model', 'Car')}",
-            "manufacturer": MANUFACTURER,
-            "model": vehicle.get("model", "Connected Car"),
-            "sw_version": vehicle.get("firmware_version"),
-        }
+    @staticmethod
+    async def _async_command(command: Awaitable[bool | None]) -> bool:
+        """Send a command; return False if it was cancelled out, unsent."""
+        sent = await command
+        if sent is False:
+            raise HomeAssistantError("Command rejected by PSA Car Controller")
+        return sent is not None
 
 
 class PSACCLockDoorsButton(PSACCBaseButton):
@@ -88,8 +80,9 @@ class PSACCLockDoorsButton(PSACCBaseButton):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self._api.lock_doors(self._vin)
-        await self.coordinator.async_request_refresh()
+        sent_at = dt_util.utcnow()
+        if await self._async_command(self._commands.lock_doors(self._vin)):
+            self.coordinator.async_confirm(self._vin, reported_after(sent_at))
 
 
 class PSACCUnlockDoorsButton(PSACCBaseButton):
@@ -105,8 +98,9 @@ class PSACCUnlockDoorsButton(PSACCBaseButton):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self._api.unlock_doors(self._vin)
-        await self.coordinator.async_request_refresh()
+        sent_at = dt_util.utcnow()
+        if await self._async_command(self._commands.unlock_doors(self._vin)):
+            self.coordinator.async_confirm(self._vin, reported_after(sent_at))
 
 
 class PSACCHornButton(PSACCBaseButton):
@@ -122,7 +116,7 @@ class PSACCHornButton(PSACCBaseButton):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self._api.horn(self._vin, 1)
+        await self._async_command(self._commands.horn(self._vin, 1))
 
 
 class PSACCLightsButton(PSACCBaseButton):
@@ -138,7 +132,7 @@ class PSACCLightsButton(PSACCBaseButton):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self._api.flash_lights(self._vin, 1)
+        await self._async_command(self._commands.flash_lights(self._vin, 1))
 
 
 class PSACCWakeupButton(PSACCBaseButton):
@@ -154,8 +148,10 @@ class PSACCWakeupButton(PSACCBaseButton):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self._api.wakeup(self._vin)
-        await self.coordinator.async_request_refresh()
+        sent_at = dt_util.utcnow()
+        if await self._async_command(self._commands.wakeup(self._vin)):
+            # Attente des données fraîches en arrière-plan, une seule par véhicule
+            self.coordinator.async_confirm(self._vin, reported_after(sent_at))
 
 
 class PSACCRefreshButton(PSACCBaseButton):
@@ -171,4 +167,4 @@ class PSACCRefreshButton(PSACCBaseButton):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_refresh_vehicle(self._vin)
@@ -0,0 +1,132 @@
+"""Charging session tracking for PSA Car Controller."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .models import VehicleState
+
+
+class ChargingSession:
+    """One charge, from its start to its end."""
+
+    __slots__ = (
+        "plugged_at",
+        "started_at",
+        "ended_at",
+        "start_level",
+        "end_level",
+        "energy",
+        "peak_power",
+    )
+
+    def __init__(
+        self,
+        started_at: datetime,
+        start_level: Optional[float],
+        plugged_at: Optional[datetime] = None,
+    ) -> None:
+        """Initialize a session starting now."""
+        self.plugged_at = plugged_at
+        self.started_at = started_at
+        self.ended_at: Optional[datetime] = None
+        self.start_level = start_level
+        self.end_level = start_level
+        self.energy = 0.0  # kWh
+        self.peak_power = 0.0  # kW
+
+    @property
+    def level_delta(self) -> Optional[float]:
+        """Return the state of charge gained, in %."""
+        if self.start_level is None or self.end_level is None:
+            return None
+        return self.end_level - self.start_level
+
+    def as_dict(self, capacity: Optional[float] = None) -> Dict[str, Any]:
+        """Return the session summary.
+
+        The integrated energy is cross-checked against the state of charge
+        gained times capacity (kWh) when known; otherwise the capacity
+        implied by the session is reported.
+        """
+        end = self.ended_at
+        summary: Dict[str, Any] = {
+            "plugged_at": self.plugged_at,
+            "started_at": self.started_at,
+            "ended_at": end,
+            "duration": (
+                round((end - self.started_at).total_seconds() / 60) if end else None
+            ),
+            "start_level": self.start_level,
+            "end_level": self.end_level,
+            "peak_power": self.peak_power,
+        }
+        delta = self.level_delta
+        if not delta or delta <= 0:
+            return summary
+        if capacity:
+            expected = delta / 100 * capacity
+            summary["energy_from_level"] = round(expected, 2)
+            summary["deviation"] = round((self.energy - expected) / expected * 100, 1)
+        elif self.energy:
+            summary["implied_capacity"] = round(self.energy / delta * 100, 1)
+        return summary
+
+
+class ChargingTracker:
+    """Detect the plug-in, charge start and charge end of one vehicle.
+
+    The energy is the trapezoidal integral of the charging rate between
+    consecutive reports (by updatedAt); the rate is taken as zero at the
+    first report after the end of a charge.
+    """
+
+    __slots__ = ("_last", "_plugged_at", "session", "energy")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._last: Optional[VehicleState] = None
+        self._plugged_at: Optional[datetime] = None
+        # Session en cours, ou la dernière terminée
+        self.session: Optional[ChargingSession] = None
+        # Énergie chargée depuis le démarrage, en kWh
+        self.energy = 0.0
+
+    def update(self, state: VehicleState) -> float:
+        """Account for a snapshot and return the energy charged since the last one.
+
+        Older or repeated reports are ignored.
+        """
+        last = self._last
+        moment = state.updated_at
+        if moment is None or (last is not None and moment <= last.updated_at):
+            return 0.0
+        self._last = state
+
+        if state.plugged and (last is None or not last.plugged):
+            self._plugged_at = moment if last is not None else None
+        elif not state.plugged:
+            self._plugged_at = None
+
+        energy = 0.0
+        if last is not None and last.is_charging:
+            hours = (moment - last.updated_at).total_seconds() / 3600
+            rate = (state.charging_rate or 0) if state.is_charging else 0
+            energy = ((last.charging_rate or 0) + rate) / 2 * hours
+
+        session = self.session
+        if state.is_charging and (last is None or not last.is_charging):
+            # Charge déjà en cours au premier rapport : début approximatif
+            session = self.session = ChargingSession(
+                moment, state.battery_level, self._plugged_at
+            )
+        if session is not None and session.ended_at is None:
+            session.energy += energy
+            session.end_level = state.battery_level
+            if state.is_charging:
+                session.peak_power = max(session.peak_power, state.charging_rate or 0)
+            elif last is not None and last.is_charging:
+                session.ended_at = moment
+
+        self.energy += energy
+        return energy
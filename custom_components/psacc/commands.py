@@ -0,0 +1,307 @@
+"""Per-vehicle command queue for PSA Car Controller."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from itertools import count
+import logging
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+from .api import PSACCApiClient
+from .const import COMMAND_DEBOUNCE, COMMAND_TOGGLE_DEBOUNCE
+
+_LOGGER = logging.getLogger(__name__)
+
+SLOT_CHARGE = "charge"
+SLOT_CHARGE_CONTROL = "charge_control"
+SLOT_CLIMATE = "climate"
+SLOT_DOORS = "doors"
+SLOT_WAKEUP = "wakeup"
+
+
+class PSACCCommand:
+    """A remote action waiting to be sent to one vehicle."""
+
+    __slots__ = (
+        "name", "slot", "cancels", "merge", "call", "params", "ready_at", "futures"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        slot: str,
+        call: Callable[..., Awaitable[bool]],
+        ready_at: float,
+        cancels: tuple[str, ...] = (),
+        params: dict[str, Any] | None = None,
+        merge: bool = False,
+    ) -> None:
+        """Initialize the command."""
+        self.name = name
+        self.slot = slot
+        self.call = call
+        self.params = params or {}
+        self.ready_at = ready_at
+        # Commandes en attente que celle-ci annule purement et simplement
+        self.cancels = cancels
+        # Fusionner les paramètres avec la commande en attente au lieu de la remplacer
+        self.merge = merge
+        self.futures: list[asyncio.Future] = []
+
+
+class _VehicleQueue:
+    """Serialize and coalesce the commands of one vehicle."""
+
+    def __init__(self, hass: HomeAssistant, vin: str) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._vin = vin
+        self._pending: OrderedDict[str, PSACCCommand] = OrderedDict()
+        self._changed = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+
+    def submit(self, command: PSACCCommand) -> asyncio.Future:
+        """Queue a command, coalescing it with a pending one in the same slot."""
+        future = self._hass.loop.create_future()
+        pending = self._pending.get(command.slot)
+
+        if pending is not None and pending.name in command.cancels:
+            # Ex. démarrer puis arrêter la charge : rien à envoyer, None
+            # indique aux appelants qu'aucun état ne viendra le confirmer
+            _LOGGER.debug(
+                "%s cancels pending %s for %s", command.name, pending.name, self._vin
+            )
+            del self._pending[command.slot]
+            for waiter in (*pending.futures, future):
+                if not waiter.done():
+                    waiter.set_result(None)
+            self._changed.set()
+            return future
+
+        if pending is not None:
+            # Le dernier ordre l'emporte, les appelants précédents attendent son résultat
+            _LOGGER.debug(
+                "%s supersedes pending %s for %s", command.name, pending.name, self._vin
+            )
+            command.futures.extend(pending.futures)
+            if command.merge and pending.merge:
+                command.params = {**pending.params, **command.params}
+
+        command.futures.append(future)
+        self._pending[command.slot] = command
+        self._changed.set()
+
+        if self._worker is None:
+            self._worker = self._hass.async_create_background_task(
+                self._async_run(), f"psacc commands {self._vin}"
+            )
+        return future
+
+    async def _async_run(self) -> None:
+        """Send pending commands one at a time, earliest ready first.
+
+        A command without debounce (horn, lights...) does not wait behind a
+        set point still debouncing; ties keep the submission order.
+        """
+        try:
+            while self._pending:
+                slot, command = min(
+                    self._pending.items(), key=lambda item: item[1].ready_at
+                )
+                delay = command.ready_at - self._hass.loop.time()
+                if delay > 0:
+                    # Attendre la fin du debounce ou une nouvelle commande
+                    self._changed.clear()
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                del self._pending[slot]
+                _LOGGER.debug("Sending %s for %s", command.name, self._vin)
+                try:
+                    result = await command.call(**command.params)
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOGGER.error("Command %s failed: %s", command.name, err)
+                    result = False
+
+                for future in command.futures:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._worker = None
+
+    def cancel(self) -> None:
+        """Drop pending commands and stop the worker."""
+        for command in self._pending.values():
+            for future in command.futures:
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+        if self._worker is not None:
+            self._worker.cancel()
+
+
+class PSACCCommandQueue:
+    """Send remote actions through one serialized queue per vehicle.
+
+    Exposes the same command methods as :class:`PSACCApiClient`. Commands for
+    a vehicle are sent one at a time; set points are debounced so that only
+    the last value is sent, and a toggle followed by its opposite while still
+    pending cancels out: both callers then get None instead of a bool.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: PSACCApiClient) -> None:
+        """Initialize the command queue."""
+        self._hass = hass
+        self._api = api
+        self._queues: dict[str, _VehicleQueue] = {}
+        self._unique = count()
+
+    async def _async_submit(
+        self,
+        vin: str,
+        name: str,
+        slot: str | None,
+        call: Callable[[], Awaitable[bool]],
+        debounce: float = 0,
+        cancels: tuple[str, ...] = (),
+        params: dict[str, Any] | None = None,
+    ) -> bool | None:
+        """Queue a command and wait for the outcome of whatever gets sent.
+
+        Return None if the command was cancelled out before being sent.
+        """
+        queue = self._queues.get(vin)
+        if queue is None:
+            queue = self._queues[vin] = _VehicleQueue(self._hass, vin)
+
+        if slot is None:
+            # Commande jamais fusionnée (klaxon, appels de phares...)
+            slot = f"{name}_{next(self._unique)}"
+
+        command = PSACCCommand(
+            name,
+            slot,
+            call,
+            self._hass.loop.time() + debounce,
+            cancels,
+            params,
+            merge=params is not None,
+        )
+        # L'annulation de l'appelant n'annule pas la commande
+        return await asyncio.shield(queue.submit(command))
+
+    async def start_charge(self, vin: str) -> bool | None:
+        """Start charging."""
+        return await self._async_submit(
+            vin, "start_charge", SLOT_CHARGE,
+            lambda: self._api.start_charge(vin),
+            COMMAND_TOGGLE_DEBOUNCE, ("stop_charge",),
+        )
+
+    async def stop_charge(self, vin: str) -> bool | None:
+        """Stop charging."""
+        return await self._async_submit(
+            vin, "stop_charge", SLOT_CHARGE,
+            lambda: self._api.stop_charge(vin),
+            COMMAND_TOGGLE_DEBOUNCE, ("start_charge",),
+        )
+
+    async def configure_charging(
+        self,
+        vin: str,
+        threshold: int | None = None,
+        start_time: str | None = None,
+        end_time: str | None = None,
+    ) -> bool:
+        """Set charge threshold and/or schedule.
+
+        Threshold and schedule changes submitted within the debounce window
+        are merged into a single ``/charge_control`` request.
+        """
+        params = {
+            key: value
+            for key, value in (
+                ("threshold", threshold),
+                ("start_time", start_time),
+                ("end_time", end_time),
+            )
+            if value is not None
+        }
+        return await self._async_submit(
+            vin, "configure_charging", SLOT_CHARGE_CONTROL,
+            lambda **kwargs: self._api.configure_charging(vin, **kwargs),
+            COMMAND_DEBOUNCE, params=params,
+        )
+
+    async def set_charge_threshold(self, vin: str, threshold: int) -> bool:
+        """Set charge threshold."""
+        return await self.configure_charging(vin, threshold=threshold)
+
+    async def set_charge_schedule(
+        self, vin: str, start_time: str, end_time: str
+    ) -> bool:
+        """Set charge schedule."""
+        return await self.configure_charging(
+            vin, start_time=start_time, end_time=end_time
+        )
+
+    async def start_climate(self, vin: str, temperature: float = 21.0) -> bool | None:
+        """Start climate control."""
+        return await self._async_submit(
+            vin, "start_climate", SLOT_CLIMATE,
+            lambda: self._api.start_climate(vin, temperature),
+            COMMAND_DEBOUNCE,
+        )
+
+    async def stop_climate(self, vin: str) -> bool | None:
+        """Stop climate control."""
+        return await self._async_submit(
+            vin, "stop_climate", SLOT_CLIMATE,
+            lambda: self._api.stop_climate(vin),
+            COMMAND_TOGGLE_DEBOUNCE, ("start_climate",),
+        )
+
+    async def wakeup(self, vin: str) -> bool:
+        """Wake up vehicle."""
+        return await self._async_submit(
+            vin, "wakeup", SLOT_WAKEUP, lambda: self._api.wakeup(vin)
+        )
+
+    async def horn(self, vin: str, count: int = 1) -> bool:
+        """Sound the horn."""
+        return await self._async_submit(
+            vin, "horn", None, lambda: self._api.horn(vin, count)
+        )
+
+    async def flash_lights(self, vin: str, count: int = 1) -> bool:
+        """Flash the lights."""
+        return await self._async_submit(
+            vin, "flash_lights", None, lambda: self._api.flash_lights(vin, count)
+        )
+
+    async def lock_doors(self, vin: str) -> bool:
+        """Lock doors."""
+        return await self._async_submit(
+            vin, "lock_doors", SLOT_DOORS,
+            lambda: self._api.lock_doors(vin),
+            COMMAND_TOGGLE_DEBOUNCE,
+        )
+
+    async def unlock_doors(self, vin: str) -> bool:
+        """Unlock doors."""
+        return await self._async_submit(
+            vin, "unlock_doors", SLOT_DOORS,
+            lambda: self._api.unlock_doors(vin),
+            COMMAND_TOGGLE_DEBOUNCE,
+        )
+
+    def async_cancel(self) -> None:
+        """Drop every pending command, e.g. when the entry is unloaded."""
+        for queue in self._queues.values():
+            queue.cancel()
+        self._queues.clear()
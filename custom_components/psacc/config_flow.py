@@ -6,19 +6,35 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_SCAN_INTERVAL
 from homeassistant.core import callback
-from homeassistant.helpers import aiohttp_client
 import homeassistant.helpers.config_validation as cv
 
-from .api import PSACCApiClient, PSACCApiConnectionError
+from .api import PSACCApiConnectionError
 from .const import (
     DOMAIN,
     CONF_API_URL,
+    CONF_ASLEEP_INTERVAL,
+    CONF_BATTERY_CAPACITY,
+    CONF_CHARGING_INTERVAL,
+    CONF_DRIVING_INTERVAL,
+    CONF_RECORD_RESPONSES,
+    CONF_TRACKER_MAX_AGE,
+    CONF_TRACKER_MIN_DISTANCE,
     CONF_UPDATE_INTERVAL,
     CONF_VIN,
+    DEFAULT_ASLEEP_INTERVAL,
+    DEFAULT_CHARGING_INTERVAL,
+    DEFAULT_DRIVING_INTERVAL,
+    DEFAULT_TRACKER_MAX_AGE,
+    DEFAULT_TRACKER_MIN_DISTANCE,
     DEFAULT_UPDATE_INTERVAL,
+    MAX_ASLEEP_INTERVAL,
+    MAX_BATTERY_CAPACITY,
+    MAX_TRACKER_MAX_AGE,
+    MAX_TRACKER_MIN_DISTANCE,
     MIN_UPDATE_INTERVAL,
     MAX_UPDATE_INTERVAL,
 )
+from .registry import async_get_api_client, async_release_api_client
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,8 +54,7 @@ class PSACCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vin = user_input[CONF_VIN]
             
             # Test the connection
-            session = aiohttp_client.async_get_clientsession(self.hass)
-            api = PSACCApiClient(api_url, session)
+            api = async_get_api_client(self.hass, api_url, self.flow_id)
             
             try:
                 # Test avec le VIN fourni
@@ -62,6 +77,8 @@ class PSACCConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
+            finally:
+                await async_release_api_client(self.hass, api_url, self.flow_id)
 
         return self.async_show_form(
             step_id="user",
@@ -106,13 +123,76 @@ class PSACCOptionsFlowHandler(config_entries.OptionsFlow):
                 {
                     vol.Optional(
                         CONF_UPDATE_INTERVAL,
-                        default=self._config_entry.data.get(
-                            CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+                        default=self._config_entry.options.get(
+                            CONF_UPDATE_INTERVAL,
+                            self._config_entry.data.get(
+                                CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+                            ),
                         ),
                     ): vol.All(
                         vol.Coerce(int),
                         vol.Range(min=MIN_UPDATE_INTERVAL, max=MAX_UPDATE_INTERVAL),
                     ),
+                    vol.Optional(
+                        CONF_CHARGING_INTERVAL,
+                        default=self._config_entry.options.get(
+                            CONF_CHARGING_INTERVAL, DEFAULT_CHARGING_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_UPDATE_INTERVAL, max=MAX_UPDATE_INTERVAL),
+                    ),
+                    vol.Optional(
+                        CONF_DRIVING_INTERVAL,
+                        default=self._config_entry.options.get(
+                            CONF_DRIVING_INTERVAL, DEFAULT_DRIVING_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_UPDATE_INTERVAL, max=MAX_UPDATE_INTERVAL),
+                    ),
+                    vol.Optional(
+                        CONF_ASLEEP_INTERVAL,
+                        default=self._config_entry.options.get(
+                            CONF_ASLEEP_INTERVAL, DEFAULT_ASLEEP_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_UPDATE_INTERVAL, max=MAX_ASLEEP_INTERVAL),
+                    ),
+                    vol.Optional(
+                        CONF_BATTERY_CAPACITY,
+                        default=self._config_entry.options.get(
+                            CONF_BATTERY_CAPACITY, 0
+                        ),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0, max=MAX_BATTERY_CAPACITY),
+                    ),
+                    vol.Optional(
+                        CONF_TRACKER_MIN_DISTANCE,
+                        default=self._config_entry.options.get(
+                            CONF_TRACKER_MIN_DISTANCE, DEFAULT_TRACKER_MIN_DISTANCE
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_TRACKER_MIN_DISTANCE),
+                    ),
+                    vol.Optional(
+                        CONF_TRACKER_MAX_AGE,
+                        default=self._config_entry.options.get(
+                            CONF_TRACKER_MAX_AGE, DEFAULT_TRACKER_MAX_AGE
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_TRACKER_MAX_AGE),
+                    ),
+                    vol.Optional(
+                        CONF_RECORD_RESPONSES,
+                        default=self._config_entry.options.get(
+                            CONF_RECORD_RESPONSES, False
+                        ),
+                    ): bool,
                 }
             ),
         )
@@ -5,11 +5,111 @@ DOMAIN = "psacc"
 CONF_API_URL = "api_url"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_VIN = "vin"
+CONF_RECORD_RESPONSES = "record_responses"
+CONF_CHARGING_INTERVAL = "charging_interval"
+CONF_DRIVING_INTERVAL = "driving_interval"
+CONF_ASLEEP_INTERVAL = "asleep_interval"
+CONF_BATTERY_CAPACITY = "battery_capacity"
+CONF_TRACKER_MIN_DISTANCE = "tracker_min_distance"
+CONF_TRACKER_MAX_AGE = "tracker_max_age"
 
 DEFAULT_UPDATE_INTERVAL = 5  # minutes
 MIN_UPDATE_INTERVAL = 1
 MAX_UPDATE_INTERVAL = 60
 
+# Adaptive polling: update_interval applies to a parked car, these to the
+# other states (minutes). A parked car whose updatedAt stops advancing for
+# STALE_CYCLES polls is polled twice as slowly on each further poll, up to
+# the asleep interval.
+DEFAULT_CHARGING_INTERVAL = 1
+DEFAULT_DRIVING_INTERVAL = 1
+DEFAULT_ASLEEP_INTERVAL = 60
+MAX_ASLEEP_INTERVAL = 240
+STALE_CYCLES = 3
+
+# Usable battery capacity (kWh) used to cross-check charging sessions;
+# 0 means unknown
+MAX_BATTERY_CAPACITY = 200
+
+# Device tracker gating: the position is only written when the car moved
+# more than the distance (meters) or when it is older than the age (minutes).
+# 0 writes every change.
+DEFAULT_TRACKER_MIN_DISTANCE = 50
+MAX_TRACKER_MIN_DISTANCE = 1000
+DEFAULT_TRACKER_MAX_AGE = 60
+MAX_TRACKER_MAX_AGE = 1440
+
+# Location accuracy (meters) by position signalQuality, lower-cased;
+# other values fall back to the default
+SIGNAL_QUALITY_ACCURACY = {
+    "excellent": 10,
+    "good": 20,
+    "average": 50,
+    "medium": 50,
+    "fair": 50,
+    "poor": 100,
+    "bad": 200,
+}
+DEFAULT_LOCATION_ACCURACY = 50
+
+# HTTP connection pool (one per PSACC server)
+REQUEST_TIMEOUT = 30  # seconds
+POOL_LIMIT = 10
+POOL_LIMIT_PER_HOST = 4
+POOL_KEEPALIVE_TIMEOUT = 60  # seconds
+POOL_DNS_CACHE_TTL = 300  # seconds
+
+# Vehicles polled concurrently by the coordinator of one PSACC server
+MAX_PARALLEL_UPDATES = POOL_LIMIT_PER_HOST
+
+# Vehicles handled concurrently by one service call
+SERVICE_MAX_PARALLEL = 8
+
+# Retry policy (idempotent GET requests only) and circuit breaker
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0  # seconds
+RETRY_MAX_DELAY = 10.0  # seconds
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 60  # seconds
+
+# Command confirmation: the vehicle is polled after these delays (seconds,
+# the last one repeats) until the command shows up in its data
+CONFIRM_BACKOFF = (5, 10, 15, 30, 60)
+CONFIRM_TIMEOUT = 180  # seconds
+# Wake-and-wait refresh: how long to wait for data newer than the wakeup
+FRESH_TIMEOUT = 300  # seconds
+
+# Command queue
+COMMAND_DEBOUNCE = 1.5  # seconds, set points (threshold, schedule, temperature)
+COMMAND_TOGGLE_DEBOUNCE = 1.0  # seconds, start/stop pairs that may cancel out
+
+# Last snapshot of each vehicle, kept in HA storage for instant startup
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60  # seconds
+
+# Trip history feeding the local consumption model, one column per field
+TRIPS_STORAGE_KEY = f"{DOMAIN}.trips"
+TRIPS_SAVE_DELAY = 300  # seconds
+
+# Recordings of API exchanges (relative to the HA config directory)
+RECORDINGS_DIR = "psacc_recordings"
+
+# GPS tracks: one columnar file per vehicle (relative to the HA config directory)
+TRACKS_DIR = "psacc_tracks"
+TRACKS_SAVE_DELAY = 300  # seconds
+TRACK_TOLERANCE = 10.0  # meters, Douglas-Peucker tolerance and minimum move
+TRACK_CHUNK = 256  # pending fixes simplified at once
+TRACK_SEGMENT_GAP = 1800  # seconds without a fix ending a track segment
+TRACK_RETENTION = 365  # days
+TRACK_FORMAT_GPX = "gpx"
+TRACK_FORMAT_GEOJSON = "geojson"
+TRACK_FORMATS = (TRACK_FORMAT_GPX, TRACK_FORMAT_GEOJSON)
+
+# Response bodies
+MAX_RESPONSE_SIZE = 1024 * 1024  # bytes
+DEBUG_LOG_MAX_LENGTH = 500  # characters
+
 # API Endpoints
 API_VEHICLES = "/vehicles"
 API_STATUS = "/get_vehicleinfo/{vin}"
@@ -61,6 +161,8 @@ ATTR_ENGINE_RUNNING = "engine_running"
 ATTR_FUEL_LEVEL = "fuel_level"
 ATTR_CONSUMPTION = "average_consumption"
 ATTR_CHARGE_THRESHOLD = "charge_threshold"
+ATTR_CACHED = "cached"
+ATTR_FETCHED_AT = "fetched_at"
 
 # Device info
 MANUFACTURER = "PSA"
@@ -75,6 +177,9 @@ SERVICE_HORN = "horn"
 SERVICE_LIGHTS = "lights"
 SERVICE_WAKEUP = "wakeup"
 SERVICE_GET_STATISTICS = "get_statistics"
+SERVICE_CONFIGURE_CHARGING = "configure_charging"
+SERVICE_REFRESH_FRESH = "refresh_fresh"
+SERVICE_EXPORT_TRACK = "export_track"
 
 # Service parameters
 ATTR_THRESHOLD = "threshold"
@@ -83,6 +188,11 @@ ATTR_END_TIME = "end_time"
 ATTR_TEMPERATURE = "temperature"
 ATTR_COUNT = "count"
 ATTR_PERIOD = "period"
+ATTR_TIMEOUT = "timeout"
+ATTR_FRESH = "fresh"
+ATTR_FORMAT = "format"
+ATTR_START = "start"
+ATTR_END = "end"
 
 # Icon mappings
 ICON_BATTERY = "mdi:battery"
@@ -0,0 +1,188 @@
+"""Local consumption and range model for PSA Car Controller."""
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .models import VehicleState
+
+# Colonnes de l'historique des trajets, dans l'ordre des tableaux
+COLUMNS = ("level_delta", "distance", "temperature")
+
+MIN_TRIP_DISTANCE = 2.0  # km
+MIN_TRIPS = 5
+MAX_TRIPS = 20000
+
+# Température de référence et échelle, pour des variables de l'ordre de 1
+REFERENCE_TEMPERATURE = 15.0  # °C
+TEMPERATURE_SCALE = 10.0  # °C
+
+# Rappel des coefficients vers zéro (sauf la constante), en km de trajets :
+# avec peu de trajets le modèle reste proche d'une consommation constante
+RIDGE = np.diag([0.0, 1.0, 1.0, 1.0])
+
+
+def _features(temperature: np.ndarray, distance: np.ndarray) -> np.ndarray:
+    """Return the regressors: 1, t, t² and 1/distance."""
+    scaled = (temperature - REFERENCE_TEMPERATURE) / TEMPERATURE_SCALE
+    return np.column_stack(
+        (np.ones_like(scaled), scaled, scaled * scaled, 1.0 / distance)
+    )
+
+
+class ConsumptionModel:
+    """Battery consumption against outside temperature and trip length.
+
+    Each trip gives a consumption in % of battery per km, fitted by least
+    squares weighted by the trip length as
+
+        c = b0 + b1·t + b2·t² + b3 / distance
+
+    where t is the scaled mean outside temperature of the trip. The normal
+    equations are accumulated trip by trip, so a refit solves a 4x4 system
+    whatever the length of the history.
+    """
+
+    __slots__ = (
+        "_columns",
+        "_gram",
+        "_moment",
+        "_coefficients",
+        "_last",
+        "_start",
+        "_temperatures",
+    )
+
+    def __init__(self, columns: Optional[Dict[str, List[float]]] = None) -> None:
+        """Initialize from a trip history as returned by columns()."""
+        self._columns: Dict[str, List[float]] = {name: [] for name in COLUMNS}
+        if columns:
+            size = min(len(columns.get(name) or []) for name in COLUMNS)
+            for name in COLUMNS:
+                self._columns[name] = [
+                    float(value) for value in columns[name][:size][-MAX_TRIPS:]
+                ]
+        self._gram = np.zeros((4, 4))
+        self._moment = np.zeros(4)
+        self._coefficients: Optional[np.ndarray] = None
+        # Suivi du trajet en cours
+        self._last: Optional[VehicleState] = None
+        self._start: Optional[VehicleState] = None
+        self._temperatures: List[float] = []
+        self._accumulate_all()
+
+    @property
+    def trips(self) -> int:
+        """Return the number of recorded trips."""
+        return len(self._columns["distance"])
+
+    def columns(self) -> Dict[str, List[float]]:
+        """Return the trip history, one list per column."""
+        return self._columns
+
+    def _accumulate_all(self) -> None:
+        """Rebuild the normal equations from the whole history at once."""
+        level_delta, distance, temperature = (
+            np.asarray(self._columns[name], dtype=float) for name in COLUMNS
+        )
+        features = _features(temperature, distance)
+        # Pondération par la distance : c·d = Δniveau
+        self._gram = features.T @ (features * distance[:, None])
+        self._moment = features.T @ level_delta
+        self._fit()
+
+    def _fit(self) -> None:
+        """Solve the normal equations."""
+        if self.trips < MIN_TRIPS:
+            self._coefficients = None
+            return
+        try:
+            self._coefficients = np.linalg.solve(self._gram + RIDGE, self._moment)
+        except np.linalg.LinAlgError:
+            self._coefficients = None
+
+    def add_trip(self, level_delta: float, distance: float, temperature: float) -> None:
+        """Record a trip and refit."""
+        for name, value in zip(COLUMNS, (level_delta, distance, temperature)):
+            self._columns[name].append(value)
+        if self.trips > MAX_TRIPS:
+            # Élagage par blocs, puis recalcul vectorisé
+            for name in COLUMNS:
+                del self._columns[name][: MAX_TRIPS // 10]
+            self._accumulate_all()
+            return
+        features = _features(np.array([temperature]), np.array([distance]))[0]
+        self._gram += distance * np.outer(features, features)
+        self._moment += level_delta * features
+        self._fit()
+
+    def update(self, state: VehicleState) -> bool:
+        """Follow trips through snapshots; return True if one was recorded.
+
+        A trip runs from the last snapshot before the mileage increases to
+        the first one where it stops increasing, even if the car is plugged
+        in by then. Trips reported plugged in or charging while the mileage
+        still increases, too short or without temperature are discarded.
+        Older or repeated reports are ignored.
+        """
+        last = self._last
+        if state.updated_at is None or (
+            last is not None and state.updated_at <= last.updated_at
+        ):
+            return False
+        self._last = state
+        if last is None or state.mileage is None or last.mileage is None:
+            return False
+
+        if state.mileage > last.mileage:
+            if state.is_charging or state.plugged:
+                self._start = None
+                return False
+            if self._start is None:
+                self._start = last
+                self._temperatures = []
+                if last.outside_temperature is not None:
+                    self._temperatures.append(last.outside_temperature)
+            if state.outside_temperature is not None:
+                self._temperatures.append(state.outside_temperature)
+            return False
+
+        start, self._start = self._start, None
+        if start is None or start.battery_level is None or state.battery_level is None:
+            return False
+        distance = state.mileage - start.mileage
+        level_delta = start.battery_level - state.battery_level
+        if distance < MIN_TRIP_DISTANCE or level_delta <= 0 or not self._temperatures:
+            return False
+        self.add_trip(
+            float(level_delta), float(distance), float(np.mean(self._temperatures))
+        )
+        return True
+
+    def consumption(
+        self, temperature: float, distance: Optional[float] = None
+    ) -> Optional[float]:
+        """Return the predicted consumption in % per km, None until fitted.
+
+        Without distance, the consumption of a long trip.
+        """
+        if self._coefficients is None:
+            return None
+        features = _features(
+            np.array([temperature], dtype=float),
+            np.array([distance or np.inf], dtype=float),
+        )[0]
+        value = float(features @ self._coefficients)
+        return value if value > 0 else None
+
+    def range(self, level: float, temperature: float) -> Optional[float]:
+        """Return the distance drivable with level % of battery, in km.
+
+        The distance d solves d·c(t, d) = level, i.e.
+        d = (level - b3) / (b0 + b1·t + b2·t²).
+        """
+        consumption = self.consumption(temperature)
+        if consumption is None:
+            return None
+        return max(0.0, (level - float(self._coefficients[3])) / consumption)
@@ -1,62 +1,525 @@
 """DataUpdateCoordinator for PSA Car Controller."""
+import asyncio
 import logging
-from datetime import timedelta
-from typing import Any, Dict
+from datetime import datetime, timedelta
+from types import ModuleType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
 
 from .api import PSACCApiClient, PSACCApiError
-from .const import DOMAIN
+from .const import (
+    CONFIRM_BACKOFF,
+    CONFIRM_TIMEOUT,
+    FRESH_TIMEOUT,
+    DEFAULT_ASLEEP_INTERVAL,
+    DEFAULT_CHARGING_INTERVAL,
+    DEFAULT_DRIVING_INTERVAL,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    MAX_PARALLEL_UPDATES,
+    STALE_CYCLES,
+)
+from .charging import ChargingSession, ChargingTracker
+from .models import VehicleState
+from .stats import VehicleStatistics
+from .store import async_get_snapshot_store, async_get_trip_store
+
+if TYPE_CHECKING:
+    from .consumption import ConsumptionModel
+    from .tracks import TrackStore
 
 _LOGGER = logging.getLogger(__name__)
 
+# Champs dont la variation indique un véhicule en mouvement
+MOVEMENT_FIELDS = frozenset(("mileage", "latitude", "longitude"))
 
-class PSACCDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching PSACC data."""
+# Un véhicule est interrogé s'il est dû dans moins de POLL_SLACK
+POLL_SLACK = timedelta(seconds=10)
+MIN_TICK = timedelta(seconds=30)
+
+Expectation = Callable[[VehicleState], bool]
+
+
+def _import_models() -> Tuple[ModuleType, ModuleType]:
+    """Import the numpy based consumption and track modules."""
+    # pylint: disable-next=import-outside-toplevel
+    from . import consumption, tracks
+
+    return consumption, tracks
+
+
+def reported_after(moment: datetime) -> Expectation:
+    """Return an expectation met once the vehicle reports data newer than moment."""
+    return lambda state: state.updated_at is not None and state.updated_at > moment
+
+
+class PollingSchedule:
+    """Polling intervals of one vehicle, in minutes."""
+
+    __slots__ = ("parked", "charging", "driving", "asleep")
 
     def __init__(
         self,
-        hass: HomeAssistant,
-        api: PSACCApiClient,
-        vin: str,
-        update_interval: int,
+        parked: int = DEFAULT_UPDATE_INTERVAL,
+        charging: int = DEFAULT_CHARGING_INTERVAL,
+        driving: int = DEFAULT_DRIVING_INTERVAL,
+        asleep: int = DEFAULT_ASLEEP_INTERVAL,
     ) -> None:
+        """Initialize the schedule."""
+        self.parked = parked
+        self.charging = charging
+        self.driving = driving
+        self.asleep = max(asleep, parked)
+
+    def interval(
+        self, state: VehicleState, moving: bool, stale_cycles: int
+    ) -> timedelta:
+        """Return the delay before the next poll of a vehicle."""
+        if state.is_charging:
+            minutes = self.charging
+        elif moving:
+            minutes = self.driving
+        else:
+            # Ralentissement progressif quand updatedAt n'avance plus
+            slowdown = min(max(0, stale_cycles - STALE_CYCLES + 1), 16)
+            minutes = min(self.asleep, self.parked * 2**slowdown)
+        return timedelta(minutes=minutes)
+
+
+class _Confirmation:
+    """Pending command confirmations of one vehicle."""
+
+    __slots__ = ("expectations", "restart", "task")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.expectations: List[Tuple[Expectation, datetime]] = []
+        self.restart = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class PSACCDataUpdateCoordinator(DataUpdateCoordinator):
+    """Poll every vehicle configured on one PSACC server.
+
+    Each vehicle has its own adaptive schedule; the coordinator wakes up for
+    the earliest one and only polls the vehicles that are due. ``data`` only
+    holds the vehicles whose last poll succeeded, so a failing VIN becomes
+    unavailable without affecting the others.
+
+    The last status of each vehicle is cached in HA storage; a vehicle can
+    be restored from it at startup and stays marked as cached until its
+    first live poll.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: PSACCApiClient) -> None:
         """Initialize."""
         self.api = api
-        self.vin = vin
-        self.vehicle_data = {}
-        
+        self._schedules: Dict[str, PollingSchedule] = {}
+        self._next_poll: Dict[str, datetime] = {}
+        self._intervals: Dict[str, timedelta] = {}
+        self._stale_cycles: Dict[str, int] = {}
+        self._available: set[str] = set()
+        self._states: Dict[str, VehicleState] = {}
+        self._last_status: Dict[str, Dict[str, Any]] = {}
+        # Champs modifiés lors de la dernière mise à jour, par VIN
+        self._changed: Dict[str, FrozenSet[str]] = {}
+        self._semaphore = asyncio.Semaphore(MAX_PARALLEL_UPDATES)
+        self._confirmations: Dict[str, _Confirmation] = {}
+        self._snapshots = async_get_snapshot_store(hass)
+        self._statistics: Dict[str, VehicleStatistics] = {}
+        self._charging: Dict[str, ChargingTracker] = {}
+        self._trips = async_get_trip_store(hass)
+        self._consumption: Dict[str, "ConsumptionModel"] = {}
+        # Modèles numpy importés au premier relevé, hors de la boucle
+        self._consumption_model: Optional[Type["ConsumptionModel"]] = None
+        self._tracks: Optional["TrackStore"] = None
+        # Date de récupération des snapshots venant du cache, par VIN
+        self._restored: Dict[str, datetime] = {}
+
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=update_interval),
+            name=f"{DOMAIN} {api.api_url}",
+            update_interval=MIN_TICK,
+            # Pas de notification des entités si les données sont identiques
+            always_update=False,
         )
 
-    async def _async_update_data(self) -> Dict[str, Any]:
-        """Update data via API."""
+    @property
+    def vins(self) -> list[str]:
+        """Return the polled VINs."""
+        return list(self._schedules)
+
+    def add_vehicle(self, vin: str, schedule: PollingSchedule) -> None:
+        """Start polling a vehicle; it is due immediately."""
+        self._schedules[vin] = schedule
+        self._next_poll.pop(vin, None)
+
+    def remove_vehicle(self, vin: str) -> None:
+        """Stop polling a vehicle."""
+        confirmation = self._confirmations.pop(vin, None)
+        if confirmation is not None:
+            confirmation.task.cancel()
+        for store in (
+            self._schedules,
+            self._next_poll,
+            self._intervals,
+            self._stale_cycles,
+            self._states,
+            self._last_status,
+            self._changed,
+            self._restored,
+            self._statistics,
+            self._charging,
+            self._consumption,
+        ):
+            store.pop(vin, None)
+        self._available.discard(vin)
+
+    async def async_restore_vehicle(self, vin: str) -> bool:
+        """Publish the cached snapshot of a vehicle until it is polled.
+
+        Return True if the vehicle has data to show, cached or live.
+        """
+        if vin not in self._schedules:
+            return False
+        await self._snapshots.async_load()
+        if vin in self._states:
+            return vin in self._available
+        cached = self._snapshots.get(vin)
+        if cached is None:
+            return False
+        status, fetched_at = cached
+        self._last_status[vin] = status
+        self._states[vin] = VehicleState.from_status(vin, status)
+        self._restored[vin] = fetched_at
+        self._available.add(vin)
+        _LOGGER.debug("Restored %s from its snapshot of %s", vin, fetched_at)
+        self._async_notify_vehicle(vin)
+        return True
+
+    def cached_since(self, vin: str) -> Optional[datetime]:
+        """Return when the cached snapshot of a vehicle was fetched.
+
+        None once the vehicle has been polled live.
+        """
+        return self._restored.get(vin)
+
+    def poll_interval(self, vin: str) -> Optional[timedelta]:
+        """Return the delay between the last and the next poll of a vehicle."""
+        return self._intervals.get(vin)
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh of every vehicle, whatever their schedule."""
+        self._next_poll.clear()
+        await super().async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled polls and pending confirmations."""
+        await super().async_shutdown()
+        for confirmation in self._confirmations.values():
+            confirmation.task.cancel()
+        self._confirmations.clear()
+
+    async def async_refresh_vehicle(self, vin: str) -> VehicleState:
+        """Poll one vehicle now and notify the entities."""
+        if vin not in self._schedules:
+            return self.get_vehicle_data(vin)
+        self._changed[vin] = frozenset()
+        await self._async_update_vehicle(vin)
+        self._reschedule()
+        self._async_notify_vehicle(vin)
+        return self.get_vehicle_data(vin)
+
+    @callback
+    def _async_notify_vehicle(self, vin: str) -> None:
+        """Publish the data after an update of vin alone.
+
+        Every listener is called, but the other vehicles report no changed
+        field meanwhile. Their own changes are kept for the fleet update
+        still in flight, if any.
+        """
+        changed = self._changed
+        masked = dict.fromkeys(self._schedules, frozenset())
+        # Sans entrée pour vin, tous ses champs comptent comme modifiés
+        del masked[vin]
+        if vin in changed:
+            masked[vin] = changed[vin]
+        self._changed = masked
         try:
-            # Récupérer le statut du véhicule avec le VIN
-            status = await self.api.get_vehicle_status(self.vin)
-            
-            # Stocker les données avec le VIN comme clé
-            data = {
-                self.vin: {
-                    "vin": self.vin,
-                    **status,
-                }
-            }
-            
-            return data
-
-        except PSACCApiError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
-
-    def get_vehicle_data(self, vin: str) -> Dict[str, Any]:
-        """Get data for a specific vehicle."""
-        return self.data.get(vin, {})
-
-    def get_all_vehicles(self) -> Dict[str, Any]:
+            self.async_set_updated_data(self._build_data())
+        finally:
+            self._changed = changed
+
+    @callback
+    def async_confirm(
+        self, vin: str, expected: Expectation, timeout: float = CONFIRM_TIMEOUT
+    ) -> None:
+        """Poll a vehicle until expected holds for its data, or timeout seconds.
+
+        PSA remote actions take tens of seconds to show up; the vehicle is
+        polled on the CONFIRM_BACKOFF schedule instead of waiting for its
+        next regular poll.
+        """
+        if vin not in self._schedules:
+            return
+        deadline = dt_util.utcnow() + timedelta(seconds=timeout)
+        confirmation = self._confirmations.get(vin)
+        if confirmation is None:
+            confirmation = self._confirmations[vin] = _Confirmation()
+            confirmation.task = self.hass.async_create_background_task(
+                self._async_confirm(vin, confirmation), f"{DOMAIN} confirm {vin}"
+            )
+        confirmation.expectations.append((expected, deadline))
+        confirmation.restart.set()
+
+    async def _async_confirm(self, vin: str, confirmation: "_Confirmation") -> None:
+        """Poll a vehicle until its pending expectations are met or expired."""
+        try:
+            attempt = 0
+            while confirmation.expectations:
+                delay = CONFIRM_BACKOFF[min(attempt, len(CONFIRM_BACKOFF) - 1)]
+                try:
+                    await asyncio.wait_for(confirmation.restart.wait(), delay)
+                except asyncio.TimeoutError:
+                    attempt += 1
+                else:
+                    # Nouvelle commande : le calendrier repart du début
+                    confirmation.restart.clear()
+                    attempt = 0
+                    continue
+
+                state = await self.async_refresh_vehicle(vin)
+                now = dt_util.utcnow()
+                pending = []
+                for expected, deadline in confirmation.expectations:
+                    if expected(state):
+                        _LOGGER.debug("Command confirmed for %s", vin)
+                    elif deadline <= now:
+                        _LOGGER.debug("Command not confirmed in time for %s", vin)
+                    else:
+                        pending.append((expected, deadline))
+                confirmation.expectations = pending
+        finally:
+            if self._confirmations.get(vin) is confirmation:
+                del self._confirmations[vin]
+
+    async def async_wait_fresh(
+        self, vin: str, since: datetime, timeout: float = FRESH_TIMEOUT
+    ) -> Tuple[VehicleState, bool]:
+        """Poll a vehicle until it reports data newer than since.
+
+        Return the last snapshot and whether it is fresh, i.e. whether the
+        vehicle reported before timeout seconds elapsed.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        fresh = reported_after(since)
+        state = self.get_vehicle_data(vin)
+        attempt = 0
+        while not fresh(state):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return state, False
+            delay = CONFIRM_BACKOFF[min(attempt, len(CONFIRM_BACKOFF) - 1)]
+            attempt += 1
+            await asyncio.sleep(min(delay, remaining))
+            state = await self.async_refresh_vehicle(vin)
+        return state, True
+
+    async def async_refresh_fresh(
+        self,
+        vin: str,
+        wakeup: Optional[Callable[[str], Awaitable[Optional[bool]]]] = None,
+        timeout: float = FRESH_TIMEOUT,
+    ) -> Tuple[VehicleState, bool]:
+        """Wake a vehicle up and wait for data newer than the wakeup.
+
+        wakeup defaults to the API call; pass the command queue's to have
+        it coalesced with other wakeups. A rejected wakeup returns the
+        current snapshot at once, as not fresh.
+        """
+        woken_at = dt_util.utcnow()
+        if not await (wakeup or self.api.wakeup)(vin):
+            return self.get_vehicle_data(vin), False
+        return await self.async_wait_fresh(vin, woken_at, timeout)
+
+    async def _async_update_vehicle(self, vin: str) -> None:
+        """Poll one vehicle and plan its next poll."""
+        schedule = self._schedules[vin]
+        async with self._semaphore:
+            try:
+                status = await self.api.get_vehicle_status(vin)
+            except PSACCApiError as err:
+                _LOGGER.warning("Error updating vehicle %s: %s", vin, err)
+                self._available.discard(vin)
+                self._restored.pop(vin, None)
+                interval = timedelta(minutes=schedule.parked)
+                self._intervals[vin] = interval
+                self._next_poll[vin] = dt_util.utcnow() + interval
+                return
+        self._available.add(vin)
+        now = dt_util.utcnow()
+        self._snapshots.async_save(vin, status, now)
+        # Un snapshot du cache ne permet pas de conclure à un déplacement
+        restored = self._restored.pop(vin, None) is not None
+
+        previous = self._states.get(vin)
+        # Le client renvoie le même objet quand la réponse n'a pas changé
+        if status is self._last_status.get(vin) and previous is not None:
+            state = previous
+            changed: FrozenSet[str] = frozenset()
+        else:
+            self._last_status[vin] = status
+            # Analyse unique de la réponse, les entités lisent des attributs
+            state = VehicleState.from_status(vin, status)
+            changed = state.changed_fields(previous)
+            self._states[vin] = state
+            charging = self._charging.get(vin)
+            if charging is None:
+                charging = self._charging[vin] = ChargingTracker()
+            statistics = self._statistics.get(vin)
+            if statistics is None:
+                statistics = self._statistics[vin] = VehicleStatistics()
+            statistics.update(state, charging.update(state))
+            tracks = await self._async_load_models()
+            consumption = self._consumption.get(vin)
+            if consumption is None:
+                await self._trips.async_load()
+                consumption = self._consumption[vin] = self._consumption_model(
+                    self._trips.get(vin)
+                )
+            if consumption.update(state):
+                self._trips.async_save(vin, consumption.columns())
+            track = await tracks.async_get(vin)
+            if track.add(state):
+                tracks.async_schedule_save(vin)
+        self._changed[vin] = changed
+
+        if previous is not None and state.updated_at == previous.updated_at:
+            self._stale_cycles[vin] = self._stale_cycles.get(vin, 0) + 1
+        else:
+            self._stale_cycles[vin] = 0
+
+        moving = (
+            previous is not None
+            and not restored
+            and not changed.isdisjoint(MOVEMENT_FIELDS)
+        )
+        interval = schedule.interval(state, moving, self._stale_cycles[vin])
+        self._intervals[vin] = interval
+        self._next_poll[vin] = now + interval
+        _LOGGER.debug("Next poll of %s in %s", vin, interval)
+
+    async def _async_update_data(self) -> Dict[str, VehicleState]:
+        """Update data via API."""
+        now = dt_util.utcnow()
+        due = [
+            vin
+            for vin in self._schedules
+            if vin not in self._next_poll or self._next_poll[vin] <= now + POLL_SLACK
+        ]
+        # Les véhicules non interrogés n'ont aucun champ modifié
+        self._changed = dict.fromkeys(self._changed, frozenset())
+        if due:
+            await asyncio.gather(*(self._async_update_vehicle(vin) for vin in due))
+
+        self._reschedule()
+
+        if due and not self._available:
+            raise UpdateFailed(f"Error communicating with API for {', '.join(due)}")
+
+        return self._build_data()
+
+    def _reschedule(self) -> None:
+        """Wake up for the vehicle closest to its next poll."""
+        if self._next_poll:
+            self.update_interval = max(
+                MIN_TICK, min(self._next_poll.values()) - dt_util.utcnow()
+            )
+
+    def _build_data(self) -> Dict[str, VehicleState]:
+        """Return the snapshots of the available vehicles."""
+        return {
+            vin: self._states[vin] for vin in self._schedules if vin in self._available
+        }
+
+    def get_vehicle_data(self, vin: str) -> VehicleState:
+        """Get the snapshot of a specific vehicle."""
+        state = self._states.get(vin)
+        return state if state is not None else VehicleState(vin)
+
+    def is_vehicle_available(self, vin: str) -> bool:
+        """Return True if the last poll of a vehicle succeeded."""
+        return self.last_update_success and vin in (self.data or {})
+
+    def fields_changed(self, vin: str, fields: Optional[Iterable[str]]) -> bool:
+        """Return True if one of fields changed for vin in the last update.
+
+        fields None stands for any field.
+        """
+        changed = self._changed.get(vin)
+        if changed is None:
+            return True
+        if fields is None:
+            return bool(changed)
+        return not changed.isdisjoint(fields)
+
+    def charged_energy(self, vin: str) -> float:
+        """Return the energy charged by a vehicle since startup, in kWh."""
+        charging = self._charging.get(vin)
+        return charging.energy if charging is not None else 0.0
+
+    def charging_session(self, vin: str) -> Optional[ChargingSession]:
+        """Return the current or last charging session of a vehicle."""
+        charging = self._charging.get(vin)
+        return charging.session if charging is not None else None
+
+    def consumption_model(self, vin: str) -> Optional["ConsumptionModel"]:
+        """Return the local consumption model of a vehicle."""
+        return self._consumption.get(vin)
+
+    async def async_export_track(
+        self,
+        vin: str,
+        format_: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Export the GPS track of a vehicle to a file and describe it."""
+        tracks = await self._async_load_models()
+        return await tracks.async_export(vin, format_, start, end)
+
+    async def _async_load_models(self) -> "TrackStore":
+        """Import the consumption and track models once, in the executor."""
+        if self._tracks is None:
+            consumption, tracks = await self.hass.async_add_executor_job(
+                _import_models
+            )
+            self._consumption_model = consumption.ConsumptionModel
+            self._tracks = tracks.async_get_track_store(self.hass)
+        return self._tracks
+
+    def get_statistics(self, vin: str, period: str) -> Dict[str, Any]:
+        """Return the current and previous totals of a vehicle over period."""
+        statistics = self._statistics.get(vin) or VehicleStatistics()
+        return statistics.as_dict(period, dt_util.utcnow())
+
+    def get_all_vehicles(self) -> Dict[str, VehicleState]:
         """Get all vehicles data."""
-        return self.data
+        return dict(self._states)
@@ -1,19 +1,39 @@
 """Device tracker platform for PSA Car Controller."""
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
 from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+import homeassistant.util.dt as dt_util
+from homeassistant.util.location import distance
 
 from .const import (
+    CONF_TRACKER_MAX_AGE,
+    CONF_TRACKER_MIN_DISTANCE,
+    DEFAULT_LOCATION_ACCURACY,
+    DEFAULT_TRACKER_MAX_AGE,
+    DEFAULT_TRACKER_MIN_DISTANCE,
     DOMAIN,
-    MANUFACTURER,
     ICON_LOCATION,
+    SIGNAL_QUALITY_ACCURACY,
 )
 from .coordinator import PSACCDataUpdateCoordinator
+from .entity import PSACCEntity
+from .models import VehicleState
+
+
+def accuracy_from_signal(signal_quality: Any) -> int:
+    """Return the location accuracy in meters for a signalQuality value."""
+    if isinstance(signal_quality, str):
+        return SIGNAL_QUALITY_ACCURACY.get(
+            signal_quality.lower(), DEFAULT_LOCATION_ACCURACY
+        )
+    return DEFAULT_LOCATION_ACCURACY
 
 
 async def async_setup_entry(
@@ -24,51 +44,111 @@ async def async_setup_entry(
     """Set up PSACC device tracker platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     
-    entities = []
-    for vin, vehicle_data in coordinator.data.items():
-        entities.append(PSACCDeviceTracker(coordinator, vin))
-    
-    async_add_entities(entities)
+    vin = hass.data[DOMAIN][entry.entry_id]["vin"]
+
+    async_add_entities(
+        [
+            PSACCDeviceTracker(
+                coordinator,
+                vin,
+                entry.options.get(
+                    CONF_TRACKER_MIN_DISTANCE, DEFAULT_TRACKER_MIN_DISTANCE
+                ),
+                entry.options.get(CONF_TRACKER_MAX_AGE, DEFAULT_TRACKER_MAX_AGE),
+            )
+        ]
+    )
+
+
+class PSACCDeviceTracker(PSACCEntity, TrackerEntity):
+    """PSACC device tracker.
+
+    The position shown is the one of the last written snapshot: a new
+    position is only written when it is more than min_distance meters
+    away or when the shown one is older than max_age minutes, so that GPS
+    jitter of a parked car does not reach the recorder.
+    """
 
-
-class PSACCDeviceTracker(CoordinatorEntity, TrackerEntity):
-    """PSACC device tracker."""
-
-    _attr_has_entity_name = True
     _attr_name = "Location"
     _attr_icon = ICON_LOCATION
+    _watched_fields = (
+        "latitude",
+        "longitude",
+        "altitude",
+        "heading",
+        "position_updated_at",
+        "signal_quality",
+    )
 
     def __init__(
         self,
         coordinator: PSACCDataUpdateCoordinator,
         vin: str,
+        min_distance: float = DEFAULT_TRACKER_MIN_DISTANCE,
+        max_age: float = DEFAULT_TRACKER_MAX_AGE,
     ) -> None:
         """Initialize the device tracker."""
-        super().__init__(coordinator)
-        self._vin = vin
+        super().__init__(coordinator, vin)
+        self._min_distance = min_distance
+        self._max_age = timedelta(minutes=max_age)
+        # Snapshot affiché et date de son écriture
+        self._shown: Optional[VehicleState] = None
+        self._shown_at: Optional[datetime] = None
+
+    @property
+    def _position(self) -> VehicleState:
+        """Return the snapshot whose position is shown."""
+        return self._shown if self._shown is not None else self.vehicle
+
+    async def async_added_to_hass(self) -> None:
+        """Show the current position."""
+        self._shown = self.vehicle
+        self._shown_at = dt_util.utcnow()
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the availability changed or the car really moved."""
+        if (
+            self.available == self._last_available
+            and self._is_cached() == self._last_cached
+            and (
+                not self.coordinator.fields_changed(self._vin, self._watched_fields)
+                or not self._moved(self.vehicle)
+            )
+        ):
+            return
+        self._async_write_state()
+
+    def _moved(self, vehicle: VehicleState) -> bool:
+        """Return True if vehicle should replace the shown position."""
+        shown = self._shown
+        if (
+            shown is None
+            or self._shown_at is None
+            or shown.latitude is None
+            or vehicle.latitude is None
+        ):
+            return True
+        if dt_util.utcnow() - self._shown_at >= self._max_age:
+            return True
+        moved = distance(
+            shown.latitude, shown.longitude, vehicle.latitude, vehicle.longitude
+        )
+        return moved is None or moved > self._min_distance
+
+    @callback
+    def _async_write_state(self) -> None:
+        """Show the current position and write the state."""
+        self._shown = self.vehicle
+        self._shown_at = dt_util.utcnow()
+        super()._async_write_state()
 
     @property
     def unique_id(self):
         """Return unique ID."""
         return f"{self._vin}_location"
 
-    @property
-    def vehicle_data(self):
-        """Return vehicle data."""
-        return self.coordinator.get_vehicle_data(self._vin)
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        vehicle = self.vehicle_data
-        return {
-            "identifiers": {(DOMAIN, self._vin)},
-            "name": f"{vehicle.get('brand', 'PSA')} {vehicle.get('model', 'Car')}",
-            "manufacturer": MANUFACTURER,
-            "model": vehicle.get("model", "Connected Car"),
-            "sw_version": vehicle.get("firmware_version"),
-        }
-
     @property
     def source_type(self) -> SourceType:
         """Return the source type."""
@@ -77,31 +157,26 @@ class PSACCDeviceTracker(CoordinatorEntity, TrackerEntity):
     @property
     def latitude(self) -> float | None:
         """Return latitude."""
-        position = self.vehicle_data.get("position", {})
-        coordinates = position.get("geometry", {}).get("coordinates", [])
-        return coordinates[1] if len(coordinates) >= 2 else None
+        return self._position.latitude
 
     @property
     def longitude(self) -> float | None:
         """Return longitude."""
-        position = self.vehicle_data.get("position", {})
-        coordinates = position.get("geometry", {}).get("coordinates", [])
-        return coordinates[0] if len(coordinates) >= 2 else None
+        return self._position.longitude
 
     @property
     def location_accuracy(self) -> int:
         """Return location accuracy in meters."""
-        return 50  # Approximate GPS accuracy
+        return accuracy_from_signal(self._position.signal_quality)
 
     @property
     def extra_state_attributes(self):
         """Return extra state attributes."""
-        position = self.vehicle_data.get("position", {})
-        properties = position.get("properties", {})
-        
+        vehicle = self._position
         return {
-            "altitude": properties.get("altitude"),
-            "heading": properties.get("heading"),
-            "updated_at": properties.get("updatedAt"),
-            "signal_quality": properties.get("signalQuality"),
+            **(super().extra_state_attributes or {}),
+            "altitude": vehicle.altitude,
+            "heading": vehicle.heading,
+            "updated_at": vehicle.position_updated_at,
+            "signal_quality": vehicle.signal_quality,
         }
@@ -0,0 +1,198 @@
+"""Base entity for PSA Car Controller."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Optional, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ATTR_CACHED,
+    ATTR_FETCHED_AT,
+    CONFIRM_TIMEOUT,
+    DOMAIN,
+    MANUFACTURER,
+)
+from .coordinator import PSACCDataUpdateCoordinator
+from .models import VehicleState
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_PENDING = "pending"
+
+
+class PSACCEntity(CoordinatorEntity):
+    """Base class for entities bound to one vehicle of the coordinator."""
+
+    # Champs de VehicleState lus par l'entité ; None = tous
+    _watched_fields: Optional[Tuple[str, ...]] = None
+
+    def __init__(self, coordinator: PSACCDataUpdateCoordinator, vin: str) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._vin = vin
+        self._attr_has_entity_name = True
+        self._last_available: Optional[bool] = None
+        self._last_cached: Optional[bool] = None
+
+    @property
+    def vehicle(self) -> VehicleState:
+        """Return the vehicle snapshot."""
+        return self.coordinator.get_vehicle_data(self._vin)
+
+    @property
+    def available(self) -> bool:
+        """Return True if the last poll of this vehicle succeeded."""
+        return self.coordinator.is_vehicle_available(self._vin)
+
+    @property
+    def extra_state_attributes(self):
+        """Return when the data was fetched while it comes from the cache."""
+        fetched_at = self.coordinator.cached_since(self._vin)
+        if fetched_at is None:
+            return None
+        return {ATTR_CACHED: True, ATTR_FETCHED_AT: fetched_at}
+
+    @property
+    def device_info(self):
+        """Return device information."""
+        vehicle = self.vehicle
+        return {
+            "identifiers": {(DOMAIN, self._vin)},
+            "name": f"{vehicle.brand or 'PSA'} {vehicle.model or 'Car'}",
+            "manufacturer": MANUFACTURER,
+            "model": vehicle.model or "Connected Car",
+            "sw_version": vehicle.firmware_version,
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state if a watched field, availability or cache status changed."""
+        if (
+            self.available == self._last_available
+            and self._is_cached() == self._last_cached
+            and not self.coordinator.fields_changed(self._vin, self._watched_fields)
+        ):
+            return
+        self._async_write_state()
+
+    def _is_cached(self) -> bool:
+        """Return True while the snapshot comes from the cache."""
+        return self.coordinator.cached_since(self._vin) is not None
+
+    @callback
+    def _async_write_state(self) -> None:
+        """Write the state and remember what it was based on."""
+        self._last_available = self.available
+        self._last_cached = self._is_cached()
+        self.async_write_ha_state()
+
+
+class PSACCOptimisticEntity(PSACCEntity, ABC):
+    """Entity showing a commanded value until the vehicle confirms it.
+
+    The commanded value is reported with a ``pending`` attribute. It is
+    dropped once a snapshot confirms it, when a snapshot newer than the
+    command contradicts it, or after CONFIRM_TIMEOUT. Subclasses must
+    implement _observed_value.
+    """
+
+    def __init__(self, coordinator: PSACCDataUpdateCoordinator, vin: str) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator, vin)
+        self._pending_value: Any = None
+        self._pending_since: Optional[datetime] = None
+        self._cancel_pending_timeout: Optional[CALLBACK_TYPE] = None
+
+    @abstractmethod
+    def _observed_value(self, state: VehicleState) -> Any:
+        """Return the value reported by the vehicle."""
+
+    @property
+    def _current_value(self) -> Any:
+        """Return the pending value, or the reported one."""
+        if self._pending_since is not None:
+            return self._pending_value
+        return self._observed_value(self.vehicle)
+
+    @property
+    def extra_state_attributes(self):
+        """Return whether the state is a command not yet confirmed."""
+        return {
+            **(super().extra_state_attributes or {}),
+            ATTR_PENDING: self._pending_since is not None,
+        }
+
+    async def _async_send(self, value: Any, command: Awaitable) -> None:
+        """Send a command, showing value until the vehicle reflects it."""
+        self._clear_pending()
+        self._pending_value = value
+        self._pending_since = dt_util.utcnow()
+        self._cancel_pending_timeout = async_call_later(
+            self.hass, CONFIRM_TIMEOUT, self._async_pending_timeout
+        )
+        self.async_write_ha_state()
+
+        try:
+            sent = await command
+        except Exception:
+            self._clear_pending()
+            self.async_write_ha_state()
+            raise
+
+        if not sent:
+            # Refusée, ou annulée par l'ordre inverse : rien ne viendra la confirmer
+            self._clear_pending()
+            self.async_write_ha_state()
+            if sent is False:
+                raise HomeAssistantError("Command rejected by PSA Car Controller")
+            return
+        self.coordinator.async_confirm(
+            self._vin, lambda state: self._observed_value(state) == value
+        )
+
+    @callback
+    def _clear_pending(self) -> None:
+        """Forget the pending value."""
+        self._pending_since = None
+        self._pending_value = None
+        if self._cancel_pending_timeout is not None:
+            self._cancel_pending_timeout()
+            self._cancel_pending_timeout = None
+
+    @callback
+    def _async_pending_timeout(self, _now: datetime) -> None:
+        """Revert to the reported value when the command was never confirmed."""
+        self._cancel_pending_timeout = None
+        _LOGGER.debug("%s: command not confirmed, reverting", self.entity_id)
+        self._clear_pending()
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Reconcile the pending value with the new snapshot."""
+        if self._pending_since is not None:
+            state = self.vehicle
+            if self._observed_value(state) == self._pending_value:
+                self._clear_pending()
+            elif state.updated_at is not None and state.updated_at > self._pending_since:
+                # Donnée plus récente que la commande : elle fait foi
+                _LOGGER.debug("%s: command contradicted, reverting", self.entity_id)
+                self._clear_pending()
+            else:
+                super()._handle_coordinator_update()
+                return
+            self._async_write_state()
+            return
+        super()._handle_coordinator_update()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the pending timeout."""
+        self._clear_pending()
+        await super().async_will_remove_from_hass()
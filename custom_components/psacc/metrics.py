@@ -0,0 +1,127 @@
+"""Request metrics for the PSA Car Controller API client."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict
+
+# Bornes supérieures des buckets de latence (ms)
+LATENCY_BUCKETS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Fenêtre glissante utilisée pour les percentiles
+LATENCY_WINDOW = 200
+
+ERROR_TIMEOUT = "timeout"
+ERROR_CONNECTION = "connection"
+ERROR_SERVER = "server"
+ERROR_CLIENT = "client"
+ERROR_CIRCUIT_OPEN = "circuit_open"
+
+
+def _percentile(ordered: list[float], pct: float) -> float | None:
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+class EndpointMetrics:
+    """Counters and latency histogram for one API endpoint."""
+
+    __slots__ = (
+        "requests", "errors", "bytes_received", "bytes_decoded", "buckets", "_recent"
+    )
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.requests = 0
+        self.errors: Dict[str, int] = {}
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        # Dernier bucket : au-delà de la plus grande borne
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._recent: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record_latency(self, latency_ms: float) -> None:
+        """Record the duration of one upstream request."""
+        self.requests += 1
+        self.buckets[bisect_left(LATENCY_BUCKETS, latency_ms)] += 1
+        self._recent.append(latency_ms)
+
+    def record_error(self, error_class: str) -> None:
+        """Record a failed request."""
+        self.errors[error_class] = self.errors.get(error_class, 0) + 1
+
+    def record_bytes(self, wire: int, decoded: int) -> None:
+        """Record the size of a response body on the wire and once decompressed."""
+        self.bytes_received += wire
+        self.bytes_decoded += decoded
+
+    @property
+    def error_count(self) -> int:
+        """Return the total number of errors."""
+        return sum(self.errors.values())
+
+    def percentiles(self) -> Dict[str, float | None]:
+        """Return p50/p95/p99 over the recent latency window."""
+        ordered = sorted(self._recent)
+        return {
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "p99": _percentile(ordered, 99),
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a summary suitable for state attributes."""
+        summary: Dict[str, Any] = {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "bytes_received": self.bytes_received,
+            "bytes_decoded": self.bytes_decoded,
+        }
+        summary.update(
+            {
+                key: round(value, 1) if value is not None else None
+                for key, value in self.percentiles().items()
+            }
+        )
+        return summary
+
+
+class ApiMetrics:
+    """Per-endpoint metrics of one API client."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint, creating them on first use."""
+        metrics = self.endpoints.get(name)
+        if metrics is None:
+            metrics = self.endpoints[name] = EndpointMetrics()
+        return metrics
+
+    @property
+    def requests(self) -> int:
+        """Return the total number of upstream requests."""
+        return sum(m.requests for m in self.endpoints.values())
+
+    @property
+    def bytes_received(self) -> int:
+        """Return the total number of bytes received."""
+        return sum(m.bytes_received for m in self.endpoints.values())
+
+    @property
+    def bytes_decoded(self) -> int:
+        """Return the total number of bytes after decompression."""
+        return sum(m.bytes_decoded for m in self.endpoints.values())
+
+    def errors(self) -> Dict[str, int]:
+        """Return error counts by class, across endpoints."""
+        totals: Dict[str, int] = {}
+        for metrics in self.endpoints.values():
+            for error_class, count in metrics.errors.items():
+                totals[error_class] = totals.get(error_class, 0) + count
+        return totals
@@ -0,0 +1,195 @@
+"""Parsed vehicle state for PSA Car Controller."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Optional
+
+CHARGING_IN_PROGRESS = "InProgress"
+CLIMATE_ACTIVE_STATUSES = ("Enabled", "InProgress")
+DOOR_OPEN = "Open"
+
+# Fonctions optionnelles, selon les données présentes dans le statut
+CAPABILITY_CHARGING = "charging"
+CAPABILITY_CLIMATE = "climate"
+CAPABILITY_POSITION = "position"
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp as sent by the API."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _dict(value: Any) -> Dict[str, Any]:
+    """Return value if it is a dict, else an empty dict."""
+    return value if isinstance(value, dict) else {}
+
+
+class VehicleState:
+    """Immutable snapshot of one /get_vehicleinfo payload.
+
+    The payload is walked once when the snapshot is built; entities only
+    read plain attributes.
+    """
+
+    __slots__ = (
+        "vin",
+        "brand",
+        "model",
+        "firmware_version",
+        "battery_level",
+        "electric_range",
+        "fuel_range",
+        "charging_status",
+        "charging_rate",
+        "charging_remaining_time",
+        "charge_threshold",
+        "charge_mode",
+        "plugged",
+        "mileage",
+        "door_driver",
+        "door_passenger",
+        "door_rear_left",
+        "door_rear_right",
+        "hood",
+        "trunk",
+        "climate_status",
+        "climate_temperature",
+        "latitude",
+        "longitude",
+        "altitude",
+        "heading",
+        "signal_quality",
+        "position_updated_at",
+        "outside_temperature",
+        "consumption",
+        "updated_at",
+    )
+
+    def __init__(self, vin: str, **fields: Any) -> None:
+        """Initialize the snapshot; missing fields are None."""
+        setter = object.__setattr__
+        setter(self, "vin", vin)
+        for name in self.__slots__[1:]:
+            setter(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"Unknown vehicle state fields: {', '.join(fields)}")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse modifications."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse modifications."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        """Return a short representation."""
+        return (
+            f"<VehicleState {self.vin} level={self.battery_level} "
+            f"updated_at={self.updated_at}>"
+        )
+
+    @classmethod
+    def from_status(cls, vin: str, status: Dict[str, Any]) -> "VehicleState":
+        """Build a snapshot from a /get_vehicleinfo payload."""
+        energy = status.get("energy")
+        if not isinstance(energy, list):
+            energy = []
+        electric = _dict(energy[0]) if energy else {}
+        fuel = _dict(energy[1]) if len(energy) > 1 else {}
+        charging = _dict(electric.get("charging"))
+        position = _dict(status.get("position"))
+        coordinates = _dict(position.get("geometry")).get("coordinates") or []
+        properties = _dict(position.get("properties"))
+        doors = _dict(status.get("doors"))
+        air_conditioning = _dict(
+            _dict(status.get("preconditionning")).get("airConditioning")
+        )
+        environment = _dict(status.get("environment"))
+        has_position = isinstance(coordinates, list) and len(coordinates) >= 2
+
+        return cls(
+            vin,
+            brand=status.get("brand"),
+            model=status.get("model"),
+            firmware_version=status.get("firmware_version"),
+            battery_level=electric.get("level"),
+            electric_range=electric.get("autonomy"),
+            fuel_range=fuel.get("autonomy"),
+            charging_status=charging.get("status"),
+            charging_rate=charging.get("rate"),
+            charging_remaining_time=charging.get("remaining_time"),
+            charge_threshold=charging.get("charge_threshold", 100),
+            charge_mode=charging.get("mode"),
+            plugged=bool(charging.get("plugged", False)),
+            mileage=_dict(status.get("odometer")).get("mileage"),
+            door_driver=doors.get("driver") == DOOR_OPEN,
+            door_passenger=doors.get("passenger") == DOOR_OPEN,
+            door_rear_left=doors.get("rear_left") == DOOR_OPEN,
+            door_rear_right=doors.get("rear_right") == DOOR_OPEN,
+            hood=doors.get("hood") == DOOR_OPEN,
+            trunk=doors.get("trunk") == DOOR_OPEN,
+            climate_status=air_conditioning.get("status"),
+            climate_temperature=air_conditioning.get("temperature", 21.0),
+            latitude=coordinates[1] if has_position else None,
+            longitude=coordinates[0] if has_position else None,
+            altitude=properties.get("altitude"),
+            heading=properties.get("heading"),
+            signal_quality=properties.get("signalQuality"),
+            position_updated_at=_parse_datetime(properties.get("updatedAt")),
+            outside_temperature=environment.get("temperature"),
+            consumption=environment.get("consumption"),
+            updated_at=_parse_datetime(status.get("updatedAt")),
+        )
+
+    def changed_fields(self, previous: Optional["VehicleState"]) -> FrozenSet[str]:
+        """Return the fields whose value differs from a previous snapshot."""
+        if previous is None:
+            return frozenset(self.__slots__)
+        return frozenset(
+            name
+            for name in self.__slots__
+            if getattr(self, name) != getattr(previous, name)
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the snapshot as a JSON-serializable dict."""
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            result[name] = value.isoformat() if isinstance(value, datetime) else value
+        return result
+
+    @property
+    def is_charging(self) -> bool:
+        """Return True if a charge is in progress."""
+        return self.charging_status == CHARGING_IN_PROGRESS
+
+    @property
+    def climate_active(self) -> bool:
+        """Return True if climate control is running."""
+        return self.climate_status in CLIMATE_ACTIVE_STATUSES
+
+    @property
+    def capabilities(self) -> FrozenSet[str]:
+        """Return the optional features the vehicle reports data for."""
+        capabilities = set()
+        if self.charging_status is not None:
+            capabilities.add(CAPABILITY_CHARGING)
+        if self.climate_status is not None:
+            capabilities.add(CAPABILITY_CLIMATE)
+        if self.latitude is not None:
+            capabilities.add(CAPABILITY_POSITION)
+        return frozenset(capabilities)
+
+    @property
+    def total_range(self) -> Optional[float]:
+        """Return electric plus fuel range, None if neither is known."""
+        electric = self.electric_range or 0
+        fuel = self.fuel_range or 0
+        return electric + fuel if electric or fuel else None
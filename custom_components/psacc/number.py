@@ -6,16 +6,16 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .api import PSACCApiClient
+from .commands import PSACCCommandQueue
 from .const import (
     DOMAIN,
-    MANUFACTURER,
     ICON_BATTERY,
     ICON_TEMPERATURE,
 )
 from .coordinator import PSACCDataUpdateCoordinator
+from .entity import PSACCOptimisticEntity
+from .models import CAPABILITY_CHARGING, CAPABILITY_CLIMATE, VehicleState
 
 
 async def async_setup_entry(
@@ -25,49 +25,36 @@ async def async_setup_entry(
 ) -> None:
     """Set up PSACC number platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    api = hass.data[DOMAIN][entry.entry_id]["api"]
+    commands = hass.data[DOMAIN][entry.entry_id]["commands"]
     
+    vin = hass.data[DOMAIN][entry.entry_id]["vin"]
+
+    capabilities = coordinator.get_vehicle_data(vin).capabilities
     entities = []
-    for vin, vehicle_data in coordinator.data.items():
-        entities.extend([
-            PSACCChargeThresholdNumber(coordinator, api, vin),
-            PSACCClimateTemperatureNumber(coordinator, api, vin),
-        ])
-    
+    if CAPABILITY_CHARGING in capabilities:
+        entities.append(PSACCChargeThresholdNumber(coordinator, commands, vin))
+    if CAPABILITY_CLIMATE in capabilities:
+        entities.append(PSACCClimateTemperatureNumber(coordinator, commands, vin))
     async_add_entities(entities)
 
 
-class PSACCBaseNumber(CoordinatorEntity, NumberEntity):
+class PSACCBaseNumber(PSACCOptimisticEntity, NumberEntity):
     """Base class for PSACC numbers."""
 
     def __init__(
         self,
         coordinator: PSACCDataUpdateCoordinator,
-        api: PSACCApiClient,
+        commands: PSACCCommandQueue,
         vin: str,
     ) -> None:
         """Initialize the number."""
-        super().__init__(coordinator)
-        self._api = api
-        self._vin = vin
-        self._attr_has_entity_name = True
+        super().__init__(coordinator, vin)
+        self._commands = commands
 
     @property
-    def vehicle_data(self):
-        """Return vehicle data."""
-        return self.coordinator.get_vehicle_data(self._vin)
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        vehicle = self.vehicle_data
-        return {
-            "identifiers": {(DOMAIN, self._vin)},
-            "name": f"{vehicle.get('brand', 'PSA')} {vehicle.get('model', 'Car')}",
-            "manufacturer": MANUFACTURER,
-            "model": vehicle.get("model", "Connected Car"),
-            "sw_version": vehicle.get("firmware_version"),
-        }
+    def native_value(self):
+        """Return the commanded value until confirmed, else the reported one."""
+        return self._current_value
 
 
 class PSACCChargeThresholdNumber(PSACCBaseNumber):
@@ -79,22 +66,23 @@ class PSACCChargeThresholdNumber(PSACCBaseNumber):
     _attr_native_max_value = 100
     _attr_native_step = 5
     _attr_native_unit_of_measurement = PERCENTAGE
+    _watched_fields = ("charge_threshold",)
 
     @property
     def unique_id(self):
         """Return unique ID."""
         return f"{self._vin}_charge_threshold_number"
 
-    @property
-    def native_value(self):
+    def _observed_value(self, state: VehicleState):
         """Return the current value."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        return charging.get("charge_threshold", 100)
+        return state.charge_threshold
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
-        await self._api.set_charge_threshold(self._vin, int(value))
-        await self.coordinator.async_request_refresh()
+        threshold = int(value)
+        await self._async_send(
+            threshold, self._commands.set_charge_threshold(self._vin, threshold)
+        )
 
 
 class PSACCClimateTemperatureNumber(PSACCBaseNumber):
@@ -106,20 +94,18 @@ class PSACCClimateTemperatureNumber(PSACCBaseNumber):
     _attr_native_max_value = 28
     _attr_native_step = 0.5
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _watched_fields = ("climate_temperature",)
 
     @property
     def unique_id(self):
         """Return unique ID."""
         return f"{self._vin}_climate_temperature"
 
-    @property
-    def native_value(self):
+    def _observed_value(self, state: VehicleState):
         """Return the current value."""
-        precond = self.vehicle_data.get("preconditionning", {})
-        return precond.get("airConditioning", {}).get("temperature", 21.0)
+        return state.climate_temperature
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
         # Start climate with new temperature
-        await self._api.start_climate(self._vin, value)
-        await self.coordinator.async_request_refresh()
+        await self._async_send(value, self._commands.start_climate(self._vin, value))
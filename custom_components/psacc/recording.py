@@ -0,0 +1,118 @@
+"""Record anonymized PSACC request/response pairs for offline replay."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+VIN_PATTERN = re.compile(r"\b[A-HJ-NPR-Z0-9]{17}\b")
+
+# Les positions enregistrées sont translatées autour de ce point (Paris)
+ANONYMOUS_ORIGIN = (2.3522, 48.8566)
+
+
+class ResponseRecorder:
+    """Append anonymized request/response pairs to a JSON lines file.
+
+    VINs are replaced by stable aliases and GPS positions are translated so
+    that the first recorded position lands on ``ANONYMOUS_ORIGIN``, which
+    keeps relative movements (and therefore distances) realistic.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the recorder."""
+        self.path = path
+        self._aliases: Dict[str, str] = {}
+        self._offset: Optional[tuple[float, float]] = None
+        self._write_lock = asyncio.Lock()
+
+    def _alias(self, match: re.Match) -> str:
+        """Return the stable alias of a VIN."""
+        vin = match.group(0)
+        alias = self._aliases.get(vin)
+        if alias is None:
+            alias = self._aliases[vin] = f"VF3XXXX{len(self._aliases) + 1:010d}"
+        return alias
+
+    def _anonymize_text(self, text: str) -> str:
+        """Replace VINs in a string."""
+        return VIN_PATTERN.sub(self._alias, text)
+
+    def _anonymize(self, value: Any) -> Any:
+        """Return a copy of a decoded JSON value with VINs and positions masked."""
+        if isinstance(value, dict):
+            result = {}
+            for key, item in value.items():
+                if key == "coordinates" and isinstance(item, list) and len(item) >= 2:
+                    result[key] = self._translate(item)
+                else:
+                    result[self._anonymize_text(key)] = self._anonymize(item)
+            return result
+        if isinstance(value, list):
+            return [self._anonymize(item) for item in value]
+        if isinstance(value, str):
+            return self._anonymize_text(value)
+        return value
+
+    def _translate(self, coordinates: list) -> list:
+        """Translate a [longitude, latitude, ...] position."""
+        try:
+            lon, lat = float(coordinates[0]), float(coordinates[1])
+        except (TypeError, ValueError):
+            return coordinates
+        if self._offset is None:
+            self._offset = (ANONYMOUS_ORIGIN[0] - lon, ANONYMOUS_ORIGIN[1] - lat)
+        return [
+            round(lon + self._offset[0], 6),
+            round(lat + self._offset[1], 6),
+            *coordinates[2:],
+        ]
+
+    async def async_record(
+        self,
+        method: str,
+        endpoint: str,
+        request: Optional[Dict[str, Any]],
+        status: int,
+        content_type: str,
+        response: Any,
+        elapsed_ms: float,
+        error: Optional[str] = None,
+    ) -> None:
+        """Anonymize an exchange and append it to the recording file.
+
+        status is 0 when the server did not answer; error then says why.
+        """
+        entry = {
+            "method": method,
+            "endpoint": self._anonymize_text(endpoint),
+            "request": self._anonymize(request),
+            "status": status,
+            "content_type": content_type,
+            "response": self._anonymize(response),
+            "elapsed_ms": round(elapsed_ms, 1),
+        }
+        if error is not None:
+            entry["error"] = error
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+
+        async with self._write_lock:
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._append, line
+                )
+            except OSError as err:
+                _LOGGER.warning("Unable to write recording %s: %s", self.path, err)
+
+    def _append(self, line: str) -> None:
+        """Append a line to the recording file (runs in the executor)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(line)
@@ -0,0 +1,192 @@
+"""Shared API clients, coordinators and vehicle index for PSA Car Controller."""
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from homeassistant.config_entries import ConfigEntryState, current_entry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+
+from .api import PSACCApiClient, create_session
+from .const import DOMAIN
+from .coordinator import PSACCDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CLIENTS = f"{DOMAIN}_clients"
+DATA_VEHICLES = f"{DOMAIN}_vehicles"
+
+
+class _ClientHandle:
+    """A pooled API client and the config entries/flows using it."""
+
+    def __init__(self, client: PSACCApiClient) -> None:
+        """Initialize the handle."""
+        self.client = client
+        self.coordinator: Optional[PSACCDataUpdateCoordinator] = None
+        self.users: set[str] = set()
+        # Entrée qui porte les capteurs de diagnostic du serveur, et de quoi
+        # les créer pour chaque entrée candidate à la reprise
+        self.metrics_owner: Optional[str] = None
+        self.metrics_creators: Dict[str, Callable[[], None]] = {}
+        self.metrics_leaving: set[str] = set()
+
+
+def server_key(api_url: str) -> str:
+    """Return the registry key for a PSACC server URL."""
+    return api_url.rstrip("/").lower()
+
+
+@callback
+def _async_registry(hass: HomeAssistant) -> dict[str, _ClientHandle]:
+    """Return the client registry, creating it on first use."""
+    if DATA_CLIENTS not in hass.data:
+        hass.data[DATA_CLIENTS] = {}
+
+        async def _async_close_all(event: Event) -> None:
+            """Close every pooled session when Home Assistant stops."""
+            handles = hass.data.pop(DATA_CLIENTS, {})
+            for handle in handles.values():
+                if handle.coordinator is not None:
+                    await handle.coordinator.async_shutdown()
+                await handle.client.session.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_all)
+
+    return hass.data[DATA_CLIENTS]
+
+
+@callback
+def async_get_api_client(
+    hass: HomeAssistant, api_url: str, user: str
+) -> PSACCApiClient:
+    """Return the shared client for a PSACC server, creating it if needed."""
+    registry = _async_registry(hass)
+    key = server_key(api_url)
+
+    handle = registry.get(key)
+    if handle is None:
+        _LOGGER.debug("Creating pooled API client for %s", api_url)
+        handle = registry[key] = _ClientHandle(
+            PSACCApiClient(api_url, create_session())
+        )
+
+    handle.users.add(user)
+    return handle.client
+
+
+@callback
+def async_get_coordinator(
+    hass: HomeAssistant, api_url: str, user: str
+) -> PSACCDataUpdateCoordinator:
+    """Return the shared coordinator of a PSACC server, creating it if needed."""
+    client = async_get_api_client(hass, api_url, user)
+    handle = _async_registry(hass)[server_key(api_url)]
+    if handle.coordinator is None:
+        # Sans entrée courante : le coordinateur ne doit pas être arrêté avec
+        # l'entrée qui l'a créé, il vit tant que le serveur a des utilisateurs
+        token = current_entry.set(None)
+        try:
+            handle.coordinator = PSACCDataUpdateCoordinator(hass, client)
+        finally:
+            current_entry.reset(token)
+    return handle.coordinator
+
+
+async def async_release_api_client(
+    hass: HomeAssistant, api_url: str, user: str
+) -> None:
+    """Release a shared client, closing its session once nobody uses it."""
+    registry = hass.data.get(DATA_CLIENTS, {})
+    key = server_key(api_url)
+
+    handle = registry.get(key)
+    if handle is None:
+        return
+
+    handle.users.discard(user)
+    if not handle.users:
+        _LOGGER.debug("Closing pooled API client for %s", api_url)
+        del registry[key]
+        if handle.coordinator is not None:
+            await handle.coordinator.async_shutdown()
+        await handle.client.session.close()
+
+
+@callback
+def async_register_metrics(
+    hass: HomeAssistant, api_url: str, user: str, create: Callable[[], None]
+) -> CALLBACK_TYPE:
+    """Offer user to carry the server metrics sensors, created by create.
+
+    The first entry of a server creates them at once; when it is unloaded,
+    another loaded entry of the server creates them in turn. Return the
+    callback to run once the entry is unloaded.
+    """
+    handle = hass.data.get(DATA_CLIENTS, {}).get(server_key(api_url))
+    if handle is None or user not in handle.users:
+        return lambda: None
+    handle.metrics_creators[user] = create
+    handle.metrics_leaving.discard(user)
+    if handle.metrics_owner is None:
+        handle.metrics_owner = user
+        create()
+
+    @callback
+    def _async_unregister() -> None:
+        """Hand the metrics sensors over to another entry of the server."""
+        handle.metrics_creators.pop(user, None)
+        handle.metrics_leaving.discard(user)
+        if handle.metrics_owner != user:
+            return
+        handle.metrics_owner = None
+        for other, other_create in handle.metrics_creators.items():
+            entry = hass.config_entries.async_get_entry(other)
+            if (
+                other not in handle.metrics_leaving
+                and entry is not None
+                and entry.state is ConfigEntryState.LOADED
+            ):
+                handle.metrics_owner = other
+                other_create()
+                return
+
+    return _async_unregister
+
+
+@callback
+def async_withdraw_metrics(
+    hass: HomeAssistant, api_url: str, user: str, leaving: bool = True
+) -> None:
+    """Mark an entry being unloaded, so the metrics are not handed to it.
+
+    leaving False cancels the mark, when the unload failed.
+    """
+    handle = hass.data.get(DATA_CLIENTS, {}).get(server_key(api_url))
+    if handle is None:
+        return
+    if leaving:
+        handle.metrics_leaving.add(user)
+    else:
+        handle.metrics_leaving.discard(user)
+
+
+@callback
+def async_register_vehicle(
+    hass: HomeAssistant, vin: str, vehicle: Dict[str, Any]
+) -> None:
+    """Index the entry data (client, coordinator, commands) of a vehicle."""
+    hass.data.setdefault(DATA_VEHICLES, {})[vin] = vehicle
+
+
+@callback
+def async_unregister_vehicle(hass: HomeAssistant, vin: str) -> None:
+    """Remove a vehicle from the index."""
+    hass.data.get(DATA_VEHICLES, {}).pop(vin, None)
+
+
+@callback
+def async_get_vehicle(hass: HomeAssistant, vin: str) -> Optional[Dict[str, Any]]:
+    """Return the entry data of a configured vehicle."""
+    return hass.data.get(DATA_VEHICLES, {}).get(vin)
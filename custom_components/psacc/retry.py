@@ -0,0 +1,115 @@
+"""Retry policy and circuit breaker for the PSA Car Controller API client."""
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter."""
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+    ) -> None:
+        """Initialize the policy."""
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay to wait after the given failed attempt (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Fail fast while the PSACC server is known to be down.
+
+    After ``failure_threshold`` consecutive requests that could not reach
+    the server, once their retries are exhausted (5xx answers do not count),
+    the breaker opens and requests are rejected without touching the
+    network. Once
+    ``reset_timeout`` has elapsed a single probe is let through (half-open);
+    its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize the breaker."""
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self.state == STATE_CLOSED:
+            return True
+
+        if self.state == STATE_OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            _LOGGER.debug("Circuit half-open, probing PSACC server")
+            self.state = STATE_HALF_OPEN
+            self._probing = False
+
+        # Half-open: une seule requête de test à la fois
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy server."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("PSACC server is reachable again, closing circuit")
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a request that failed because the server is unavailable."""
+        self._failures += 1
+        self._probing = False
+        if self.state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != STATE_OPEN:
+                _LOGGER.warning(
+                    "PSACC server unavailable, failing fast for %ss",
+                    self.reset_timeout,
+                )
+            self.state = STATE_OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Forget an allowed request whose outcome is unknown (cancelled)."""
+        self._probing = False
+
+    @property
+    def retry_after(self) -> float:
+        """Return the seconds left before the next probe is allowed."""
+        if self.state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
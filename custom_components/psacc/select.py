@@ -7,14 +7,13 @@ from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import PSACCApiClient
 from .const import (
     DOMAIN,
-    MANUFACTURER,
 )
 from .coordinator import PSACCDataUpdateCoordinator
+from .entity import PSACCEntity
 
 
 async def async_setup_entry(
@@ -26,14 +25,12 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     api = hass.data[DOMAIN][entry.entry_id]["api"]
     
-    entities = []
-    for vin, vehicle_data in coordinator.data.items():
-        entities.append(PSACCChargeModeSelect(coordinator, api, vin))
-    
-    async_add_entities(entities)
+    vin = hass.data[DOMAIN][entry.entry_id]["vin"]
+
+    async_add_entities([PSACCChargeModeSelect(coordinator, api, vin)])
 
 
-class PSACCBaseSelect(CoordinatorEntity, SelectEntity):
+class PSACCBaseSelect(PSACCEntity, SelectEntity):
     """Base class for PSACC selects."""
 
     def __init__(
@@ -43,27 +40,8 @@ class PSACCBaseSelect(CoordinatorEntity, SelectEntity):
         vin: str,
     ) -> None:
         """Initialize the select."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, vin)
         self._api = api
-        self._vin = vin
-        self._attr_has_entity_name = True
-
-    @property
-    def vehicle_data(self):
-        """Return vehicle data."""
-        return self.coordinator.get_vehicle_data(self._vin)
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        vehicle = self.vehicle_data
-        return {
-            "identifiers": {(DOMAIN, self._vin)},
-            "name": f"{vehicle.get('brand', 'PSA')} {vehicle.get('model', 'Car')}",
-            "manufacturer": MANUFACTURER,
-            "model": vehicle.get("model", "Connected Car"),
-            "sw_version": vehicle.get("firmware_version"),
-        }
 
 
 class PSACCChargeModeSelect(PSACCBaseSelect):
@@ -72,6 +50,7 @@ class PSACCChargeModeSelect(PSACCBaseSelect):
     _attr_name = "Charge mode"
     _attr_icon = "mdi:ev-station"
     _attr_options = ["immediate", "scheduled", "economic"]
+    _watched_fields = ("charge_mode", "plugged")
 
     @property
     def unique_id(self):
@@ -81,8 +60,7 @@ class PSACCChargeModeSelect(PSACCBaseSelect):
     @property
     def current_option(self) -> str | None:
         """Return the current selected option."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        mode = charging.get("mode", "immediate")
+        mode = self.vehicle.charge_mode or "immediate"
         
         # Map API mode to our options
         mode_mapping = {
@@ -111,10 +89,9 @@ class PSACCChargeModeSelect(PSACCBaseSelect):
         # For now, we'll just log it
         # await self._api.set_charge_mode(self._vin, api_mode)
         
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_refresh_vehicle(self._vin)
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        return charging.get("plugged", False)
+        return super().available and bool(self.vehicle.plugged)
@@ -1,7 +1,11 @@
 """Sensor platform for PSA Car Controller."""
 from __future__ import annotations
 
+from datetime import timedelta
+from urllib.parse import urlparse
+
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
@@ -9,27 +13,52 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
     UnitOfLength,
     UnitOfPower,
     UnitOfTemperature,
     UnitOfTime,
     UnitOfEnergy,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    CONF_API_URL,
+    CONF_BATTERY_CAPACITY,
     DOMAIN,
-    MANUFACTURER,
     ICON_BATTERY,
     ICON_RANGE,
     ICON_MILEAGE,
     ICON_CONSUMPTION,
     ICON_CHARGING,
     ICON_TEMPERATURE,
+    MANUFACTURER,
 )
 from .coordinator import PSACCDataUpdateCoordinator
+from .entity import PSACCEntity
+from .metrics import ApiMetrics
+from .registry import async_register_metrics, server_key
+
+# Fréquence de lecture des capteurs de diagnostic de l'API
+SCAN_INTERVAL = timedelta(minutes=1)
+
+# Endpoint dont la latence est l'état du capteur de diagnostic
+LATENCY_ENDPOINT = "get_vehicle_status"
+
+ATTR_ENDPOINTS = "endpoints"
+
+# Fins des unique_id des capteurs de diagnostic du serveur ; les anciennes
+# versions les préfixaient du VIN au lieu du serveur
+METRICS_SUFFIXES = (
+    "api_latency",
+    "api_requests",
+    "api_errors",
+    "api_bytes_received",
+)
 
 
 async def async_setup_entry(
@@ -39,26 +68,89 @@ async def async_setup_entry(
 ) -> None:
     """Set up PSACC sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    metrics = hass.data[DOMAIN][entry.entry_id]["api"].metrics
+    api_url = entry.data[CONF_API_URL]
     
-    entities = []
-    for vin, vehicle_data in coordinator.data.items():
-        entities.extend([
-            PSACCBatteryLevelSensor(coordinator, vin),
-            PSACCRangeElectricSensor(coordinator, vin),
-            PSACCRangeTotalSensor(coordinator, vin),
-            PSACCMileageSensor(coordinator, vin),
-            PSACCChargingPowerSensor(coordinator, vin),
-            PSACCChargingTimeSensor(coordinator, vin),
-            PSACCConsumptionSensor(coordinator, vin),
-            PSACCTemperatureExteriorSensor(coordinator, vin),
-            PSACCChargeThresholdSensor(coordinator, vin),
-            PSACCLastUpdateSensor(coordinator, vin),
-        ])
-    
+    vin = hass.data[DOMAIN][entry.entry_id]["vin"]
+    _async_remove_stale_metrics(hass, entry, vin, server_key(api_url))
+
+    entities: list[SensorEntity] = [
+        PSACCBatteryLevelSensor(coordinator, vin),
+        PSACCRangeElectricSensor(coordinator, vin),
+        PSACCPredictedRangeSensor(
+            coordinator, vin, entry.options.get(CONF_BATTERY_CAPACITY)
+        ),
+        PSACCRangeTotalSensor(coordinator, vin),
+        PSACCMileageSensor(coordinator, vin),
+        PSACCChargingPowerSensor(coordinator, vin),
+        PSACCChargingTimeSensor(coordinator, vin),
+        PSACCChargedEnergySensor(coordinator, vin),
+        PSACCChargingSessionEnergySensor(
+            coordinator, vin, entry.options.get(CONF_BATTERY_CAPACITY)
+        ),
+        PSACCConsumptionSensor(coordinator, vin),
+        PSACCTemperatureExteriorSensor(coordinator, vin),
+        PSACCChargeThresholdSensor(coordinator, vin),
+        PSACCLastUpdateSensor(coordinator, vin),
+    ]
     async_add_entities(entities)
 
-
-class PSACCBaseSensor(CoordinatorEntity, SensorEntity):
+    @callback
+    def _async_create_metrics() -> None:
+        """Create the diagnostic sensors of the server."""
+        async_add_entities(
+            sensor(api_url, metrics)
+            for sensor in (
+                PSACCApiLatencySensor,
+                PSACCApiRequestsSensor,
+                PSACCApiErrorsSensor,
+                PSACCApiBytesSensor,
+            )
+        )
+
+    # Une seule série de capteurs de diagnostic par serveur PSACC, reprise
+    # par une autre entrée du serveur quand celle qui la porte est déchargée
+    entry.async_on_unload(
+        async_register_metrics(hass, api_url, entry.entry_id, _async_create_metrics)
+    )
+
+
+@callback
+def _async_remove_stale_metrics(
+    hass: HomeAssistant, entry: ConfigEntry, vin: str, server: str
+) -> None:
+    """Remove the API diagnostic sensors of entry not bound to server.
+
+    Older versions created them per vehicle, and a changed server URL
+    leaves those of the previous server behind, without state.
+    """
+    registry = er.async_get(hass)
+    for suffix in METRICS_SUFFIXES:
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{vin}_{suffix}")
+        if entity_id is not None:
+            registry.async_remove(entity_id)
+
+    suffixes = tuple(f"_{suffix}" for suffix in METRICS_SUFFIXES)
+    for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if (
+            entity.domain == "sensor"
+            and entity.unique_id.endswith(suffixes)
+            and not entity.unique_id.startswith(f"{server}_")
+        ):
+            registry.async_remove(entity.entity_id)
+
+    devices = dr.async_get(hass)
+    for device in dr.async_entries_for_config_entry(devices, entry.entry_id):
+        if any(
+            domain == DOMAIN and identifier not in (vin, server)
+            for domain, identifier in device.identifiers
+        ):
+            devices.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+
+
+class PSACCBaseSensor(PSACCEntity, SensorEntity):
     """Base class for PSACC sensors."""
 
     def __init__(
@@ -67,26 +159,7 @@ class PSACCBaseSensor(CoordinatorEntity, SensorEntity):
         vin: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._vin = vin
-        self._attr_has_entity_name = True
-
-    @property
-    def vehicle_data(self):
-        """Return vehicle data."""
-        return self.coordinator.get_vehicle_data(self._vin)
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        vehicle = self.vehicle_data
-        return {
-            "identifiers": {(DOMAIN, self._vin)},
-            "name": f"{vehicle.get('brand', 'PSA')} {vehicle.get('model', 'Car')}",
-            "manufacturer": MANUFACTURER,
-            "model": vehicle.get("model", "Connected Car"),
-            "sw_version": vehicle.get("firmware_version"),
-        }
+        super().__init__(coordinator, vin)
 
 
 class PSACCBatteryLevelSensor(PSACCBaseSensor):
@@ -97,6 +170,7 @@ class PSACCBatteryLevelSensor(PSACCBaseSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_icon = ICON_BATTERY
+    _watched_fields = ("battery_level",)
 
     @property
     def unique_id(self):
@@ -106,7 +180,7 @@ class PSACCBatteryLevelSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        return self.vehicle_data.get("energy", [{}])[0].get("level")
+        return self.vehicle.battery_level
 
 
 class PSACCRangeElectricSensor(PSACCBaseSensor):
@@ -117,6 +191,7 @@ class PSACCRangeElectricSensor(PSACCBaseSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfLength.KILOMETERS
     _attr_icon = ICON_RANGE
+    _watched_fields = ("electric_range",)
 
     @property
     def unique_id(self):
@@ -126,7 +201,69 @@ class PSACCRangeElectricSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        return self.vehicle_data.get("energy", [{}])[0].get("autonomy")
+        return self.vehicle.electric_range
+
+
+class PSACCPredictedRangeSensor(PSACCBaseSensor):
+    """Electric range predicted by the local consumption model."""
+
+    _attr_name = "Predicted range"
+    _attr_device_class = SensorDeviceClass.DISTANCE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfLength.KILOMETERS
+    _attr_icon = ICON_RANGE
+    # updated_at : le modèle est réajusté à la fin de chaque trajet
+    _watched_fields = ("updated_at", "battery_level", "outside_temperature")
+
+    def __init__(
+        self,
+        coordinator: PSACCDataUpdateCoordinator,
+        vin: str,
+        capacity: float | None,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, vin)
+        self._capacity = capacity
+
+    @property
+    def unique_id(self):
+        """Return unique ID."""
+        return f"{self._vin}_predicted_range"
+
+    @property
+    def native_value(self):
+        """Return the state."""
+        model = self.coordinator.consumption_model(self._vin)
+        vehicle = self.vehicle
+        if (
+            model is None
+            or vehicle.battery_level is None
+            or vehicle.outside_temperature is None
+        ):
+            return None
+        predicted = model.range(vehicle.battery_level, vehicle.outside_temperature)
+        return round(predicted) if predicted is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the model summary."""
+        attributes = dict(super().extra_state_attributes or {})
+        model = self.coordinator.consumption_model(self._vin)
+        if model is None:
+            return attributes or None
+        attributes["trips"] = model.trips
+        temperature = self.vehicle.outside_temperature
+        consumption = (
+            model.consumption(temperature) if temperature is not None else None
+        )
+        if consumption is not None:
+            attributes["level_per_100km"] = round(consumption * 100, 1)
+            if self._capacity:
+                # % par km vers kWh/100km
+                attributes["predicted_consumption"] = round(
+                    consumption * self._capacity, 1
+                )
+        return attributes
 
 
 class PSACCRangeTotalSensor(PSACCBaseSensor):
@@ -137,6 +274,7 @@ class PSACCRangeTotalSensor(PSACCBaseSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfLength.KILOMETERS
     _attr_icon = ICON_RANGE
+    _watched_fields = ("electric_range", "fuel_range")
 
     @property
     def unique_id(self):
@@ -146,12 +284,7 @@ class PSACCRangeTotalSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        # Sum electric and fuel range if available
-        electric = self.vehicle_data.get("energy", [{}])[0].get("autonomy", 0) or 0
-        fuel = self.vehicle_data.get("energy", [{}])[1].get("autonomy", 0) if len(
-            self.vehicle_data.get("energy", [])
-        ) > 1 else 0
-        return electric + fuel if electric or fuel else None
+        return self.vehicle.total_range
 
 
 class PSACCMileageSensor(PSACCBaseSensor):
@@ -162,6 +295,7 @@ class PSACCMileageSensor(PSACCBaseSensor):
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_native_unit_of_measurement = UnitOfLength.KILOMETERS
     _attr_icon = ICON_MILEAGE
+    _watched_fields = ("mileage",)
 
     @property
     def unique_id(self):
@@ -171,7 +305,7 @@ class PSACCMileageSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        return self.vehicle_data.get("odometer", {}).get("mileage")
+        return self.vehicle.mileage
 
 
 class PSACCChargingPowerSensor(PSACCBaseSensor):
@@ -182,6 +316,7 @@ class PSACCChargingPowerSensor(PSACCBaseSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfPower.KILO_WATT
     _attr_icon = ICON_CHARGING
+    _watched_fields = ("charging_status", "charging_rate")
 
     @property
     def unique_id(self):
@@ -191,10 +326,84 @@ class PSACCChargingPowerSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        if charging.get("status") == "InProgress":
-            return charging.get("rate")
-        return 0
+        vehicle = self.vehicle
+        return vehicle.charging_rate if vehicle.is_charging else 0
+
+
+class PSACCChargedEnergySensor(PSACCBaseSensor, RestoreSensor):
+    """Energy charged sensor, integrated from the charging power."""
+
+    _attr_name = "Energy charged"
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_icon = ICON_CHARGING
+    _watched_fields = ("updated_at", "charging_status")
+
+    def __init__(self, coordinator: PSACCDataUpdateCoordinator, vin: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, vin)
+        # Total avant le démarrage, le coordinateur ne compte que depuis
+        self._energy_before = 0.0
+
+    @property
+    def unique_id(self):
+        """Return unique ID."""
+        return f"{self._vin}_charged_energy"
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the total reached before the restart."""
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        if last is not None and last.native_value is not None:
+            self._energy_before = float(last.native_value)
+
+    @property
+    def native_value(self):
+        """Return the state."""
+        return round(self._energy_before + self.coordinator.charged_energy(self._vin), 3)
+
+
+class PSACCChargingSessionEnergySensor(PSACCBaseSensor):
+    """Energy of the current or last charging session."""
+
+    _attr_name = "Charging session energy"
+    _attr_device_class = SensorDeviceClass.ENERGY
+    # Repart de zéro à chaque session
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_icon = ICON_CHARGING
+    _watched_fields = ("updated_at", "charging_status", "plugged")
+
+    def __init__(
+        self,
+        coordinator: PSACCDataUpdateCoordinator,
+        vin: str,
+        capacity: float | None,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, vin)
+        self._capacity = capacity
+
+    @property
+    def unique_id(self):
+        """Return unique ID."""
+        return f"{self._vin}_charging_session_energy"
+
+    @property
+    def native_value(self):
+        """Return the state."""
+        session = self.coordinator.charging_session(self._vin)
+        return round(session.energy, 3) if session is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the session summary."""
+        attributes = super().extra_state_attributes or {}
+        session = self.coordinator.charging_session(self._vin)
+        if session is not None:
+            attributes = {**attributes, **session.as_dict(self._capacity)}
+        return attributes or None
 
 
 class PSACCChargingTimeSensor(PSACCBaseSensor):
@@ -204,6 +413,7 @@ class PSACCChargingTimeSensor(PSACCBaseSensor):
     _attr_device_class = SensorDeviceClass.DURATION
     _attr_native_unit_of_measurement = UnitOfTime.MINUTES
     _attr_icon = ICON_CHARGING
+    _watched_fields = ("charging_status", "charging_remaining_time")
 
     @property
     def unique_id(self):
@@ -213,10 +423,8 @@ class PSACCChargingTimeSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        if charging.get("status") == "InProgress":
-            return charging.get("remaining_time")
-        return None
+        vehicle = self.vehicle
+        return vehicle.charging_remaining_time if vehicle.is_charging else None
 
 
 class PSACCConsumptionSensor(PSACCBaseSensor):
@@ -226,6 +434,7 @@ class PSACCConsumptionSensor(PSACCBaseSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = "kWh/100km"
     _attr_icon = ICON_CONSUMPTION
+    _watched_fields = ("consumption",)
 
     @property
     def unique_id(self):
@@ -235,7 +444,7 @@ class PSACCConsumptionSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        return self.vehicle_data.get("environment", {}).get("consumption")
+        return self.vehicle.consumption
 
 
 class PSACCTemperatureExteriorSensor(PSACCBaseSensor):
@@ -246,6 +455,7 @@ class PSACCTemperatureExteriorSensor(PSACCBaseSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_icon = ICON_TEMPERATURE
+    _watched_fields = ("outside_temperature",)
 
     @property
     def unique_id(self):
@@ -255,7 +465,7 @@ class PSACCTemperatureExteriorSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        return self.vehicle_data.get("environment", {}).get("temperature")
+        return self.vehicle.outside_temperature
 
 
 class PSACCChargeThresholdSensor(PSACCBaseSensor):
@@ -265,6 +475,7 @@ class PSACCChargeThresholdSensor(PSACCBaseSensor):
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_icon = ICON_BATTERY
+    _watched_fields = ("charge_threshold",)
 
     @property
     def unique_id(self):
@@ -274,8 +485,7 @@ class PSACCChargeThresholdSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        return charging.get("charge_threshold", 100)
+        return self.vehicle.charge_threshold
 
 
 class PSACCLastUpdateSensor(PSACCBaseSensor):
@@ -283,6 +493,7 @@ class PSACCLastUpdateSensor(PSACCBaseSensor):
 
     _attr_name = "Last update"
     _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _watched_fields = ("updated_at",)
 
     @property
     def unique_id(self):
@@ -292,4 +503,149 @@ class PSACCLastUpdateSensor(PSACCBaseSensor):
     @property
     def native_value(self):
         """Return the state."""
-        return self.vehicle_data.get("updatedAt")
+        return self.vehicle.updated_at
+
+
+class PSACCApiMetricsSensor(SensorEntity):
+    """Base class for API diagnostic sensors, one set per PSACC server.
+
+    The sensors belong to a service device of the server rather than to a
+    vehicle. Metrics change on every request, even when the vehicle data
+    does not, so these sensors are polled instead of following coordinator
+    updates; per-endpoint details are left out of the recorder.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_should_poll = True
+    _unrecorded_attributes = frozenset({ATTR_ENDPOINTS})
+
+    def __init__(self, api_url: str, metrics: ApiMetrics) -> None:
+        """Initialize the sensor."""
+        self._server = server_key(api_url)
+        self._metrics = metrics
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._server)},
+            name=f"PSA Car Controller {urlparse(api_url).netloc or api_url}",
+            manufacturer=MANUFACTURER,
+            entry_type=DeviceEntryType.SERVICE,
+            configuration_url=api_url,
+        )
+
+    async def async_update(self) -> None:
+        """Read metrics from memory without refreshing the coordinator."""
+
+
+class PSACCApiLatencySensor(PSACCApiMetricsSensor):
+    """API latency sensor."""
+
+    _attr_name = "API latency"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-outline"
+
+    @property
+    def unique_id(self):
+        """Return unique ID."""
+        return f"{self._server}_api_latency"
+
+    @property
+    def native_value(self):
+        """Return the p95 latency of status requests."""
+        endpoint = self._metrics.endpoints.get(LATENCY_ENDPOINT)
+        if endpoint is None:
+            return None
+        p95 = endpoint.percentiles()["p95"]
+        return round(p95, 1) if p95 is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return per-endpoint latency and error summaries."""
+        return {
+            ATTR_ENDPOINTS: {
+                name: endpoint.as_dict()
+                for name, endpoint in self._metrics.endpoints.items()
+            }
+        }
+
+
+class PSACCApiRequestsSensor(PSACCApiMetricsSensor):
+    """API requests sensor."""
+
+    _attr_name = "API requests"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:swap-vertical"
+
+    @property
+    def unique_id(self):
+        """Return unique ID."""
+        return f"{self._server}_api_requests"
+
+    @property
+    def native_value(self):
+        """Return the number of upstream requests."""
+        return self._metrics.requests
+
+    @property
+    def extra_state_attributes(self):
+        """Return request counts per endpoint."""
+        return {
+            ATTR_ENDPOINTS: {
+                name: endpoint.requests
+                for name, endpoint in self._metrics.endpoints.items()
+            }
+        }
+
+
+class PSACCApiErrorsSensor(PSACCApiMetricsSensor):
+    """API errors sensor."""
+
+    _attr_name = "API errors"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:alert-circle-outline"
+
+    @property
+    def unique_id(self):
+        """Return unique ID."""
+        return f"{self._server}_api_errors"
+
+    @property
+    def native_value(self):
+        """Return the number of failed requests."""
+        return sum(self._metrics.errors().values())
+
+    @property
+    def extra_state_attributes(self):
+        """Return error counts by class."""
+        return self._metrics.errors()
+
+
+class PSACCApiBytesSensor(PSACCApiMetricsSensor):
+    """API data received sensor."""
+
+    _attr_name = "API data received"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_icon = "mdi:download-network"
+
+    @property
+    def unique_id(self):
+        """Return unique ID."""
+        return f"{self._server}_api_bytes_received"
+
+    @property
+    def native_value(self):
+        """Return the number of bytes received."""
+        return self._metrics.bytes_received
+
+    @property
+    def extra_state_attributes(self):
+        """Return the uncompressed volume and compression ratio."""
+        received = self._metrics.bytes_received
+        decoded = self._metrics.bytes_decoded
+        return {
+            "bytes_decoded": decoded,
+            "compression_ratio": round(decoded / received, 2) if received else None,
+        }
@@ -0,0 +1,392 @@
+"""Services of the PSA Car Controller integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+import homeassistant.util.dt as dt_util
+import voluptuous as vol
+
+from .const import (
+    ATTR_COUNT,
+    ATTR_END,
+    ATTR_END_TIME,
+    ATTR_FORMAT,
+    ATTR_FRESH,
+    ATTR_PERIOD,
+    ATTR_START,
+    ATTR_START_TIME,
+    ATTR_TEMPERATURE,
+    ATTR_THRESHOLD,
+    ATTR_TIMEOUT,
+    ATTR_VIN,
+    DOMAIN,
+    FRESH_TIMEOUT,
+    SERVICE_CONFIGURE_CHARGING,
+    SERVICE_EXPORT_TRACK,
+    SERVICE_GET_STATISTICS,
+    SERVICE_HORN,
+    SERVICE_LIGHTS,
+    SERVICE_MAX_PARALLEL,
+    SERVICE_REFRESH_FRESH,
+    SERVICE_SET_CHARGE_SCHEDULE,
+    SERVICE_SET_CHARGE_THRESHOLD,
+    SERVICE_START_CLIMATE,
+    SERVICE_STOP_CLIMATE,
+    SERVICE_WAKEUP,
+    TRACK_FORMAT_GPX,
+    TRACK_FORMATS,
+)
+from .coordinator import reported_after
+from .registry import async_get_vehicle
+from .stats import PERIOD_DAY, PERIODS
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_SUCCESS = "success"
+ATTR_ERROR = "error"
+
+# Véhicules ciblés : liste de VIN et/ou cibles (appareils, zones, entités)
+TARGET_FIELDS = {
+    vol.Optional(ATTR_VIN): vol.All(cv.ensure_list, [cv.string]),
+    **cv.ENTITY_SERVICE_FIELDS,
+}
+
+
+def _vehicle_schema(fields: Dict[Any, Any]) -> vol.Schema:
+    """Return a service schema targeting one or more vehicles."""
+    return vol.All(
+        vol.Schema({**TARGET_FIELDS, **fields}),
+        cv.has_at_least_one_key(ATTR_VIN, ATTR_DEVICE_ID, ATTR_AREA_ID, ATTR_ENTITY_ID),
+    )
+
+
+SERVICE_SET_CHARGE_THRESHOLD_SCHEMA = _vehicle_schema(
+    {
+        vol.Required(ATTR_THRESHOLD): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+    }
+)
+
+SERVICE_SET_CHARGE_SCHEDULE_SCHEMA = _vehicle_schema(
+    {
+        vol.Required(ATTR_START_TIME): str,
+        vol.Required(ATTR_END_TIME): str,
+    }
+)
+
+SERVICE_CONFIGURE_CHARGING_SCHEMA = vol.All(
+    _vehicle_schema(
+        {
+            vol.Optional(ATTR_THRESHOLD): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=100)
+            ),
+            vol.Inclusive(ATTR_START_TIME, "schedule"): str,
+            vol.Inclusive(ATTR_END_TIME, "schedule"): str,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_THRESHOLD, ATTR_START_TIME),
+)
+
+SERVICE_CLIMATE_SCHEMA = _vehicle_schema(
+    {
+        vol.Optional(ATTR_TEMPERATURE, default=21): vol.All(
+            vol.Coerce(float), vol.Range(min=16, max=28)
+        ),
+    }
+)
+
+SERVICE_STOP_CLIMATE_SCHEMA = _vehicle_schema({})
+
+SERVICE_HORN_LIGHTS_SCHEMA = _vehicle_schema(
+    {
+        vol.Optional(ATTR_COUNT, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=5)
+        ),
+    }
+)
+
+SERVICE_WAKEUP_SCHEMA = _vehicle_schema({})
+
+SERVICE_REFRESH_FRESH_SCHEMA = _vehicle_schema(
+    {
+        vol.Optional(ATTR_TIMEOUT, default=FRESH_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=900)
+        ),
+    }
+)
+
+SERVICE_GET_STATISTICS_SCHEMA = _vehicle_schema(
+    {
+        vol.Optional(ATTR_PERIOD, default=PERIOD_DAY): vol.In(PERIODS),
+    }
+)
+
+SERVICE_EXPORT_TRACK_SCHEMA = _vehicle_schema(
+    {
+        vol.Optional(ATTR_FORMAT, default=TRACK_FORMAT_GPX): vol.In(TRACK_FORMATS),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+# Action sur un véhicule : données de l'entrée, VIN, appel ; renvoie le
+# résultat du véhicule sans le champ "success"
+VehicleAction = Callable[[Dict[str, Any], str, ServiceCall], Awaitable[Dict[str, Any]]]
+
+
+def _target_vins(hass: HomeAssistant, call: ServiceCall) -> List[str]:
+    """Return the VINs targeted by a call, in order and without duplicates."""
+    vins = dict.fromkeys(call.data.get(ATTR_VIN, []))
+
+    selected = async_extract_referenced_entity_ids(hass, call)
+    device_ids = set(selected.referenced_devices)
+    entities = er.async_get(hass)
+    for entity_id in selected.referenced:
+        entity = entities.async_get(entity_id)
+        if entity is not None and entity.device_id is not None:
+            device_ids.add(entity.device_id)
+
+    devices = dr.async_get(hass)
+    for device_id in device_ids:
+        device = devices.async_get(device_id)
+        if device is None:
+            continue
+        for domain, identifier in device.identifiers:
+            if domain == DOMAIN:
+                vins.setdefault(identifier)
+    return list(vins)
+
+
+def _command_result(sent: bool | None) -> Dict[str, Any]:
+    """Return the result of a remote command, None meaning cancelled out."""
+    if sent is False:
+        raise HomeAssistantError("Command rejected by PSA Car Controller")
+    return {}
+
+
+async def _async_call_vehicles(
+    hass: HomeAssistant, call: ServiceCall, action: VehicleAction
+) -> Dict[str, Dict[str, Any]]:
+    """Run action for every targeted vehicle, SERVICE_MAX_PARALLEL at a time."""
+    vins = _target_vins(hass, call)
+    if not vins:
+        raise HomeAssistantError("No PSA vehicle matches the service target")
+
+    semaphore = asyncio.Semaphore(SERVICE_MAX_PARALLEL)
+
+    async def _async_call(vin: str) -> Dict[str, Any]:
+        """Run action for one vehicle and report its outcome."""
+        vehicle = async_get_vehicle(hass, vin)
+        if vehicle is None:
+            return {ATTR_SUCCESS: False, ATTR_ERROR: f"Vehicle {vin} is not configured"}
+        async with semaphore:
+            try:
+                result = await action(vehicle, vin, call)
+            except HomeAssistantError as err:
+                _LOGGER.warning("%s failed for %s: %s", call.service, vin, err)
+                return {ATTR_SUCCESS: False, ATTR_ERROR: str(err)}
+            except Exception as err:  # pylint: disable=broad-except
+                # Erreur inattendue : les autres véhicules gardent leur résultat
+                _LOGGER.exception("%s failed for %s", call.service, vin)
+                return {ATTR_SUCCESS: False, ATTR_ERROR: str(err) or repr(err)}
+        return {ATTR_SUCCESS: True, **result}
+
+    results = dict(zip(vins, await asyncio.gather(*map(_async_call, vins))))
+    if not any(result[ATTR_SUCCESS] for result in results.values()):
+        # Aucun véhicule n'a abouti : l'appel échoue, comme pour un seul VIN
+        raise HomeAssistantError(
+            "; ".join(f"{vin}: {result[ATTR_ERROR]}" for vin, result in results.items())
+        )
+    return results
+
+
+async def _async_set_charge_threshold(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Set the charge threshold of one vehicle."""
+    threshold = call.data[ATTR_THRESHOLD]
+    result = _command_result(
+        await vehicle["commands"].set_charge_threshold(vin, threshold)
+    )
+    vehicle["coordinator"].async_confirm(
+        vin, lambda state: state.charge_threshold == threshold
+    )
+    return result
+
+
+async def _async_set_charge_schedule(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Set the charge schedule of one vehicle."""
+    sent_at = dt_util.utcnow()
+    result = _command_result(
+        await vehicle["commands"].set_charge_schedule(
+            vin, call.data[ATTR_START_TIME], call.data[ATTR_END_TIME]
+        )
+    )
+    # L'horaire n'est pas dans les données : on attend un rapport récent
+    vehicle["coordinator"].async_confirm(vin, reported_after(sent_at))
+    return result
+
+
+async def _async_configure_charging(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Set the charge threshold and/or schedule of one vehicle."""
+    threshold = call.data.get(ATTR_THRESHOLD)
+    sent_at = dt_util.utcnow()
+    result = _command_result(
+        await vehicle["commands"].configure_charging(
+            vin,
+            threshold=threshold,
+            start_time=call.data.get(ATTR_START_TIME),
+            end_time=call.data.get(ATTR_END_TIME),
+        )
+    )
+    if threshold is not None:
+        vehicle["coordinator"].async_confirm(
+            vin, lambda state: state.charge_threshold == threshold
+        )
+    else:
+        vehicle["coordinator"].async_confirm(vin, reported_after(sent_at))
+    return result
+
+
+async def _async_start_climate(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Start the climate control of one vehicle."""
+    sent = await vehicle["commands"].start_climate(vin, call.data[ATTR_TEMPERATURE])
+    result = _command_result(sent)
+    if sent:
+        vehicle["coordinator"].async_confirm(vin, lambda state: state.climate_active)
+    return result
+
+
+async def _async_stop_climate(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Stop the climate control of one vehicle."""
+    sent = await vehicle["commands"].stop_climate(vin)
+    result = _command_result(sent)
+    if sent:
+        vehicle["coordinator"].async_confirm(
+            vin, lambda state: not state.climate_active
+        )
+    return result
+
+
+async def _async_horn(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Sound the horn of one vehicle."""
+    return _command_result(await vehicle["commands"].horn(vin, call.data[ATTR_COUNT]))
+
+
+async def _async_lights(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Flash the lights of one vehicle."""
+    return _command_result(
+        await vehicle["commands"].flash_lights(vin, call.data[ATTR_COUNT])
+    )
+
+
+async def _async_wakeup(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Wake one vehicle up."""
+    sent_at = dt_util.utcnow()
+    result = _command_result(await vehicle["commands"].wakeup(vin))
+    vehicle["coordinator"].async_confirm(vin, reported_after(sent_at))
+    return result
+
+
+async def _async_refresh_fresh(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Wake one vehicle up and return its data once fresh."""
+    state, fresh = await vehicle["coordinator"].async_refresh_fresh(
+        vin, vehicle["commands"].wakeup, call.data[ATTR_TIMEOUT]
+    )
+    return {ATTR_FRESH: fresh, **state.as_dict()}
+
+
+async def _async_get_statistics(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Return the driving and charging totals of one vehicle."""
+    return vehicle["coordinator"].get_statistics(vin, call.data[ATTR_PERIOD])
+
+
+async def _async_export_track(
+    vehicle: Dict[str, Any], vin: str, call: ServiceCall
+) -> Dict[str, Any]:
+    """Export the GPS track of one vehicle to a file."""
+    start, end = (
+        dt_util.as_utc(moment) if moment is not None else None
+        for moment in (call.data.get(ATTR_START), call.data.get(ATTR_END))
+    )
+    return await vehicle["coordinator"].async_export_track(
+        vin, call.data[ATTR_FORMAT], start, end
+    )
+
+
+SERVICES = {
+    SERVICE_SET_CHARGE_THRESHOLD: (
+        _async_set_charge_threshold,
+        SERVICE_SET_CHARGE_THRESHOLD_SCHEMA,
+    ),
+    SERVICE_SET_CHARGE_SCHEDULE: (
+        _async_set_charge_schedule,
+        SERVICE_SET_CHARGE_SCHEDULE_SCHEMA,
+    ),
+    SERVICE_CONFIGURE_CHARGING: (
+        _async_configure_charging,
+        SERVICE_CONFIGURE_CHARGING_SCHEMA,
+    ),
+    SERVICE_START_CLIMATE: (_async_start_climate, SERVICE_CLIMATE_SCHEMA),
+    SERVICE_STOP_CLIMATE: (_async_stop_climate, SERVICE_STOP_CLIMATE_SCHEMA),
+    SERVICE_HORN: (_async_horn, SERVICE_HORN_LIGHTS_SCHEMA),
+    SERVICE_LIGHTS: (_async_lights, SERVICE_HORN_LIGHTS_SCHEMA),
+    SERVICE_WAKEUP: (_async_wakeup, SERVICE_WAKEUP_SCHEMA),
+    SERVICE_REFRESH_FRESH: (_async_refresh_fresh, SERVICE_REFRESH_FRESH_SCHEMA),
+    SERVICE_GET_STATISTICS: (_async_get_statistics, SERVICE_GET_STATISTICS_SCHEMA),
+    SERVICE_EXPORT_TRACK: (_async_export_track, SERVICE_EXPORT_TRACK_SCHEMA),
+}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration, once for all entries."""
+
+    def _handler(action: VehicleAction):
+        """Build the handler of a service."""
+
+        async def _async_handle(call: ServiceCall) -> ServiceResponse:
+            """Handle a service call targeting one or more vehicles."""
+            return await _async_call_vehicles(hass, call, action)
+
+        return _async_handle
+
+    for service, (action, schema) in SERVICES.items():
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            _handler(action),
+            schema=schema,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
@@ -0,0 +1,153 @@
+"""Rolling driving and charging statistics for PSA Car Controller."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+import homeassistant.util.dt as dt_util
+
+from .models import VehicleState
+
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIODS = (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH)
+
+
+def period_start(period: str, day: date) -> date:
+    """Return the first day of the period containing day (weeks start on Monday)."""
+    if period == PERIOD_WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == PERIOD_MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _previous_start(period: str, start: date) -> date:
+    """Return the first day of the period before the one starting on start."""
+    return period_start(period, start - timedelta(days=1))
+
+
+class PeriodAggregate:
+    """Totals of one vehicle over one day, week or month."""
+
+    __slots__ = (
+        "start",
+        "distance",
+        "energy_charged",
+        "charge_sessions",
+        "_consumption_sum",
+        "_consumption_distance",
+    )
+
+    def __init__(self, start: date) -> None:
+        """Initialize empty totals."""
+        self.start = start
+        self.distance = 0.0  # km
+        self.energy_charged = 0.0  # kWh
+        self.charge_sessions = 0
+        # Consommation rapportée, pondérée par les km parcourus
+        self._consumption_sum = 0.0
+        self._consumption_distance = 0.0
+
+    def add_distance(self, distance: float, consumption: Optional[float]) -> None:
+        """Add a driven distance and the consumption reported over it."""
+        self.distance += distance
+        if consumption is not None:
+            self._consumption_sum += consumption * distance
+            self._consumption_distance += distance
+
+    @property
+    def average_consumption(self) -> Optional[float]:
+        """Return the distance-weighted consumption, in kWh/100km."""
+        if not self._consumption_distance:
+            return None
+        return self._consumption_sum / self._consumption_distance
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the totals as response data."""
+        consumption = self.average_consumption
+        return {
+            "start": self.start.isoformat(),
+            "distance": round(self.distance, 1),
+            "energy_charged": round(self.energy_charged, 2),
+            "charge_sessions": self.charge_sessions,
+            "average_consumption": (
+                round(consumption, 1) if consumption is not None else None
+            ),
+        }
+
+
+class VehicleStatistics:
+    """Current and previous day, week and month totals of one vehicle.
+
+    Each new snapshot updates three aggregates in constant time: the
+    distance comes from the odometer, the charged energy from the
+    charging session tracker.
+    """
+
+    __slots__ = ("_last", "_current", "_previous")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._last: Optional[VehicleState] = None
+        self._current: Dict[str, PeriodAggregate] = {}
+        self._previous: Dict[str, PeriodAggregate] = {}
+
+    def update(self, state: VehicleState, energy: float = 0.0) -> None:
+        """Account for a snapshot and the energy charged since the last one.
+
+        Older or repeated reports are ignored.
+        """
+        last = self._last
+        if state.updated_at is None or (
+            last is not None and state.updated_at <= last.updated_at
+        ):
+            return
+        self._last = state
+        if last is None:
+            return
+
+        day = dt_util.as_local(state.updated_at).date()
+        aggregates = [self._aggregate(period, day) for period in PERIODS]
+
+        distance = 0.0
+        if state.mileage is not None and last.mileage is not None:
+            distance = max(0.0, state.mileage - last.mileage)
+
+        started = state.is_charging and not last.is_charging
+        for aggregate in aggregates:
+            if distance:
+                aggregate.add_distance(distance, state.consumption)
+            aggregate.energy_charged += energy
+            if started:
+                aggregate.charge_sessions += 1
+
+    def _aggregate(self, period: str, day: date) -> PeriodAggregate:
+        """Return the aggregate of the period containing day, rolling over."""
+        start = period_start(period, day)
+        current = self._current.get(period)
+        if current is None or current.start != start:
+            if current is not None and current.start == _previous_start(period, start):
+                self._previous[period] = current
+            else:
+                # Période précédente sans aucun snapshot : rien à rapporter
+                self._previous.pop(period, None)
+            current = self._current[period] = PeriodAggregate(start)
+        return current
+
+    def as_dict(self, period: str, now: datetime) -> Dict[str, Any]:
+        """Return the current and previous totals of a period as of now."""
+        start = period_start(period, dt_util.as_local(now).date())
+        current = self._current.get(period)
+        previous = self._previous.get(period)
+        if current is not None and current.start != start:
+            # Aucun snapshot depuis le début de la période ; le dernier total
+            # n'est le précédent que s'il couvre la période juste avant
+            adjacent = current.start == _previous_start(period, start)
+            current, previous = None, current if adjacent else None
+        return {
+            "period": period,
+            "current": (current or PeriodAggregate(start)).as_dict(),
+            "previous": previous.as_dict() if previous is not None else None,
+        }
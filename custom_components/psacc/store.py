@@ -0,0 +1,171 @@
+"""Persistent vehicle data for PSA Car Controller.
+
+Last snapshots, for an instant startup, and trip history, for the local
+consumption model.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    TRIPS_SAVE_DELAY,
+    TRIPS_STORAGE_KEY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SNAPSHOTS = f"{DOMAIN}_snapshots"
+DATA_TRIPS = f"{DOMAIN}_trips"
+
+
+class SnapshotStore:
+    """Last raw status of each vehicle and when it was fetched.
+
+    A save is written at most SNAPSHOT_SAVE_DELAY after the first change
+    following the previous write; Home Assistant writes the pending data
+    when it stops.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[Dict[str, Dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Load the snapshots from disk, once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load()
+            if isinstance(data, dict):
+                self._snapshots = data
+            self._loaded = True
+            _LOGGER.debug("Loaded %d cached vehicle snapshots", len(self._snapshots))
+
+    def get(self, vin: str) -> Optional[Tuple[Dict[str, Any], datetime]]:
+        """Return the cached status of a vehicle and when it was fetched."""
+        snapshot = self._snapshots.get(vin)
+        if snapshot is None:
+            return None
+        fetched_at = dt_util.parse_datetime(snapshot.get("fetched_at") or "")
+        status = snapshot.get("status")
+        if fetched_at is None or not isinstance(status, dict):
+            return None
+        return status, fetched_at
+
+    @callback
+    def async_save(self, vin: str, status: Dict[str, Any], fetched_at: datetime) -> None:
+        """Cache the status of a vehicle, unless it did not change."""
+        snapshot = self._snapshots.get(vin)
+        if snapshot is not None and snapshot.get("status") == status:
+            # fetched_at reste celui de la première réception de ce statut
+            return
+        self._snapshots[vin] = {"status": status, "fetched_at": fetched_at.isoformat()}
+        self._async_schedule_save()
+
+    @callback
+    def async_remove(self, vin: str) -> None:
+        """Forget a vehicle."""
+        if self._snapshots.pop(vin, None) is not None:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule a write, without pushing back one already pending."""
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Dict[str, Any]]:
+        """Return the data to write."""
+        self._save_pending = False
+        return self._snapshots
+
+
+@callback
+def async_get_snapshot_store(hass: HomeAssistant) -> SnapshotStore:
+    """Return the snapshot store, creating it on first use."""
+    if DATA_SNAPSHOTS not in hass.data:
+        hass.data[DATA_SNAPSHOTS] = SnapshotStore(hass)
+    return hass.data[DATA_SNAPSHOTS]
+
+
+class TripStore:
+    """Trip history of each vehicle, as columns of numbers.
+
+    The model owns the columns; a save is written at most TRIPS_SAVE_DELAY
+    after the first trip following the previous write.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[Dict[str, Dict[str, List[float]]]] = Store(
+            hass, STORAGE_VERSION, TRIPS_STORAGE_KEY
+        )
+        self._trips: Dict[str, Dict[str, List[float]]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Load the trip history from disk, once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load()
+            if isinstance(data, dict):
+                self._trips = data
+            self._loaded = True
+
+    def get(self, vin: str) -> Optional[Dict[str, List[float]]]:
+        """Return the trip history of a vehicle."""
+        columns = self._trips.get(vin)
+        return columns if isinstance(columns, dict) else None
+
+    @callback
+    def async_save(self, vin: str, columns: Dict[str, List[float]]) -> None:
+        """Schedule the save of the trip history of a vehicle."""
+        self._trips[vin] = columns
+        self._async_schedule_save()
+
+    @callback
+    def async_remove(self, vin: str) -> None:
+        """Forget a vehicle."""
+        if self._trips.pop(vin, None) is not None:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule a write, without pushing back one already pending."""
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, TRIPS_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Dict[str, List[float]]]:
+        """Return the data to write."""
+        self._save_pending = False
+        return self._trips
+
+
+@callback
+def async_get_trip_store(hass: HomeAssistant) -> TripStore:
+    """Return the trip store, creating it on first use."""
+    if DATA_TRIPS not in hass.data:
+        hass.data[DATA_TRIPS] = TripStore(hass)
+    return hass.data[DATA_TRIPS]
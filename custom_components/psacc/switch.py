@@ -7,16 +7,16 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .api import PSACCApiClient
+from .commands import PSACCCommandQueue
 from .const import (
     DOMAIN,
-    MANUFACTURER,
     ICON_CHARGING,
     ICON_CLIMATE,
 )
 from .coordinator import PSACCDataUpdateCoordinator
+from .entity import PSACCOptimisticEntity
+from .models import CAPABILITY_CHARGING, CAPABILITY_CLIMATE, VehicleState
 
 
 async def async_setup_entry(
@@ -26,49 +26,36 @@ async def async_setup_entry(
 ) -> None:
     """Set up PSACC switch platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    api = hass.data[DOMAIN][entry.entry_id]["api"]
+    commands = hass.data[DOMAIN][entry.entry_id]["commands"]
     
+    vin = hass.data[DOMAIN][entry.entry_id]["vin"]
+
+    capabilities = coordinator.get_vehicle_data(vin).capabilities
     entities = []
-    for vin, vehicle_data in coordinator.data.items():
-        entities.extend([
-            PSACCChargingSwitch(coordinator, api, vin),
-            PSACCClimateSwitch(coordinator, api, vin),
-        ])
-    
+    if CAPABILITY_CHARGING in capabilities:
+        entities.append(PSACCChargingSwitch(coordinator, commands, vin))
+    if CAPABILITY_CLIMATE in capabilities:
+        entities.append(PSACCClimateSwitch(coordinator, commands, vin))
     async_add_entities(entities)
 
 
-class PSACCBaseSwitch(CoordinatorEntity, SwitchEntity):
+class PSACCBaseSwitch(PSACCOptimisticEntity, SwitchEntity):
     """Base class for PSACC switches."""
 
     def __init__(
         self,
         coordinator: PSACCDataUpdateCoordinator,
-        api: PSACCApiClient,
+        commands: PSACCCommandQueue,
         vin: str,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
-        self._api = api
-        self._vin = vin
-        self._attr_has_entity_name = True
-
-    @property
-    def vehicle_data(self):
-        """Return vehicle data."""
-        return self.coordinator.get_vehicle_data(self._vin)
+        super().__init__(coordinator, vin)
+        self._commands = commands
 
     @property
-    def device_info(self):
-        """Return device information."""
-        vehicle = self.vehicle_data
-        return {
-            "identifiers": {(DOMAIN, self._vin)},
-            "name": f"{vehicle.get('brand', 'PSA')} {vehicle.get('model', 'Car')}",
-            "manufacturer": MANUFACTURER,
-            "model": vehicle.get("model", "Connected Car"),
-            "sw_version": vehicle.get("firmware_version"),
-        }
+    def is_on(self) -> bool:
+        """Return the commanded state until confirmed, else the reported one."""
+        return self._current_value
 
 
 class PSACCChargingSwitch(PSACCBaseSwitch):
@@ -76,33 +63,29 @@ class PSACCChargingSwitch(PSACCBaseSwitch):
 
     _attr_name = "Charging"
     _attr_icon = ICON_CHARGING
+    _watched_fields = ("charging_status", "plugged")
 
     @property
     def unique_id(self):
         """Return unique ID."""
         return f"{self._vin}_charging_switch"
 
-    @property
-    def is_on(self):
+    def _observed_value(self, state: VehicleState) -> bool:
         """Return true if charging."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        return charging.get("status") == "InProgress"
+        return state.is_charging
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on charging."""
-        await self._api.start_charge(self._vin)
-        await self.coordinator.async_request_refresh()
+        await self._async_send(True, self._commands.start_charge(self._vin))
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off charging."""
-        await self._api.stop_charge(self._vin)
-        await self.coordinator.async_request_refresh()
+        await self._async_send(False, self._commands.stop_charge(self._vin))
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        charging = self.vehicle_data.get("energy", [{}])[0].get("charging", {})
-        return charging.get("plugged", False)
+        return super().available and bool(self.vehicle.plugged)
 
 
 class PSACCClimateSwitch(PSACCBaseSwitch):
@@ -110,25 +93,28 @@ class PSACCClimateSwitch(PSACCBaseSwitch):
 
     _attr_name = "Climate"
     _attr_icon = ICON_CLIMATE
+    _watched_fields = ("climate_status",)
 
     @property
     def unique_id(self):
         """Return unique ID."""
         return f"{self._vin}_climate_switch"
 
-    @property
-    def is_on(self):
+    def _observed_value(self, state: VehicleState) -> bool:
         """Return true if climate is on."""
-        precond = self.vehicle_data.get("preconditionning", {})
-        status = precond.get("airConditioning", {}).get("status")
-        return status in ["Enabled", "InProgress"]
+        return state.climate_active
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on climate."""
-        await self._api.start_climate(self._vin, 21.0)
-        await self.coordinator.async_request_refresh()
+        # Même consigne que celle réglée sur le véhicule (entité number)
+        temperature = self.vehicle.climate_temperature
+        command = (
+            self._commands.start_climate(self._vin)
+            if temperature is None
+            else self._commands.start_climate(self._vin, temperature)
+        )
+        await self._async_send(True, command)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off climate."""
-        await self._api.stop_climate(self._vin)
-        await self.coordinator.async_request_refresh()
+        await self._async_send(False, self._commands.stop_climate(self._vin))
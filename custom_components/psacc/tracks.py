@@ -0,0 +1,466 @@
+"""Compact GPS track history for PSA Car Controller."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from datetime import datetime, timezone
+import json
+import logging
+import math
+import os
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DOMAIN,
+    TRACK_CHUNK,
+    TRACK_FORMAT_GEOJSON,
+    TRACK_FORMAT_GPX,
+    TRACK_RETENTION,
+    TRACK_SEGMENT_GAP,
+    TRACK_TOLERANCE,
+    TRACKS_DIR,
+    TRACKS_SAVE_DELAY,
+)
+from .models import VehicleState
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_TRACKS = f"{DOMAIN}_tracks"
+
+# 24 octets par point ; float32 garde la position à moins d'un mètre près
+COLUMNS: Dict[str, Any] = {
+    "time": np.int64,
+    "latitude": np.float32,
+    "longitude": np.float32,
+    "altitude": np.float32,
+    "heading": np.float32,
+}
+
+EARTH_RADIUS = 6371000.0  # meters
+# Points écrits à la fois lors d'un export
+EXPORT_CHUNK = 1000
+
+Fix = Tuple[float, float, float, float, float]
+
+
+def _project(
+    latitude: np.ndarray, longitude: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return local equirectangular coordinates in meters."""
+    latitude = np.radians(latitude)
+    x = np.radians(longitude) * EARTH_RADIUS * math.cos(float(latitude.mean()))
+    return x, latitude * EARTH_RADIUS
+
+
+def simplify(
+    latitude: np.ndarray, longitude: np.ndarray, tolerance: float
+) -> np.ndarray:
+    """Return the mask of the points kept by the Douglas-Peucker algorithm."""
+    count = len(latitude)
+    keep = np.zeros(count, dtype=bool)
+    if count:
+        keep[0] = keep[-1] = True
+    if count < 3:
+        return keep
+    x, y = _project(latitude, longitude)
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        dx, dy = x[last] - x[first], y[last] - y[first]
+        px, py = x[first + 1 : last] - x[first], y[first + 1 : last] - y[first]
+        length = math.hypot(dx, dy)
+        if length:
+            distances = np.abs(dx * py - dy * px) / length
+        else:
+            # Boucle : distance au point de départ
+            distances = np.hypot(px, py)
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            index = first + 1 + farthest
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return keep
+
+
+class TrackBuffer:
+    """GPS fixes of one vehicle, as one array per column.
+
+    New fixes wait in a small pending list and are simplified with the
+    Douglas-Peucker algorithm TRACK_CHUNK at a time (or when a segment
+    ends, or before a save) before joining the arrays. The last pending
+    fix is kept as the anchor of the next chunk so that segments stay
+    continuous.
+    """
+
+    def __init__(self, columns: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """Initialize from columns as returned by columns()."""
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.asarray(
+                columns[name] if columns and name in columns else [], dtype=dtype
+            )
+            for name, dtype in COLUMNS.items()
+        }
+        size = min(len(column) for column in self._columns.values())
+        for name, column in self._columns.items():
+            self._columns[name] = column[:size]
+        self._pending: List[Fix] = []
+        # Le premier point en attente est déjà dans les tableaux
+        self._anchored = False
+
+    def __len__(self) -> int:
+        """Return the number of stored fixes, pending ones included."""
+        return len(self._columns["time"]) + len(self._pending) - self._anchored
+
+    def _last_fix(self) -> Optional[Fix]:
+        """Return the latest fix."""
+        if self._pending:
+            return self._pending[-1]
+        if not len(self._columns["time"]):
+            return None
+        return tuple(float(column[-1]) for column in self._columns.values())
+
+    def add(self, state: VehicleState) -> bool:
+        """Add the position of a snapshot; return True if it was stored.
+
+        Fixes not newer than the last one or closer to it than
+        TRACK_TOLERANCE are skipped.
+        """
+        moment = state.position_updated_at or state.updated_at
+        if state.latitude is None or state.longitude is None or moment is None:
+            return False
+        fix = (
+            moment.timestamp(),
+            float(state.latitude),
+            float(state.longitude),
+            float(state.altitude) if state.altitude is not None else math.nan,
+            float(state.heading) if state.heading is not None else math.nan,
+        )
+        last = self._last_fix()
+        if last is not None:
+            if fix[0] <= last[0]:
+                return False
+            if fix[0] - last[0] > TRACK_SEGMENT_GAP:
+                self.flush(anchor=False)
+            else:
+                x, y = _project(
+                    np.array([last[1], fix[1]]), np.array([last[2], fix[2]])
+                )
+                if math.hypot(x[1] - x[0], y[1] - y[0]) < TRACK_TOLERANCE:
+                    return False
+        self._pending.append(fix)
+        if len(self._pending) >= TRACK_CHUNK:
+            self.flush()
+        return True
+
+    def flush(self, anchor: bool = True) -> None:
+        """Simplify the pending fixes and append them to the arrays.
+
+        With anchor, the last fix stays pending to start the next chunk.
+        """
+        pending = self._pending
+        if pending:
+            points = np.array(pending, dtype=float)
+            kept = points[simplify(points[:, 1], points[:, 2], TRACK_TOLERANCE)]
+            if self._anchored:
+                kept = kept[1:]
+            if len(kept):
+                self._columns = {
+                    name: np.concatenate(
+                        (column, kept[:, index].astype(COLUMNS[name]))
+                    )
+                    for index, (name, column) in enumerate(self._columns.items())
+                }
+                self._trim()
+        if anchor and pending:
+            self._pending = [pending[-1]]
+            self._anchored = True
+        else:
+            self._pending = []
+            self._anchored = False
+
+    def _trim(self) -> None:
+        """Drop the fixes older than TRACK_RETENTION days."""
+        time = self._columns["time"]
+        oldest = time[-1] - TRACK_RETENTION * 86400
+        if time[0] < oldest:
+            start = int(np.searchsorted(time, oldest))
+            self._columns = {
+                name: column[start:] for name, column in self._columns.items()
+            }
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Return the stored columns, pending fixes included.
+
+        The arrays are replaced, never modified, as fixes are added: they
+        can be used outside of the event loop.
+        """
+        self.flush()
+        return dict(self._columns)
+
+    def window(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Return the columns between start and end and the segment breaks."""
+        columns = self.columns()
+        time = columns["time"]
+        first = int(np.searchsorted(time, start.timestamp())) if start else 0
+        last = (
+            int(np.searchsorted(time, end.timestamp(), side="right"))
+            if end
+            else len(time)
+        )
+        columns = {name: column[first:last] for name, column in columns.items()}
+        breaks = np.flatnonzero(np.diff(columns["time"]) > TRACK_SEGMENT_GAP) + 1
+        return columns, breaks
+
+
+def _segments(
+    columns: Dict[str, np.ndarray], breaks: np.ndarray
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """Yield each segment as chunks of (time, lat, lon, alt, heading) rows."""
+    bounds = [0, *breaks.tolist(), len(columns["time"])]
+    for first, last in zip(bounds, bounds[1:]):
+        if first == last:
+            continue
+        chunks = []
+        for start in range(first, last, EXPORT_CHUNK):
+            stop = min(start + EXPORT_CHUNK, last)
+            rows = zip(*(column[start:stop].tolist() for column in columns.values()))
+            chunks.append(list(rows))
+        yield chunks
+
+
+def _isoformat(timestamp: int) -> str:
+    """Return a UTC timestamp in ISO 8601."""
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _optional(value: float, digits: int) -> Optional[float]:
+    """Return value rounded, None if not a number."""
+    return None if math.isnan(value) else round(value, digits)
+
+
+def write_gpx(
+    file: IO[str], name: str, columns: Dict[str, np.ndarray], breaks: np.ndarray
+) -> None:
+    """Write a track as GPX 1.1, one trkseg per segment."""
+    file.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gpx version="1.1" creator="psacc_ha" '
+        'xmlns="http://www.topografix.com/GPX/1/1">\n'
+        f"<trk><name>{name}</name>\n"
+    )
+    for chunks in _segments(columns, breaks):
+        file.write("<trkseg>\n")
+        for rows in chunks:
+            file.writelines(
+                f'<trkpt lat="{latitude:.6f}" lon="{longitude:.6f}">'
+                + ("" if math.isnan(altitude) else f"<ele>{altitude:.1f}</ele>")
+                + f"<time>{_isoformat(time)}</time></trkpt>\n"
+                for time, latitude, longitude, altitude, _ in rows
+            )
+        file.write("</trkseg>\n")
+    file.write("</trk>\n</gpx>\n")
+
+
+def write_geojson(
+    file: IO[str], name: str, columns: Dict[str, np.ndarray], breaks: np.ndarray
+) -> None:
+    """Write a track as a GeoJSON FeatureCollection, one LineString per segment.
+
+    The time and heading of each point are in the properties of its segment.
+    """
+    file.write('{"type": "FeatureCollection", "features": [')
+    for number, chunks in enumerate(_segments(columns, breaks)):
+        file.write(",\n" if number else "\n")
+        file.write(
+            '{"type": "Feature", '
+            '"geometry": {"type": "LineString", "coordinates": ['
+        )
+        separator = ""
+        for rows in chunks:
+            for _, latitude, longitude, altitude, _ in rows:
+                point = [round(longitude, 6), round(latitude, 6)]
+                if not math.isnan(altitude):
+                    point.append(round(altitude, 1))
+                file.write(separator + json.dumps(point))
+                separator = ","
+        file.write(f']}}, "properties": {{"name": {json.dumps(name)}, "times": [')
+        file.write(
+            ",".join(
+                json.dumps(_isoformat(row[0])) for rows in chunks for row in rows
+            )
+        )
+        file.write('], "headings": [')
+        file.write(
+            ",".join(
+                json.dumps(_optional(row[4], 1)) for rows in chunks for row in rows
+            )
+        )
+        file.write("]}}")
+    file.write("\n]}\n")
+
+
+WRITERS = {TRACK_FORMAT_GPX: write_gpx, TRACK_FORMAT_GEOJSON: write_geojson}
+
+
+class TrackStore:
+    """Track buffers of all vehicles, one columnar .npz file each.
+
+    Buffers are loaded on first use. Saves are debounced by
+    TRACKS_SAVE_DELAY and done in the executor; pending saves are written
+    when Home Assistant stops.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._hass = hass
+        self._directory = hass.config.path(TRACKS_DIR)
+        self._buffers: Dict[str, TrackBuffer] = {}
+        self._dirty: set[str] = set()
+        self._load_lock = asyncio.Lock()
+        self._unsub_save: Optional[CALLBACK_TYPE] = None
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+        )
+
+    def _path(self, vin: str) -> str:
+        """Return the track file of a vehicle."""
+        return os.path.join(self._directory, f"{vin}.npz")
+
+    def _export_path(self, vin: str, format_: str) -> str:
+        """Return the export file of a vehicle, replaced by each export."""
+        return os.path.join(self._directory, "export", f"{vin}.{format_}")
+
+    async def async_get(self, vin: str) -> TrackBuffer:
+        """Return the track buffer of a vehicle, loading it once."""
+        buffer = self._buffers.get(vin)
+        if buffer is not None:
+            return buffer
+        async with self._load_lock:
+            if vin not in self._buffers:
+                columns = await self._hass.async_add_executor_job(
+                    self._read, self._path(vin)
+                )
+                self._buffers[vin] = TrackBuffer(columns)
+            return self._buffers[vin]
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict[str, np.ndarray]]:
+        """Read a track file (runs in the executor)."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return {name: data[name] for name in COLUMNS if name in data}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Unable to read track %s: %s", path, err)
+            return None
+
+    @staticmethod
+    def _write(path: str, columns: Dict[str, np.ndarray]) -> None:
+        """Write a track file atomically (runs in the executor)."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as file:
+            np.savez(file, **columns)
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _delete(path: str) -> None:
+        """Delete a track file (runs in the executor)."""
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+    @callback
+    def async_schedule_save(self, vin: str) -> None:
+        """Save the track of a vehicle after TRACKS_SAVE_DELAY."""
+        self._dirty.add(vin)
+        if self._unsub_save is None:
+            self._unsub_save = async_call_later(
+                self._hass, TRACKS_SAVE_DELAY, self._async_save_later
+            )
+
+    async def _async_save_later(self, _now: datetime) -> None:
+        """Save the tracks changed since the last save."""
+        self._unsub_save = None
+        await self._async_save()
+
+    async def _async_final_write(self, _event: Event) -> None:
+        """Save the pending tracks before Home Assistant stops."""
+        if self._unsub_save is not None:
+            self._unsub_save()
+            self._unsub_save = None
+        await self._async_save()
+
+    async def _async_save(self) -> None:
+        """Write the changed tracks."""
+        dirty, self._dirty = self._dirty, set()
+        for vin in dirty:
+            buffer = self._buffers.get(vin)
+            if buffer is None:
+                continue
+            path = self._path(vin)
+            try:
+                await self._hass.async_add_executor_job(
+                    self._write, path, buffer.columns()
+                )
+            except OSError as err:
+                _LOGGER.warning("Unable to write track %s: %s", path, err)
+
+    async def async_remove(self, vin: str) -> None:
+        """Forget the track of a vehicle and delete its exports."""
+        self._buffers.pop(vin, None)
+        self._dirty.discard(vin)
+        for path in (
+            self._path(vin),
+            *(self._export_path(vin, format_) for format_ in WRITERS),
+        ):
+            await self._hass.async_add_executor_job(self._delete, path)
+
+    async def async_export(
+        self,
+        vin: str,
+        format_: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Write the track of a vehicle to an export file and describe it."""
+        buffer = await self.async_get(vin)
+        columns, breaks = buffer.window(start, end)
+        path = self._export_path(vin, format_)
+        writer = WRITERS[format_]
+
+        def _export() -> None:
+            """Stream the track to the export file (runs in the executor)."""
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Un seul export par véhicule et format, remplacé d'un bloc
+            temporary = f"{path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                writer(file, vin, columns, breaks)
+            os.replace(temporary, path)
+
+        await self._hass.async_add_executor_job(_export)
+        return {
+            "path": path,
+            "points": len(columns["time"]),
+            "segments": len(breaks) + 1 if len(columns["time"]) else 0,
+        }
+
+
+@callback
+def async_get_track_store(hass: HomeAssistant) -> TrackStore:
+    """Return the track store, creating it on first use."""
+    if DATA_TRACKS not in hass.data:
+        hass.data[DATA_TRACKS] = TrackStore(hass)
+    return hass.data[DATA_TRACKS]
@@ -0,0 +1 @@
+"""Tests for the PSA Car Controller integration."""
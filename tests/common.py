@@ -0,0 +1,60 @@
+"""Helpers shared by the PSA Car Controller tests."""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+import os
+from typing import AsyncIterator, Optional
+
+from aiohttp import web
+from homeassistant.core import HomeAssistant
+
+from custom_components.psacc.api import PSACCApiClient, create_session
+from custom_components.psacc.retry import CircuitBreaker, RetryPolicy
+from mock_server import FaultInjector, VehicleBackend, create_app
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tools", "fixtures", "vehicle.jsonl"
+)
+FIXTURE_VIN = "VF3XXXX0000000001"
+
+
+@asynccontextmanager
+async def async_mock_server(
+    backend: VehicleBackend, faults: Optional[FaultInjector] = None
+) -> AsyncIterator[str]:
+    """Serve backend on a free local port and yield its URL."""
+    runner = web.AppRunner(create_app(backend, faults))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        yield f"http://127.0.0.1:{runner.addresses[0][1]}"
+    finally:
+        await runner.cleanup()
+
+
+@asynccontextmanager
+async def async_api_client(
+    url: str, attempts: int = 1, breaker: Optional[CircuitBreaker] = None
+) -> AsyncIterator[PSACCApiClient]:
+    """Yield an API client without retry delays."""
+    api = PSACCApiClient(
+        url,
+        create_session(),
+        retry_policy=RetryPolicy(max_attempts=attempts, base_delay=0),
+        circuit_breaker=breaker,
+    )
+    try:
+        yield api
+    finally:
+        await api.session.close()
+
+
+@asynccontextmanager
+async def async_test_home_assistant(config_dir: str) -> AsyncIterator[HomeAssistant]:
+    """Yield a bare Home Assistant instance, stopped on exit."""
+    hass = HomeAssistant(config_dir)
+    try:
+        yield hass
+    finally:
+        await hass.async_stop(force=True)
@@ -0,0 +1,30 @@
+"""Pytest configuration for the PSA Car Controller tests.
+
+The tests run against the mock server of ``tools/``; coroutine tests are
+run in a fresh event loop each, without any asyncio plugin.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+sys.path.insert(0, os.path.abspath(ROOT))
+sys.path.insert(0, os.path.abspath(os.path.join(ROOT, "tools")))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem: pytest.Function):
+    """Run coroutine test functions with asyncio.run."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    arguments = {
+        name: pyfuncitem.funcargs[name]
+        for name in pyfuncitem._fixtureinfo.argnames  # pylint: disable=protected-access
+    }
+    asyncio.run(pyfuncitem.obj(**arguments))
+    return True
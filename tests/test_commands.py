@@ -0,0 +1,118 @@
+"""Tests for the per-vehicle command queue."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.psacc import commands
+from custom_components.psacc.commands import PSACCCommandQueue
+from fleet_simulator import SimulatedFleet
+
+from .common import async_api_client, async_mock_server, async_test_home_assistant
+
+
+class RecordingApi:
+    """Wrap an API client and record the commands actually sent."""
+
+    def __init__(self, api) -> None:
+        """Initialize."""
+        self._api = api
+        self.calls: list = []
+
+    def __getattr__(self, name):
+        """Return the command of the wrapped client, recorded when called."""
+        method = getattr(self._api, name)
+
+        async def call(vin, *args, **kwargs):
+            self.calls.append((name, *args, *sorted(kwargs.items())))
+            return await method(vin, *args, **kwargs)
+
+        return call
+
+
+@pytest.fixture(autouse=True)
+def short_debounce(monkeypatch) -> None:
+    """Shorten the debounce delays."""
+    monkeypatch.setattr(commands, "COMMAND_DEBOUNCE", 0.15)
+    monkeypatch.setattr(commands, "COMMAND_TOGGLE_DEBOUNCE", 0.1)
+
+
+async def _async_run(tmp_path, scenario):
+    """Run scenario(queue, vin) against a simulated car; return its result and calls."""
+    fleet = SimulatedFleet(1, seed=0)
+    vin = fleet.vins()[0]
+    async with async_test_home_assistant(str(tmp_path)) as hass:
+        async with async_mock_server(fleet) as url, async_api_client(url) as api:
+            recording = RecordingApi(api)
+            queue = PSACCCommandQueue(hass, recording)
+            result = await scenario(queue, vin)
+            queue.async_cancel()
+    return result, recording.calls
+
+
+async def test_toggle_cancels_out(tmp_path) -> None:
+    """Start then stop while pending sends nothing and reports None."""
+    result, calls = await _async_run(
+        tmp_path,
+        lambda queue, vin: asyncio.gather(
+            queue.start_charge(vin), queue.stop_charge(vin)
+        ),
+    )
+    assert result == [None, None]
+    assert calls == []
+
+
+async def test_set_points_are_merged(tmp_path) -> None:
+    """Threshold and schedule changes within the debounce make one request."""
+    result, calls = await _async_run(
+        tmp_path,
+        lambda queue, vin: asyncio.gather(
+            queue.set_charge_threshold(vin, 60),
+            queue.set_charge_threshold(vin, 80),
+            queue.set_charge_schedule(vin, "23:00", "07:00"),
+        ),
+    )
+    assert result == [True, True, True]
+    assert calls == [
+        (
+            "configure_charging",
+            ("end_time", "07:00"),
+            ("start_time", "23:00"),
+            ("threshold", 80),
+        )
+    ]
+
+
+async def test_earliest_ready_first(tmp_path) -> None:
+    """A command without debounce does not wait behind a set point."""
+    result, calls = await _async_run(
+        tmp_path,
+        lambda queue, vin: asyncio.gather(
+            queue.start_climate(vin, 20), queue.horn(vin), queue.flash_lights(vin)
+        ),
+    )
+    assert result == [True, True, True]
+    assert [call[0] for call in calls] == ["horn", "flash_lights", "start_climate"]
+
+
+async def test_superseded_command_after_send(tmp_path) -> None:
+    """A command submitted once the previous one was sent is sent too."""
+
+    async def scenario(queue, vin):
+        first = await queue.start_climate(vin, 20)
+        second = await queue.start_climate(vin, 22)
+        return first, second
+
+    result, calls = await _async_run(tmp_path, scenario)
+    assert result == (True, True)
+    assert calls == [("start_climate", 20), ("start_climate", 22)]
+
+
+async def test_failure_is_reported(tmp_path) -> None:
+    """An unknown vehicle makes the command fail with False."""
+    result, calls = await _async_run(
+        tmp_path, lambda queue, vin: queue.wakeup("VF3ABCDEF12345678")
+    )
+    assert result is False
+    assert calls == [("wakeup",)]
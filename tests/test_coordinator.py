@@ -0,0 +1,64 @@
+"""Tests for the multi-vehicle coordinator."""
+from __future__ import annotations
+
+from custom_components.psacc.coordinator import (
+    PollingSchedule,
+    PSACCDataUpdateCoordinator,
+)
+from fleet_simulator import SimulatedFleet
+
+from .common import async_api_client, async_mock_server, async_test_home_assistant
+
+UNKNOWN_VIN = "VF3ABCDEF12345678"
+
+
+async def test_fleet_poll(tmp_path) -> None:
+    """One refresh polls every vehicle; an unknown VIN fails alone."""
+    fleet = SimulatedFleet(3, seed=0)
+    async with async_test_home_assistant(str(tmp_path)) as hass:
+        async with async_mock_server(fleet) as url, async_api_client(url) as api:
+            coordinator = PSACCDataUpdateCoordinator(hass, api)
+            for vin in (*fleet.vins(), UNKNOWN_VIN):
+                coordinator.add_vehicle(vin, PollingSchedule())
+
+            await coordinator.async_refresh()
+            assert coordinator.last_update_success
+            assert sorted(coordinator.data) == fleet.vins()
+            for vin in fleet.vins():
+                assert coordinator.is_vehicle_available(vin)
+                assert coordinator.get_vehicle_data(vin).updated_at is not None
+                assert coordinator.poll_interval(vin) is not None
+            assert not coordinator.is_vehicle_available(UNKNOWN_VIN)
+
+            coordinator.remove_vehicle(fleet.vins()[0])
+            assert coordinator.vins == [*fleet.vins()[1:], UNKNOWN_VIN]
+            await coordinator.async_shutdown()
+
+
+async def test_refresh_vehicle_notifies_its_entities_only(tmp_path) -> None:
+    """Refreshing one vehicle reports no change for the others."""
+    fleet = SimulatedFleet(2, seed=0)
+    first, second = fleet.vins()
+    async with async_test_home_assistant(str(tmp_path)) as hass:
+        async with async_mock_server(fleet) as url, async_api_client(url) as api:
+            coordinator = PSACCDataUpdateCoordinator(hass, api)
+            for vin in fleet.vins():
+                coordinator.add_vehicle(vin, PollingSchedule())
+            seen = []
+            coordinator.async_add_listener(
+                lambda: seen.append(
+                    (
+                        coordinator.fields_changed(first, None),
+                        coordinator.fields_changed(second, None),
+                    )
+                )
+            )
+
+            await coordinator.async_refresh()
+            assert seen == [(True, True)]
+
+            await coordinator.async_refresh_vehicle(first)
+            assert seen[-1][1] is False
+            # Les changements du second véhicule restent ceux du dernier relevé
+            assert coordinator.fields_changed(second, None)
+            await coordinator.async_shutdown()
@@ -0,0 +1,70 @@
+"""Tests for the mock PSACC server and the recorded fixture."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.psacc.api import (
+    PSACCApiConnectionError,
+    PSACCApiError,
+    PSACCApiServerError,
+)
+from mock_server import ReplayBackend
+
+from .common import FIXTURE, FIXTURE_VIN, async_api_client, async_mock_server
+
+
+def _fixture_statuses() -> list:
+    """Return the recorded status payloads of the fixture, in order."""
+    with open(FIXTURE, encoding="utf-8") as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+    return [entry["response"] for entry in entries if entry["method"] == "GET"]
+
+
+async def test_replays_fixture_in_order() -> None:
+    """Status requests replay the recorded payloads, looping at the end."""
+    statuses = _fixture_statuses()
+    backend = ReplayBackend.from_files([FIXTURE])
+    assert backend.vins() == [FIXTURE_VIN]
+
+    async with async_mock_server(backend) as url, async_api_client(url) as api:
+        for expected in (*statuses, statuses[0]):
+            assert await api.get_vehicle_status(FIXTURE_VIN) == expected
+        assert await api.wakeup(FIXTURE_VIN) is True
+
+
+async def test_unknown_vin_is_rejected() -> None:
+    """A VIN missing from the recordings answers 404."""
+    backend = ReplayBackend.from_files([FIXTURE])
+    async with async_mock_server(backend) as url, async_api_client(url) as api:
+        with pytest.raises(PSACCApiError) as err:
+            await api.get_vehicle_status("VF3XXXX0000000009")
+    assert not isinstance(err.value, PSACCApiConnectionError)
+
+
+async def test_replays_recorded_failures() -> None:
+    """Failed exchanges are answered as recorded."""
+    endpoint = f"/get_vehicleinfo/{FIXTURE_VIN}"
+    payload = _fixture_statuses()[0]
+    backend = ReplayBackend(
+        {"method": "GET", "endpoint": endpoint, **exchange}
+        for exchange in (
+            {"status": 503, "content_type": "text/plain", "response": "Down"},
+            {"status": 200, "content_type": "text/html", "response": "<html/>"},
+            {"status": 200, "content_type": "application/json", "response": payload},
+            {"status": 0, "content_type": "", "response": None, "error": "connection"},
+        )
+    )
+    async with async_mock_server(backend) as url, async_api_client(url) as api:
+        with pytest.raises(PSACCApiServerError):
+            await api.get_vehicle_status(FIXTURE_VIN)
+        with pytest.raises(PSACCApiError) as err:
+            await api.get_vehicle_status(FIXTURE_VIN)
+        assert not isinstance(err.value, PSACCApiConnectionError)
+        assert await api.get_vehicle_status(FIXTURE_VIN) == payload
+        with pytest.raises(PSACCApiConnectionError):
+            await api.get_vehicle_status(FIXTURE_VIN)
+
+    # status() saute les échanges en échec
+    assert backend.status(FIXTURE_VIN) == payload
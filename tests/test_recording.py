@@ -0,0 +1,116 @@
+"""Tests for the response recorder."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.psacc import api as api_module
+from custom_components.psacc.api import (
+    PSACCApiConnectionError,
+    PSACCApiError,
+    PSACCApiServerError,
+    PSACCApiTimeoutError,
+)
+from custom_components.psacc.recording import ResponseRecorder
+from mock_server import FaultInjector, ReplayBackend
+
+from .common import FIXTURE, FIXTURE_VIN, async_api_client, async_mock_server
+
+# VIN plausible, donc anonymisé par l'enregistreur
+VIN = "VF3ABCDEF12345678"
+
+
+def _fixture_with_vin(vin: str) -> ReplayBackend:
+    """Return a backend replaying the fixture under another VIN."""
+    with open(FIXTURE, encoding="utf-8") as file:
+        text = file.read().replace(FIXTURE_VIN, vin)
+    return ReplayBackend(json.loads(line) for line in text.splitlines() if line)
+
+
+async def _async_outcomes(api, vin: str, count: int) -> list:
+    """Return the payload type or the exception type of count status requests."""
+    outcomes = []
+    for _ in range(count):
+        try:
+            outcomes.append(type(await api.get_vehicle_status(vin)))
+        except PSACCApiError as err:
+            outcomes.append(type(err))
+    return outcomes
+
+
+async def test_records_failures_and_replays_them(tmp_path, monkeypatch) -> None:
+    """Errors are recorded with their real status and replayed alike."""
+    monkeypatch.setattr(api_module, "REQUEST_TIMEOUT", 0.2)
+    faults = FaultInjector(hang=1)
+    path = str(tmp_path / "recording.jsonl")
+
+    outcomes = []
+    async with async_mock_server(_fixture_with_vin(VIN), faults) as url:
+        async with async_api_client(url) as api:
+            api.recorder = ResponseRecorder(path)
+            # 503, HTML, timeout puis réponse normale
+            for rates in ((1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 0, 0)):
+                faults.error_rate, faults.html_rate, faults.timeout_rate = rates
+                outcomes += await _async_outcomes(api, VIN, 1)
+    async with async_api_client(url) as api:
+        # Serveur arrêté : aucune réponse
+        api.recorder = ResponseRecorder(path)
+        outcomes += await _async_outcomes(api, VIN, 1)
+
+    assert outcomes == [
+        PSACCApiServerError,
+        PSACCApiError,
+        PSACCApiTimeoutError,
+        dict,
+        PSACCApiConnectionError,
+    ]
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+    assert VIN not in text
+    entries = [json.loads(line) for line in text.splitlines()]
+    assert [
+        (entry["status"], entry["content_type"].split(";")[0], entry.get("error"))
+        for entry in entries
+    ] == [
+        (503, "text/plain", None),
+        (200, "text/html", None),
+        (0, "", "timeout"),
+        (200, "application/json", None),
+        (0, "", "connection"),
+    ]
+    assert entries[0]["response"] == "Injected failure"
+    assert "PSA Car Controller" in entries[1]["response"]
+    assert entries[3]["endpoint"] == f"/get_vehicleinfo/{FIXTURE_VIN}"
+
+    backend = ReplayBackend(entries)
+    async with async_mock_server(backend, FaultInjector(hang=1)) as url:
+        async with async_api_client(url) as api:
+            assert await _async_outcomes(api, FIXTURE_VIN, 5) == outcomes
+
+
+@pytest.mark.parametrize("status", [404, 500])
+async def test_records_error_body(tmp_path, status) -> None:
+    """The body of an error answer is recorded as text."""
+    path = str(tmp_path / "recording.jsonl")
+    endpoint = f"/get_vehicleinfo/{FIXTURE_VIN}"
+    backend = ReplayBackend(
+        [
+            {
+                "method": "GET",
+                "endpoint": endpoint,
+                "status": status,
+                "content_type": "application/json",
+                "response": {"error": "boom"},
+            }
+        ]
+    )
+    async with async_mock_server(backend) as url, async_api_client(url) as api:
+        api.recorder = ResponseRecorder(path)
+        with pytest.raises(PSACCApiError):
+            await api.get_vehicle_status(FIXTURE_VIN)
+
+    with open(path, encoding="utf-8") as file:
+        (entry,) = [json.loads(line) for line in file]
+    assert entry["status"] == status
+    assert json.loads(entry["response"]) == {"error": "boom"}
@@ -0,0 +1,96 @@
+"""Tests for the retry policy and the circuit breaker."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.psacc.api import (
+    PSACCApiCircuitOpenError,
+    PSACCApiConnectionError,
+    PSACCApiServerError,
+)
+from custom_components.psacc.retry import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    RetryPolicy,
+)
+from fleet_simulator import SimulatedFleet
+from mock_server import FaultInjector
+
+from .common import async_api_client, async_mock_server
+
+
+def test_backoff_is_bounded() -> None:
+    """Delays grow exponentially up to max_delay."""
+    policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=4)
+    for attempt, ceiling in ((1, 1), (2, 2), (3, 4), (4, 4), (10, 4)):
+        assert 0 <= policy.delay(attempt) <= ceiling
+
+
+def test_breaker_opens_and_probes_once() -> None:
+    """The breaker opens at the threshold and lets a single probe through."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+    assert breaker.allow()
+    assert breaker.state == STATE_HALF_OPEN
+    assert not breaker.allow()
+
+    # Une sonde annulée libère la place
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens() -> None:
+    """A failed probe re-opens the breaker at once."""
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(3):
+        breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.retry_after > 0
+
+    breaker.reset_timeout = 0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+
+async def test_server_errors_do_not_open() -> None:
+    """5xx answers come from a reachable server and are not counted."""
+    fleet = SimulatedFleet(1, seed=0)
+    breaker = CircuitBreaker(failure_threshold=3)
+    async with async_mock_server(fleet, FaultInjector(error_rate=1)) as url:
+        async with async_api_client(url, attempts=2, breaker=breaker) as api:
+            for _ in range(5):
+                with pytest.raises(PSACCApiServerError):
+                    await api.get_vehicle_status(fleet.vins()[0])
+    assert breaker.state == STATE_CLOSED
+
+
+async def test_down_server_opens_after_logical_failures() -> None:
+    """Each request counts once, whatever its retries, then fails fast."""
+    fleet = SimulatedFleet(1, seed=0)
+    async with async_mock_server(fleet) as url:
+        pass
+
+    breaker = CircuitBreaker(failure_threshold=3)
+    async with async_api_client(url, attempts=3, breaker=breaker) as api:
+        for _ in range(2):
+            with pytest.raises(PSACCApiConnectionError):
+                await api.get_vehicle_status(fleet.vins()[0])
+        assert breaker.state == STATE_CLOSED
+
+        with pytest.raises(PSACCApiConnectionError) as err:
+            await api.get_vehicle_status(fleet.vins()[0])
+        assert not isinstance(err.value, PSACCApiCircuitOpenError)
+        assert breaker.state == STATE_OPEN
+
+        with pytest.raises(PSACCApiCircuitOpenError):
+            await api.get_vehicle_status(fleet.vins()[0])
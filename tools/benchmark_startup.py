@@ -0,0 +1,327 @@
+"""Benchmark the import time and startup time of the integration.
+
+Two measurements, each run in fresh Python processes:
+
+* ``import``: time to import the package and each platform module once
+  Home Assistant core is loaded, i.e. the cost the integration adds;
+* ``setup``: time for config entries served by the mock PSACC server to be
+  set up and for all their entities to be available, starting from an
+  empty config directory (cold) or from one holding the snapshot cache
+  of a previous run (warm).
+
+Usage::
+
+    python tools/benchmark_startup.py import --runs 10
+    python tools/benchmark_startup.py setup --runs 5 --vehicles 20 --latency 2
+    python tools/benchmark_startup.py setup --no-ev
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from fleet_simulator import SimulatedFleet
+from mock_server import (
+    ReplayBackend,
+    VehicleBackend,
+    add_fault_arguments,
+    create_app,
+    faults_from_args,
+)
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "vehicle.jsonl")
+
+PACKAGE = "custom_components.psacc"
+MODULES = [
+    PACKAGE,
+    f"{PACKAGE}.sensor",
+    f"{PACKAGE}.binary_sensor",
+    f"{PACKAGE}.button",
+    f"{PACKAGE}.device_tracker",
+    f"{PACKAGE}.switch",
+    f"{PACKAGE}.number",
+    f"{PACKAGE}.select",
+]
+
+# Mesuré après le chargement du cœur, déjà importé par Home Assistant
+IMPORT_SNIPPET = """
+import importlib, sys, time
+sys.path.insert(0, {root!r})
+import homeassistant.core
+import homeassistant.helpers.entity
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(time.perf_counter() - start)
+"""
+
+ENTITIES_TIMEOUT = 120  # seconds
+
+
+class ThermalBackend(VehicleBackend):
+    """Backend reporting no charging or climate data, like a non-EV."""
+
+    def __init__(self, backend: VehicleBackend) -> None:
+        """Wrap a backend."""
+        self._backend = backend
+
+    def vins(self) -> List[str]:
+        """Return the VINs of the wrapped backend."""
+        return self._backend.vins()
+
+    def has_vehicle(self, vin: str) -> bool:
+        """Return True if the wrapped backend knows the VIN."""
+        return self._backend.has_vehicle(vin)
+
+    def status(self, vin: str) -> Optional[Dict[str, Any]]:
+        """Return the payload without its charging and climate sections."""
+        status = copy.deepcopy(self._backend.status(vin))
+        if status is None:
+            return None
+        for energy in status.get("energy") or []:
+            energy.pop("charging", None)
+        status.pop("preconditionning", None)
+        return status
+
+    def command(self, vin: str, name: str, **params: Any) -> Dict[str, Any]:
+        """Forward a command to the wrapped backend."""
+        return self._backend.command(vin, name, **params)
+
+
+def _median_ms(values: List[float]) -> str:
+    """Format the median of durations in seconds."""
+    return f"{statistics.median(values) * 1000:8.1f} ms"
+
+
+def bench_import(args: argparse.Namespace) -> None:
+    """Measure the import time of each module in fresh processes."""
+    print(f"{'module':<40} {'median':>11}  (n={args.runs})")
+    for module in MODULES:
+        timings = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    IMPORT_SNIPPET.format(root=REPO_ROOT, module=module),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            timings.append(float(output.split()[-1]))
+        print(f"{module:<40} {_median_ms(timings)}")
+
+
+def _backend(args: argparse.Namespace) -> VehicleBackend:
+    """Build the vehicle backend of a setup run."""
+    if args.vehicles:
+        backend: VehicleBackend = SimulatedFleet(args.vehicles, seed=0)
+    else:
+        backend = ReplayBackend.from_files([FIXTURE])
+    return ThermalBackend(backend) if args.no_ev else backend
+
+
+async def _async_setup_run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Set up one config entry per vehicle and time it."""
+    # Import tardif : seul le processus enfant charge Home Assistant
+    from homeassistant.core import HomeAssistant
+    from homeassistant import bootstrap, config_entries, loader
+    from homeassistant.helpers import entity_registry as er
+
+    backend = _backend(args)
+    runner = web.AppRunner(create_app(backend, faults_from_args(args)))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    hass = HomeAssistant(args.config_dir)
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await hass.config_entries.async_initialize()
+
+    # Au second run, les entrées (et le cache) du premier sont sur disque
+    entries = hass.config_entries.async_entries("psacc")
+    start = time.perf_counter()
+    if entries:
+        for entry in entries:
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, "api_url": f"http://127.0.0.1:{port}"}
+            )
+        await asyncio.gather(
+            *(hass.config_entries.async_setup(entry.entry_id) for entry in entries)
+        )
+    else:
+        entries = [
+            config_entries.ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain="psacc",
+                title=vin,
+                data={"api_url": f"http://127.0.0.1:{port}", "vin": vin},
+                source=config_entries.SOURCE_USER,
+                options={},
+                unique_id=vin,
+            )
+            for vin in backend.vins()
+        ]
+        await asyncio.gather(
+            *(hass.config_entries.async_add(entry) for entry in entries)
+        )
+    setup = time.perf_counter() - start
+
+    registry = er.async_get(hass)
+    entity_ids = [
+        entity.entity_id
+        for entry in entries
+        for entity in er.async_entries_for_config_entry(registry, entry.entry_id)
+    ]
+    # Certaines entités sont indisponibles par construction (voiture non
+    # branchée) : on attend que chacune ait un état et que son véhicule ait
+    # des données
+    vehicles = [hass.data["psacc"][entry.entry_id] for entry in entries]
+    available = None
+    while time.perf_counter() - start < ENTITIES_TIMEOUT:
+        if all(
+            hass.states.get(entity_id) is not None for entity_id in entity_ids
+        ) and all(
+            vehicle["coordinator"].is_vehicle_available(vehicle["vin"])
+            for vehicle in vehicles
+        ):
+            available = time.perf_counter() - start
+            break
+        await asyncio.sleep(0.01)
+
+    platforms = sorted(
+        {
+            str(platform)
+            for entry in entries
+            for platform in hass.data["psacc"][entry.entry_id]["platforms"]
+        }
+    )
+    # Arrêt propre : le cache est écrit sur disque pour le run suivant
+    await hass.async_stop(force=True)
+    await runner.cleanup()
+    return {
+        "setup": setup,
+        "available": available,
+        "entities": len(entity_ids),
+        "platforms": platforms,
+    }
+
+
+def _child_args(args: argparse.Namespace, config_dir: str) -> List[str]:
+    """Return the command line of a setup run."""
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "_setup_run",
+        "--config-dir",
+        config_dir,
+        "--vehicles",
+        str(args.vehicles),
+        "--latency",
+        str(args.latency),
+        "--jitter",
+        str(args.jitter),
+        "--error-rate",
+        str(args.error_rate),
+        "--timeout-rate",
+        str(args.timeout_rate),
+        "--html-rate",
+        str(args.html_rate),
+    ]
+    if args.no_ev:
+        command.append("--no-ev")
+    return command
+
+
+def _run_child(args: argparse.Namespace, config_dir: str) -> Dict[str, Any]:
+    """Run one setup in a fresh process and return its timings."""
+    output = subprocess.run(
+        _child_args(args, config_dir), check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def _config_dir() -> str:
+    """Create a config directory exposing the integration."""
+    config_dir = tempfile.mkdtemp(prefix="psacc-bench-")
+    os.symlink(
+        os.path.join(REPO_ROOT, "custom_components"),
+        os.path.join(config_dir, "custom_components"),
+    )
+    return config_dir
+
+
+def bench_setup(args: argparse.Namespace) -> None:
+    """Measure cold and warm setups."""
+    results: Dict[str, List[Dict[str, Any]]] = {"cold": [], "warm": []}
+    for _ in range(args.runs):
+        config_dir = _config_dir()
+        try:
+            results["cold"].append(_run_child(args, config_dir))
+            # Même dossier : le cache écrit par le run à froid est repris
+            results["warm"].append(_run_child(args, config_dir))
+        finally:
+            shutil.rmtree(config_dir, ignore_errors=True)
+
+    print(f"{'start':<6} {'setup':>11} {'available':>11}  entities  (n={args.runs})")
+    for name, runs in results.items():
+        available = [run["available"] for run in runs if run["available"] is not None]
+        print(
+            f"{name:<6} {_median_ms([run['setup'] for run in runs])} "
+            f"{_median_ms(available) if available else '    timeout'}  "
+            f"{runs[0]['entities']:>8}"
+        )
+    print("platforms:", ", ".join(results["cold"][0]["platforms"]))
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importing = commands.add_parser("import", help="import time of each module")
+    importing.add_argument("--runs", type=int, default=10)
+
+    for name in ("setup", "_setup_run"):
+        setup = commands.add_parser(name)
+        setup.add_argument("--runs", type=int, default=5)
+        setup.add_argument(
+            "--vehicles",
+            type=int,
+            default=0,
+            help="simulated vehicles (default: the recorded fixture)",
+        )
+        setup.add_argument(
+            "--no-ev", action="store_true", help="strip charging and climate data"
+        )
+        setup.add_argument("--config-dir")
+        add_fault_arguments(setup)
+
+    args = parser.parse_args()
+    if args.command == "import":
+        bench_import(args)
+    elif args.command == "setup":
+        bench_setup(args)
+    else:
+        print(json.dumps(asyncio.run(_async_setup_run(args))))
+
+
+if __name__ == "__main__":
+    main()
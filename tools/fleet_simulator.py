@@ -0,0 +1,344 @@
+"""Simulated fleet of PSA vehicles served through the mock PSACC server.
+
+Each simulated car drives, parks, charges and falls asleep with plausible
+dynamics, and reacts to the remote commands of the integration. Status
+payloads follow the ``/get_vehicleinfo/{vin}`` schema documented in
+API_ENDPOINTS.md. Meant for soak and scaling tests of the integration
+(50-500 vehicles over several hours).
+
+Usage::
+
+    python tools/fleet_simulator.py --vehicles 200 --speed 10 --port 5000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from mock_server import VehicleBackend, add_fault_arguments, create_app, faults_from_args
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_PARKED = "parked"
+STATE_DRIVING = "driving"
+STATE_CHARGING = "charging"
+
+EARTH_RADIUS_KM = 6371.0
+
+# Probabilités par heure simulée
+DEPARTURE_RATE = 0.15
+DOOR_EVENT_RATE = 0.5
+PLUG_IN_BELOW = 60  # % : on branche la voiture en rentrant sous ce niveau
+
+SLEEP_AFTER = timedelta(minutes=30)
+
+
+def _isoformat(moment: datetime) -> str:
+    """Format a timestamp like the PSA API."""
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SimulatedVehicle:
+    """One car and its physical state."""
+
+    def __init__(self, vin: str, rng: random.Random, now: datetime) -> None:
+        """Initialize a car parked somewhere around Paris."""
+        self.vin = vin
+        self.rng = rng
+        self.capacity = rng.choice((46.3, 50.0, 54.0))  # kWh
+        self.level = rng.uniform(30, 95)
+        self.mileage = rng.uniform(2000, 80000)
+        self.lon = 2.3522 + rng.uniform(-0.3, 0.3)
+        self.lat = 48.8566 + rng.uniform(-0.2, 0.2)
+        self.altitude = rng.uniform(30, 120)
+        self.heading = rng.uniform(0, 360)
+        self.state = STATE_PARKED
+        self.plugged = False
+        self.threshold = 100
+        self.max_power = rng.choice((7.4, 11.0))  # kW
+        self.climate = False
+        self.climate_temperature = 21.0
+        self.doors = dict.fromkeys(
+            ("driver", "passenger", "rear_left", "rear_right", "hood", "trunk"),
+            "Closed",
+        )
+        self.outside_temperature = rng.uniform(-2, 28)
+        self.consumption = 16.0
+        self.trip_left = 0.0  # km
+        self.speed = 0.0  # km/h
+        self.parked_since = now
+        self.updated_at = now
+        self.position_updated_at = now
+        self.asleep = False
+        self._reported: Optional[Dict[str, Any]] = None
+
+    def power(self) -> float:
+        """Return the charging power for the current level (CC/CV-like curve)."""
+        if self.level < 80:
+            return self.max_power
+        # Diminution linéaire jusqu'à 10 % de la puissance à 100 %
+        return self.max_power * (1 - 0.9 * (self.level - 80) / 20)
+
+    def advance(self, now: datetime, hours: float) -> None:
+        """Advance the simulation by ``hours`` of simulated time."""
+        rng = self.rng
+
+        if self.state == STATE_PARKED:
+            if rng.random() < DEPARTURE_RATE * hours and self.level > 15:
+                self.start_trip(now)
+            elif rng.random() < DOOR_EVENT_RATE * hours:
+                door = rng.choice(list(self.doors))
+                self.doors[door] = "Open" if self.doors[door] == "Closed" else "Closed"
+                self.touch(now)
+
+        if self.state == STATE_DRIVING:
+            self.drive(now, hours)
+        elif self.state == STATE_CHARGING:
+            self.charge(now, hours)
+
+        if self.climate:
+            # La climatisation consomme ~1 kW
+            self.level = max(0.0, self.level - hours * 100 / self.capacity)
+            self.touch(now)
+
+        if (
+            self.state == STATE_PARKED
+            and not self.climate
+            and now - self.parked_since > SLEEP_AFTER
+        ):
+            # Voiture endormie : updatedAt n'avance plus
+            self.asleep = True
+
+    def start_trip(self, now: datetime) -> None:
+        """Leave for a trip of random length."""
+        self.state = STATE_DRIVING
+        self.plugged = False
+        self.asleep = False
+        self.trip_left = self.rng.lognormvariate(2.5, 0.8)
+        self.speed = self.rng.uniform(30, 110)
+        self.doors = dict.fromkeys(self.doors, "Closed")
+        self.touch(now)
+
+    def drive(self, now: datetime, hours: float) -> None:
+        """Move along the current trip."""
+        distance = min(self.trip_left, self.speed * hours)
+        # Consommation plus élevée par temps froid et à haute vitesse
+        self.consumption = (
+            13.5
+            + 0.12 * max(0.0, 20 - self.outside_temperature)
+            + 0.0008 * self.speed**2
+        )
+        self.level = max(0.0, self.level - distance * self.consumption / self.capacity)
+        self.mileage += distance
+        self.trip_left -= distance
+        self.move(distance)
+        self.touch(now, position=True)
+
+        if self.trip_left <= 0 or self.level <= 5:
+            self.state = STATE_PARKED
+            self.speed = 0.0
+            self.parked_since = now
+            if self.level < PLUG_IN_BELOW:
+                self.plugged = True
+                if self.level < self.threshold:
+                    self.state = STATE_CHARGING
+
+    def move(self, distance: float) -> None:
+        """Move ``distance`` km along a wandering heading."""
+        self.heading = (self.heading + self.rng.gauss(0, 20)) % 360
+        bearing = math.radians(self.heading)
+        delta = distance / EARTH_RADIUS_KM
+        lat = math.radians(self.lat)
+        lon = math.radians(self.lon)
+        new_lat = math.asin(
+            math.sin(lat) * math.cos(delta)
+            + math.cos(lat) * math.sin(delta) * math.cos(bearing)
+        )
+        new_lon = lon + math.atan2(
+            math.sin(bearing) * math.sin(delta) * math.cos(lat),
+            math.cos(delta) - math.sin(lat) * math.sin(new_lat),
+        )
+        self.lat = math.degrees(new_lat)
+        self.lon = math.degrees(new_lon)
+        self.altitude = max(0.0, self.altitude + self.rng.gauss(0, 2))
+
+    def charge(self, now: datetime, hours: float) -> None:
+        """Add energy according to the charging curve."""
+        self.level = min(100.0, self.level + self.power() * hours * 100 / self.capacity)
+        self.touch(now)
+        if self.level >= self.threshold:
+            self.state = STATE_PARKED
+            self.parked_since = now
+
+    def touch(self, now: datetime, position: bool = False) -> None:
+        """Mark the data as freshly reported by the car."""
+        self.asleep = False
+        self.updated_at = now
+        if position:
+            self.position_updated_at = now
+
+    def status(self) -> Dict[str, Any]:
+        """Return the /get_vehicleinfo payload, frozen while the car sleeps."""
+        if self.asleep and self._reported is not None:
+            return self._reported
+        self._reported = self._build_status()
+        return self._reported
+
+    def _build_status(self) -> Dict[str, Any]:
+        """Build the /get_vehicleinfo payload from the current state."""
+        charging = self.state == STATE_CHARGING
+        if charging:
+            remaining = (
+                (self.threshold - self.level) / 100 * self.capacity / self.power() * 60
+            )
+        return {
+            "energy": [
+                {
+                    "level": round(self.level),
+                    "autonomy": round(
+                        self.level / 100 * self.capacity / self.consumption * 100
+                    ),
+                    "charging": {
+                        "status": "InProgress" if charging else (
+                            "Stopped" if self.plugged else "Disconnected"
+                        ),
+                        "plugged": self.plugged,
+                        "rate": round(self.power(), 1) if charging else 0,
+                        "remaining_time": round(remaining) if charging else 0,
+                        "charge_threshold": self.threshold,
+                    },
+                }
+            ],
+            "position": {
+                "geometry": {"coordinates": [round(self.lon, 6), round(self.lat, 6)]},
+                "properties": {
+                    "altitude": round(self.altitude),
+                    "heading": round(self.heading),
+                    "updatedAt": _isoformat(self.position_updated_at),
+                    "signalQuality": "Good",
+                },
+            },
+            "odometer": {"mileage": round(self.mileage, 1)},
+            "doors": dict(self.doors),
+            "preconditionning": {
+                "airConditioning": {
+                    "status": "Enabled" if self.climate else "Disabled",
+                    "temperature": self.climate_temperature,
+                }
+            },
+            "environment": {
+                "temperature": round(self.outside_temperature, 1),
+                "consumption": round(self.consumption, 1),
+            },
+            "updatedAt": _isoformat(self.updated_at),
+        }
+
+
+class SimulatedFleet(VehicleBackend):
+    """Fleet of simulated cars, advanced lazily on each request."""
+
+    def __init__(self, count: int, speed: float = 1.0, seed: Optional[int] = None):
+        """Initialize ``count`` cars; ``speed`` is simulated seconds per second."""
+        rng = random.Random(seed)
+        self.speed = speed
+        self._start_wall = time.monotonic()
+        self._start_sim = datetime.now(timezone.utc)
+        self._vehicles: Dict[str, SimulatedVehicle] = {}
+        self._clock: Dict[str, datetime] = {}
+        for index in range(count):
+            vin = f"VF3SIM{index + 1:011d}"
+            self._vehicles[vin] = SimulatedVehicle(
+                vin, random.Random(rng.random()), self._start_sim
+            )
+            self._clock[vin] = self._start_sim
+
+    def now(self) -> datetime:
+        """Return the simulated time."""
+        elapsed = (time.monotonic() - self._start_wall) * self.speed
+        return self._start_sim + timedelta(seconds=elapsed)
+
+    def _advance(self, vin: str) -> SimulatedVehicle:
+        """Bring a car up to the current simulated time, in 1 minute steps."""
+        vehicle = self._vehicles[vin]
+        now = self.now()
+        clock = self._clock[vin]
+        step = timedelta(minutes=1)
+        while clock < now:
+            current = min(step, now - clock)
+            clock += current
+            vehicle.advance(clock, current.total_seconds() / 3600)
+        self._clock[vin] = clock
+        return vehicle
+
+    def vins(self) -> List[str]:
+        """Return the simulated VINs."""
+        return list(self._vehicles)
+
+    def has_vehicle(self, vin: str) -> bool:
+        """Return True if the VIN is simulated."""
+        return vin in self._vehicles
+
+    def status(self, vin: str) -> Optional[Dict[str, Any]]:
+        """Return the current payload of a car."""
+        return self._advance(vin).status()
+
+    def command(self, vin: str, name: str, **params: Any) -> Dict[str, Any]:
+        """Apply a remote command to a car."""
+        vehicle = self._advance(vin)
+        now = self._clock[vin]
+
+        if name == "charge_now":
+            if str(params.get("charge")) == "1":
+                if vehicle.plugged and vehicle.level < vehicle.threshold:
+                    vehicle.state = STATE_CHARGING
+            elif vehicle.state == STATE_CHARGING:
+                vehicle.state = STATE_PARKED
+                vehicle.parked_since = now
+        elif name == "charge_control":
+            if "percentage" in params:
+                vehicle.threshold = int(params["percentage"])
+        elif name in ("climate", "preconditioning"):
+            vehicle.climate = True
+            vehicle.climate_temperature = float(
+                params.get("temperature", params.get("temp", 21))
+            )
+        elif name == "climate_stop":
+            vehicle.climate = False
+        elif name == "door_lock":
+            vehicle.doors = dict.fromkeys(vehicle.doors, "Closed")
+        elif name not in ("wakeup", "horn", "lights", "door_unlock"):
+            return {"error": f"unknown command {name}"}
+
+        # Toute commande réveille la voiture, qui renvoie des données fraîches
+        vehicle.touch(now)
+        return {"result": "ok"}
+
+
+def main() -> None:
+    """Run the fleet simulator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=50)
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="simulated seconds per second"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    fleet = SimulatedFleet(args.vehicles, args.speed, args.seed)
+    _LOGGER.info("Simulating %s vehicles, first VIN %s", args.vehicles, fleet.vins()[0])
+    web.run_app(
+        create_app(fleet, faults_from_args(args)), host=args.host, port=args.port
+    )
+
+
+if __name__ == "__main__":
+    main()
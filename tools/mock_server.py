@@ -0,0 +1,340 @@
+"""In-process mock of the PSA Car Controller API.
+
+Replays recordings made with the integration's "record responses" option and
+implements every endpoint declared in ``custom_components/psacc/const.py``,
+with configurable latency and failure injection.
+
+Usage::
+
+    python tools/mock_server.py tools/fixtures/vehicle.jsonl --port 5000
+
+or, from a test or benchmark::
+
+    app = create_app(ReplayBackend.from_files(["tools/fixtures/vehicle.jsonl"]))
+    server = aiohttp.test_utils.TestServer(app)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import itertools
+import json
+import logging
+import os
+import random
+from typing import Any, Dict, Iterable, List, Optional
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+CONST_PATH = os.path.join(
+    os.path.dirname(__file__), os.pardir, "custom_components", "psacc", "const.py"
+)
+
+
+def load_const():
+    """Load the integration constants without importing Home Assistant."""
+    spec = importlib.util.spec_from_file_location("psacc_const", CONST_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+const = load_const()
+
+
+class VehicleBackend:
+    """Source of vehicle data and command handling behind the mock server."""
+
+    def vins(self) -> List[str]:
+        """Return the known VINs."""
+        raise NotImplementedError
+
+    def has_vehicle(self, vin: str) -> bool:
+        """Return True if the VIN is known."""
+        return vin in self.vins()
+
+    def status(self, vin: str) -> Optional[Dict[str, Any]]:
+        """Return the /get_vehicleinfo payload of a vehicle."""
+        raise NotImplementedError
+
+    def status_exchange(self, vin: str) -> Dict[str, Any]:
+        """Return the next /get_vehicleinfo exchange, as a recording entry.
+
+        Backends replaying failures override this; the default answers the
+        payload of status().
+        """
+        return {
+            "status": 200,
+            "content_type": "application/json",
+            "response": self.status(vin),
+        }
+
+    def command(self, vin: str, name: str, **params: Any) -> Dict[str, Any]:
+        """Apply a remote command and return the JSON response."""
+        return {}
+
+
+class ReplayBackend(VehicleBackend):
+    """Replay recorded status exchanges in order, looping at the end.
+
+    Failed status requests are replayed as recorded: same status, content
+    type and body, or a hang for a timeout. Commands answer their last
+    successful recorded response.
+    """
+
+    def __init__(self, recordings: Iterable[Dict[str, Any]]) -> None:
+        """Initialize from decoded recording entries."""
+        self._statuses: Dict[str, List[Dict[str, Any]]] = {}
+        self._commands: Dict[str, Dict[str, Any]] = {}
+        status_prefix = const.API_STATUS.split("{", 1)[0]
+
+        for entry in recordings:
+            endpoint = entry["endpoint"]
+            if entry["method"] == "GET" and endpoint.startswith(status_prefix):
+                vin = endpoint[len(status_prefix):]
+                self._statuses.setdefault(vin, []).append(entry)
+            elif _succeeded(entry):
+                # Première partie du chemin, ex. "charge_now"
+                name = endpoint.strip("/").split("/", 1)[0]
+                self._commands[name] = entry["response"]
+
+        self._cursors = {
+            vin: itertools.cycle(payloads) for vin, payloads in self._statuses.items()
+        }
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str]) -> "ReplayBackend":
+        """Load recordings from JSON lines files."""
+        entries = []
+        for path in paths:
+            with open(path, encoding="utf-8") as file:
+                entries.extend(json.loads(line) for line in file if line.strip())
+        return cls(entries)
+
+    def vins(self) -> List[str]:
+        """Return the recorded VINs."""
+        return list(self._statuses)
+
+    def has_vehicle(self, vin: str) -> bool:
+        """Return True if the VIN was recorded."""
+        return vin in self._statuses
+
+    def status(self, vin: str) -> Optional[Dict[str, Any]]:
+        """Return the next recorded payload of a vehicle, skipping failures."""
+        for _ in self._statuses.get(vin, ()):
+            entry = self.status_exchange(vin)
+            if _succeeded(entry):
+                return entry["response"]
+        return None
+
+    def status_exchange(self, vin: str) -> Dict[str, Any]:
+        """Return the next recorded exchange of a vehicle."""
+        return next(self._cursors[vin])
+
+    def command(self, vin: str, name: str, **params: Any) -> Dict[str, Any]:
+        """Return the recorded response of a command, if any."""
+        return self._commands.get(name, {})
+
+
+def _succeeded(entry: Dict[str, Any]) -> bool:
+    """Return True if a recording entry is a JSON answer."""
+    content_type = entry.get("content_type") or "application/json"
+    return (
+        entry.get("status", 200) in (200, 304)
+        and "error" not in entry
+        and content_type.startswith("application/json")
+    )
+
+
+class FaultInjector:
+    """Latency and failure injection settings."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        html_rate: float = 0.0,
+        hang: float = 60.0,
+    ) -> None:
+        """Initialize; latencies are in seconds, rates in [0, 1]."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.html_rate = html_rate
+        self.hang = hang
+
+    async def apply(self) -> Optional[web.Response]:
+        """Sleep and return a failure response when one is drawn."""
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        draw = random.random()
+        if draw < self.timeout_rate:
+            await asyncio.sleep(self.hang)
+        draw -= self.timeout_rate
+        if draw < self.error_rate:
+            return web.Response(status=503, text="Injected failure")
+        draw -= self.error_rate
+        if draw < self.html_rate:
+            return web.Response(
+                text="<html><body>PSA Car Controller</body></html>",
+                content_type="text/html",
+            )
+        return None
+
+
+def _json_response(request: web.Request, payload: Any) -> web.Response:
+    """Return a JSON response with an ETag, honoring If-None-Match."""
+    body = json.dumps(payload).encode()
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers={"ETag": etag})
+    response = web.Response(
+        body=body, content_type="application/json", headers={"ETag": etag}
+    )
+    # Compression selon Accept-Encoding, comme derrière un reverse proxy
+    response.enable_compression()
+    return response
+
+
+async def _replay_exchange(
+    request: web.Request, entry: Dict[str, Any], faults: FaultInjector
+) -> web.StreamResponse:
+    """Answer a request as recorded in entry."""
+    error = entry.get("error")
+    if error == "timeout":
+        await asyncio.sleep(faults.hang)
+        return web.Response(status=504, text="Recorded timeout")
+    if error is not None:
+        # Pas de réponse enregistrée : connexion fermée sans réponse
+        if request.transport is not None:
+            request.transport.close()
+        return web.Response(status=502, text=str(error))
+    if _succeeded(entry):
+        return _json_response(request, entry["response"])
+
+    content_type = (entry.get("content_type") or "text/plain").split(";", 1)[0]
+    body = entry.get("response")
+    if not isinstance(body, str):
+        body = json.dumps(body)
+    return web.Response(
+        status=entry["status"], text=body, content_type=content_type.strip()
+    )
+
+
+def create_app(
+    backend: VehicleBackend, faults: Optional[FaultInjector] = None
+) -> web.Application:
+    """Create the mock PSACC application."""
+    faults = faults or FaultInjector()
+    app = web.Application()
+    app["backend"] = backend
+    app["faults"] = faults
+
+    def handler(name: Optional[str]):
+        """Build a handler; name None serves the vehicle status."""
+
+        async def handle(request: web.Request) -> web.StreamResponse:
+            failure = await faults.apply()
+            if failure is not None:
+                return failure
+
+            params = dict(request.match_info)
+            if request.can_read_body:
+                try:
+                    params.update(await request.json())
+                except ValueError:
+                    return web.json_response({"error": "invalid JSON"}, status=400)
+
+            if name == "vehicles":
+                return _json_response(
+                    request, [{"vin": vin} for vin in backend.vins()]
+                )
+
+            vin = params.pop("vin", None)
+            if not backend.has_vehicle(vin):
+                return web.json_response({"error": "unknown vin"}, status=404)
+
+            if name is None:
+                return await _replay_exchange(
+                    request, backend.status_exchange(vin), faults
+                )
+
+            command = name
+            if name == "climate" and params.get("temperature") in ("0", 0):
+                command = "climate_stop"
+            return web.json_response(backend.command(vin, command, **params))
+
+        return handle
+
+    # Seuil et horaire partagent "/charge_control" : une seule route
+    routes = {
+        const.API_VEHICLES: "vehicles",
+        const.API_STATUS: None,
+        const.API_CHARGE_NOW: "charge_now",
+        const.API_CHARGE_THRESHOLD: "charge_control",
+        const.API_CHARGE_HOUR: "charge_control",
+        # API_CLIMATE_STOP ("/climate/{vin}/0") est servi par la même route
+        const.API_CLIMATE_START: "climate",
+        const.API_WAKEUP: "wakeup",
+        const.API_HORN: "horn",
+        const.API_LIGHTS: "lights",
+        const.API_LOCK: "door_lock",
+        const.API_UNLOCK: "door_unlock",
+        const.API_PRECONDITIONING: "preconditioning",
+    }
+    for path, name in routes.items():
+        # Les commandes acceptent GET (API d'origine) et POST (intégration)
+        method = "GET" if name in (None, "vehicles") else "*"
+        app.router.add_route(method, path, handler(name))
+
+    return app
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the latency and failure injection options to a parser."""
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--html-rate", type=float, default=0.0)
+
+
+def faults_from_args(args: argparse.Namespace) -> FaultInjector:
+    """Build a fault injector from parsed arguments."""
+    return FaultInjector(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        html_rate=args.html_rate,
+    )
+
+
+def main() -> None:
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recordings", nargs="+", help="JSON lines recordings")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    backend = ReplayBackend.from_files(args.recordings)
+    _LOGGER.info("Serving %s recorded vehicle(s)", len(backend.vins()))
+    web.run_app(
+        create_app(backend, faults_from_args(args)), host=args.host, port=args.port
+    )
+
+
+if __name__ == "__main__":
+    main()